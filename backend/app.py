@@ -1,11 +1,18 @@
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
-from flasgger import Swagger
 from dotenv import load_dotenv
 import os
 
 from config import Settings
 from routes import register_blueprints
+from core.ref_cache import ref_cache
+from core.user_cache import user_cache
+from core.username_index import username_index
+from core.users_repo import refresh_username_index
+from core.db import db_pool_stats
+from core.metrics import init_metrics
+from core.docs import init_docs
+from core import query_trace
 
 def create_app():
     # Load env early so config/env reads work
@@ -19,16 +26,39 @@ def create_app():
     # CORS - Updated for Vercel deployment
     CORS(app, resources={r"/*": {"origins": [Settings.FRONTEND_ORIGIN,"https://tech-series2025-butter-frontend.vercel.app","https://tech-series2025-butter.vercel.app",]}})
 
-    # Swagger
-    Swagger(app)
+    # Server-Timing + /metrics (before blueprints so their handlers are timed too)
+    init_metrics(app)
+
+    # Swagger UI + spec: eager, lazy (FAST_START) or prebuilt (OPENAPI_PREBUILT); see core/docs.py
+    init_docs(app)
 
     # Blueprints
     register_blueprints(app)
 
+    # Typeahead index: warm it in the background now, or on the first /users/search in fast-start mode
+    if Settings.USERNAME_INDEX_ENABLED and not Settings.FAST_START:
+        refresh_username_index()
+
     @app.get("/health")
     def health():
         return {"ok": True}, 200
 
+    @app.get("/cacheStats")
+    def cache_stats():
+        return {"refCache": ref_cache.stats(), "userCache": user_cache.stats(),
+                "usernameIndex": username_index.stats()}, 200
+
+    @app.get("/poolStats")
+    def pool_stats():
+        return {"dbPool": db_pool_stats()}, 200
+
+    if Settings.QUERY_TRACE:
+        @app.get("/debug/queries")
+        def debug_queries():
+            top = request.args.get("top", default=20, type=int)
+            recent = request.args.get("recent", default=0, type=int)
+            return query_trace.summary(top=top, recent=recent), 200
+
     return app
 
 # Create the app instance for Vercel
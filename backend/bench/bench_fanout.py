@@ -0,0 +1,84 @@
+"""
+Per-endpoint latency with and without concurrent fan-out (core/aio.py).
+
+Runs the mood endpoints against the SQLite backend (core/local_db.py) with a fixed
+simulated round trip per query, with the reference cache cleared before every request
+so the independent reads are actually issued.
+
+    cd backend && python -m bench.bench_fanout --latency-ms 30 --iterations 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+ENDPOINTS = {
+    "POST /moodMetric": lambda c: c.post("/moodMetric", json={"userId": 1, "mood": 7, "stress": 3}),
+    "POST /moodMetric/batch": lambda c: c.post(
+        "/moodMetric/batch", json=[{"userId": u, "mood": 6} for u in range(1, 6)]
+    ),
+    "GET /userDailyQuizResult": lambda c: c.get("/userDailyQuizResult?userId=1"),
+    "GET /userWeeklyQuizResult": lambda c: c.get("/userWeeklyQuizResult?userId=1"),
+}
+
+
+def run(latency_ms, iterations):
+    import contextlib
+    import io
+
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_LATENCY_MS"] = str(latency_ms)
+    from config import Settings
+    from core.db import supabase
+    from core.ref_cache import ref_cache
+    from app import create_app
+
+    supabase.seed({
+        "users": [{"email": f"bench{u}@example.com", "username": f"bench{u}"} for u in range(1, 6)],
+        "scoreBands": [{"band_key": "ok", "label": "OK", "min_score": 0, "max_score": 10}],
+    })
+    app = create_app().test_client()
+
+    results = {}
+    for fanout in (False, True):
+        Settings.AIO_FANOUT = fanout
+        for name, call in ENDPOINTS.items():
+            samples = []
+            for _ in range(iterations):
+                ref_cache.invalidate()
+                t0 = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resp = call(app)
+                samples.append((time.perf_counter() - t0) * 1000.0)
+                assert resp.status_code < 500, resp.get_data(as_text=True)
+            results.setdefault(name, {})["concurrent" if fanout else "sequential"] = round(
+                statistics.median(samples), 1
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="simulated latency per query")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    results = run(args.latency_ms, args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"median latency (ms), {args.latency_ms:g} ms per query, cold reference cache")
+    print(f"{'endpoint':<28}{'sequential':>12}{'concurrent':>12}{'saved':>8}")
+    for name, r in results.items():
+        saved = 1 - r["concurrent"] / r["sequential"] if r["sequential"] else 0
+        print(f"{name:<28}{r['sequential']:>12}{r['concurrent']:>12}{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic data for the offline benchmarks (SQLite backend, core/local_db.py).
+
+Generation is deterministic for a given seed, so the same volumes can be regenerated
+(or re-streamed, e.g. into the rollup rebuild) without keeping rows in memory.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+BENCH_PASSWORD = "benchpass"
+
+REFERENCE_DATA = {
+    "quizqn": [
+        {"key": k, "prompt": p, "input_type": t, "unit": u, "min_value": lo, "max_value": hi, "step": st,
+         "scale_positive_high": pos, "required": True, "section": "daily", "display_order": i, "active": True}
+        for i, (k, p, t, u, lo, hi, st, pos) in enumerate([
+            ("sleepHours", "How long did you sleep?", "number", "h", 0, 14, 0.5, True),
+            ("sleepQuality", "How well did you sleep?", "scale", None, 1, 10, 1, True),
+            ("mood", "How is your mood?", "scale", None, 1, 10, 1, True),
+            ("energy", "How is your energy?", "scale", None, 1, 10, 1, True),
+            ("stress", "How stressed are you?", "scale", None, 1, 10, 1, False),
+            ("exerciseHours", "How long did you exercise?", "number", "h", 0, 6, 0.25, True),
+            ("workingHrs", "How long did you work or study?", "number", "h", 0, 16, 0.5, False),
+            ("timeOutsideMin", "Time spent outside?", "number", "min", 0, 600, 15, True),
+            ("connectwithfamily", "Did you connect with family?", "boolean", None, None, None, None, True),
+            ("notes", "Anything else?", "text", None, None, None, None, True),
+        ], start=1)
+    ],
+    "label_options": [
+        {"field_name": f, "labelvalue": v}
+        for f in ("sleepquality", "mood", "energy", "stress")
+        for v in ("Very low", "Low", "Okay", "Good", "Great")
+    ],
+    "range_config": [
+        {"field_name": "sleephours", "min_value": 0, "max_value": 14, "step_value": 0.5},
+        {"field_name": "exercisehours", "min_value": 0, "max_value": 6, "step_value": 0.25},
+        {"field_name": "workhours", "min_value": 0, "max_value": 16, "step_value": 0.5},
+        {"field_name": "timeoutsidemin", "min_value": 0, "max_value": 600, "step_value": 15},
+    ],
+    "mascot": [
+        {"feeling": f, "encourageWords": f"{f} words #{i}"}
+        for f in ("sad", "tired", "stressed", "okay", "happy")
+        for i in range(1, 6)
+    ],
+    "scoreBands": [
+        {"band_key": "crisis", "label": "Struggling", "min_score": 0, "max_score": 3, "inclusive_max": False,
+         "message": "Reach out", "crisis_note": "SOS 1-767", "display_order": 1, "tips": ["Talk to someone"]},
+        {"band_key": "low", "label": "Low", "min_score": 3, "max_score": 5, "inclusive_max": False,
+         "display_order": 2, "tips": ["Take a walk", "Sleep early"]},
+        {"band_key": "ok", "label": "Okay", "min_score": 5, "max_score": 7.5, "inclusive_max": False,
+         "display_order": 3, "tips": ["Keep it up"]},
+        {"band_key": "great", "label": "Great", "min_score": 7.5, "max_score": 10,
+         "display_order": 4, "tips": ["Share the vibe"]},
+    ],
+}
+
+
+def user_email(uid: int) -> str:
+    return f"user{uid}@bench.local"
+
+
+def iter_users(n_users: int):
+    for uid in range(1, n_users + 1):
+        yield {"userId": uid, "email": user_email(uid), "password": BENCH_PASSWORD,
+               "username": f"user{uid}", "mobile": None}
+
+
+def iter_moods(n_users: int, per_user: int, days: int = 90, seed: int = 7, now: datetime = None):
+    """Mood rows (explicit ids), per_user check-ins per user spread over the last `days` days."""
+    rng = random.Random(seed)
+    now = now or datetime(2026, 1, 1, tzinfo=timezone.utc)
+    span = timedelta(days=days)
+    mood_id = 0
+    for uid in range(1, n_users + 1):
+        for k in range(per_user):
+            mood_id += 1
+            ts = now - span * (k + rng.random()) / max(per_user, 1)
+            yield {
+                "id": mood_id,
+                "userId": uid,
+                "created_timestamp": ts.isoformat(),
+                "sleepHours": round(rng.uniform(4, 10), 1),
+                "sleepQuality": rng.randint(1, 10),
+                "mood": rng.randint(1, 10),
+                "energy": rng.randint(1, 10),
+                "stress": rng.randint(1, 10),
+                "finalMoodScores": round(rng.uniform(1, 10), 1),
+            }
+
+
+def iter_friends(n_users: int, per_user: int, seed: int = 11):
+    rng = random.Random(seed)
+    for uid in range(1, n_users + 1):
+        for _ in range(per_user):
+            other = rng.randint(1, n_users)
+            yield {"friendofuid": uid, "username": f"user{other}", "email": user_email(other),
+                   "relationship": rng.choice(["friend", "classmate", "family"]), "emergencycontact": False}
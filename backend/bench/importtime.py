@@ -0,0 +1,114 @@
+"""
+Cold-start import budget for the serverless entry point.
+
+Runs `python -X importtime -c "import app"` in fresh interpreters (FAST_START=true,
+dummy Supabase credentials, so nothing connects), takes the median cumulative time of
+`app` over --runs, lists the slowest top-level imports, and fails (exit 1) if the
+median exceeds --budget-ms or any module in --forbid was imported at startup.
+
+    cd backend && python -m bench.importtime
+    python -m bench.importtime --budget-ms 400 --top 15 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that fast-start defers to first use (DB client, Swagger, batch scoring)
+DEFAULT_FORBID = ("supabase", "postgrest", "httpx", "flasgger", "jsonschema", "numpy")
+
+
+def parse_importtime(stderr: str) -> list:
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), int(self_us), int(cum_us), depth))
+    return rows
+
+
+def measure(entry: str, env: dict) -> list:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {entry} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", default="app", help="module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "350")))
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBID),
+                        help="comma-separated modules that must not be imported at startup ('' to disable)")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument("--eager", action="store_true", help="measure with FAST_START=false for comparison")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    env.setdefault("SUPABASE_KEY", "importtime")
+    env["FAST_START"] = "false" if args.eager else "true"
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+
+    totals, runs = [], []
+    for _ in range(args.runs):
+        rows = measure(args.entry, env)
+        runs.append(rows)
+        totals.append(next(cum for name, _, cum, depth in rows if name == args.entry and depth == 0))
+    median_ms = statistics.median(totals) / 1000
+
+    # Slowest imports done directly by the entry module, from the median run. importtime
+    # prints children before their parent, so they are the depth-1 lines just above it.
+    rows = runs[totals.index(sorted(totals)[len(totals) // 2])]
+    end = next(i for i, (name, _, _, depth) in enumerate(rows) if name == args.entry and depth == 0)
+    children = []
+    for name, _, cum, depth in reversed(rows[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, cum / 1000))
+    top = sorted(children, key=lambda r: r[1], reverse=True)[:args.top]
+    imported = {name for name, *_ in rows}
+    forbid = [m for m in args.forbid.split(",") if m]
+    leaked = sorted(m for m in forbid if m in imported)
+
+    over = median_ms > args.budget_ms
+    report = {
+        "entry": args.entry,
+        "fast_start": not args.eager,
+        "median_ms": round(median_ms, 1),
+        "runs_ms": [round(t / 1000, 1) for t in totals],
+        "budget_ms": args.budget_ms,
+        "over_budget": over,
+        "forbidden_imported": leaked,
+        "top": [{"module": n, "cumulative_ms": round(ms, 1)} for n, ms in top],
+        "modules": len(imported),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {args.entry}: median {median_ms:.1f} ms over {args.runs} runs "
+              f"(budget {args.budget_ms:.0f} ms, {len(imported)} modules)")
+        for n, ms in top:
+            print(f"  {ms:8.1f} ms  {n}")
+        if leaked:
+            print(f"FORBIDDEN at startup: {', '.join(leaked)}")
+        if over:
+            print(f"OVER BUDGET by {median_ms - args.budget_ms:.1f} ms")
+    sys.exit(1 if over or leaked else 0)
+
+
+if __name__ == "__main__":
+    main()
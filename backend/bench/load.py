@@ -0,0 +1,317 @@
+"""
+Endpoint-level load benchmark.
+
+Boots create_app() on the SQLite backend (core/local_db.py), seeds synthetic users,
+mood history, friends, rollups and reference tables, then drives every blueprint with
+a weighted request mix from N concurrent workers. Reports per endpoint p50/p95/p99
+latency, throughput and DB queries per request as JSON, and can compare a run against
+a saved baseline (exit code 1 on regressions).
+
+    cd backend
+    python -m bench.load --users 2000 --moods-per-user 50 --requests 5000 --concurrency 8 \\
+        --out bench/results/latest.json
+    python -m bench.load ... --baseline bench/results/baseline.json
+    # full scale (slow to seed once, then reused): --users 100000 --moods-per-user 100
+
+Seeded databases are cached under bench/.data/ keyed by volume (--reseed rebuilds) and
+every run works on a fresh copy, so writes from one run never leak into the next. A
+warm-up phase (not measured) fills the process caches before timing starts.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import fixtures  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+# name -> (weight, method, request builder(rng, ctx) -> (path, json body or None))
+SCENARIOS = {
+    "POST /login": (4, "POST", lambda rng, ctx: (
+        "/login", {"email": fixtures.user_email(_uid(rng, ctx)), "password": fixtures.BENCH_PASSWORD})),
+    "POST /signup": (1, "POST", lambda rng, ctx: (
+        "/signup", {"email": f"new{next(ctx['seq'])}-{rng.random()}@bench.local", "password": "pw"})),
+    "GET /userProfile": (6, "GET", lambda rng, ctx: (f"/userProfile?userId={_uid(rng, ctx)}", None)),
+    "PUT /userProfile": (2, "PUT", lambda rng, ctx: (
+        "/userProfile", {"userId": _uid(rng, ctx), "mobile": f"+65 9{rng.randint(0, 9999999):07d}"})),
+    "GET /userDailyQuiz": (4, "GET", lambda rng, ctx: (f"/userDailyQuiz?userId={_uid(rng, ctx)}", None)),
+    "GET /users": (3, "GET", lambda rng, ctx: (f"/users?q=user{rng.randint(1, 99)}&limit=20", None)),  # friend picker
+    "GET /users/search": (3, "GET", lambda rng, ctx: (f"/users/search?q={rng.choice(['user', 'usr'])}{rng.randint(1, 99)}", None)),
+    "POST /moodMetric": (8, "POST", lambda rng, ctx: ("/moodMetric", _checkin(rng, ctx))),
+    "POST /moodMetric/batch": (1, "POST", lambda rng, ctx: (
+        "/moodMetric/batch", [_checkin(rng, ctx) for _ in range(20)])),
+    "GET /moodMetric": (8, "GET", lambda rng, ctx: (f"/moodMetric?userId={_uid(rng, ctx)}&limit=50", None)),
+    "GET /userDailyQuizResult": (12, "GET", lambda rng, ctx: (f"/userDailyQuizResult?userId={_uid(rng, ctx)}", None)),
+    "GET /userWeeklyQuizResult": (6, "GET", lambda rng, ctx: (f"/userWeeklyQuizResult?userId={_uid(rng, ctx)}", None)),
+    "GET /userMoodSummary": (4, "GET", lambda rng, ctx: (
+        f"/userMoodSummary?userId={_uid(rng, ctx)}&granularity={rng.choice(['day', 'week'])}", None)),
+    "GET /quizqn": (6, "GET", lambda rng, ctx: ("/quizqn", None)),
+    "GET /bootstrap": (4, "GET", lambda rng, ctx: ("/bootstrap", None)),
+    "GET /friends": (5, "GET", lambda rng, ctx: (f"/friends?friendofuid={_uid(rng, ctx)}", None)),
+    "POST /friends": (1, "POST", lambda rng, ctx: (
+        "/friends", {"friendofuid": _uid(rng, ctx), "username": f"user{_uid(rng, ctx)}"})),
+    "GET /mascotWords": (4, "GET", lambda rng, ctx: (
+        f"/mascotWords?feeling={rng.choice(['sad', 'tired', 'stressed', 'okay', 'happy'])}", None)),
+    "GET /encouragementAll": (2, "GET", lambda rng, ctx: ("/encouragementAll", None)),
+    "GET /labelOptions": (5, "GET", lambda rng, ctx: (
+        f"/labelOptions?field_name={rng.choice(['sleepquality', 'mood', 'energy', 'stress'])}", None)),
+    "GET /rangeConfig": (5, "GET", lambda rng, ctx: (
+        f"/rangeConfig?field_name={rng.choice(['sleephours', 'workhours', 'exercisehours'])}", None)),
+}
+
+
+def _uid(rng, ctx):
+    return rng.randint(1, ctx["users"])
+
+
+def _checkin(rng, ctx):
+    return {"userId": _uid(rng, ctx), "mood": rng.randint(1, 10), "stress": rng.randint(1, 10),
+            "energy": rng.randint(1, 10), "sleepHours": round(rng.uniform(4, 10), 1),
+            "sleepQuality": rng.randint(1, 10), "connectwithfamily": rng.random() < 0.5}
+
+
+def parse_mix(spec):
+    weights = {name: w for name, (w, _, _) in SCENARIOS.items()}
+    for part in filter(None, (spec or "").split(",")):
+        name, _, w = part.rpartition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario in --mix: {name!r} (choices: {', '.join(SCENARIOS)})")
+        weights[name] = float(w)
+    return {k: v for k, v in weights.items() if v > 0}
+
+
+def seed_database(db, users, moods_per_user, friends_per_user, rollups=True):
+    from core import rollups as rollup_mod
+
+    db.seed(fixtures.REFERENCE_DATA)
+    db.bulk_load("users", fixtures.iter_users(users))
+    db.bulk_load("moodMetric", fixtures.iter_moods(users, moods_per_user))
+    db.bulk_load("friend", fixtures.iter_friends(users, friends_per_user))
+    if rollups:
+        # Same deterministic stream again, folded one user at a time (memory O(buckets per user))
+        # with the production fold, then bulk-written
+        def rollup_rows():
+            pending, current = [], 1
+            for r in fixtures.iter_moods(users, moods_per_user):
+                if r["userId"] != current:
+                    yield from rollup_mod.accumulate(pending).values()
+                    pending, current = [], r["userId"]
+                pending.append(r)
+            yield from rollup_mod.accumulate(pending).values()
+
+        db.bulk_load("moodRollup", rollup_rows())
+
+
+def percentile(sorted_vals, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_vals:
+        return None
+    k = max(0, min(len(sorted_vals) - 1, int(round(p / 100.0 * len(sorted_vals) + 0.5)) - 1))
+    return sorted_vals[k]
+
+
+def run_load(app, weights, n_requests, concurrency, users, seed, warmup=0):
+    from core.local_db import query_tally
+
+    names = list(weights)
+    cum = []
+    total_w = 0.0
+    for n in names:
+        total_w += weights[n]
+        cum.append(total_w)
+
+    counter = iter(range(n_requests))
+    counter_lock = threading.Lock()
+    ctx = {"users": users, "seq": iter(range(10 ** 12))}
+    samples = {n: [] for n in names}
+    samples_lock = threading.Lock()
+
+    def worker(wid):
+        rng = random.Random(seed * 1000 + wid)
+        client = app.test_client()
+        local = []
+        while True:
+            with counter_lock:
+                if next(counter, None) is None:
+                    break
+                x = rng.random() * total_w
+                name = names[next(i for i, c in enumerate(cum) if x < c)]
+                _, method, build = SCENARIOS[name]
+                path, body = build(rng, ctx)
+            tally = [0]
+            token = query_tally.set(tally)
+            t0 = time.perf_counter()
+            resp = client.open(path, method=method, json=body)
+            elapsed = time.perf_counter() - t0
+            query_tally.reset(token)
+            local.append((name, elapsed, tally[0], resp.status_code))
+        with samples_lock:
+            for name, elapsed, queries, status in local:
+                samples[name].append((elapsed, queries, status))
+
+    devnull = open(os.devnull, "w")
+    with devnull, contextlib.redirect_stdout(devnull):  # routes print diagnostics per request
+        if warmup:
+            warm_rng = random.Random(seed - 1)
+            client = app.test_client()
+            for name in names * max(1, warmup // len(names)):
+                _, method, build = SCENARIOS[name]
+                path, body = build(warm_rng, ctx)
+                client.open(path, method=method, json=body)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(worker, range(concurrency)))
+        wall = time.perf_counter() - t0
+
+    endpoints = {}
+    all_lat = []
+    for name, rows in samples.items():
+        if not rows:
+            continue
+        lat = sorted(r[0] * 1000.0 for r in rows)
+        all_lat.extend(lat)
+        endpoints[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if r[2] >= 500),
+            "p50_ms": round(percentile(lat, 50), 3),
+            "p95_ms": round(percentile(lat, 95), 3),
+            "p99_ms": round(percentile(lat, 99), 3),
+            "mean_ms": round(sum(lat) / len(lat), 3),
+            "throughput_rps": round(len(rows) / wall, 2),
+            "db_queries_per_req": round(sum(r[1] for r in rows) / len(rows), 3),
+        }
+    all_lat.sort()
+    total = {
+        "requests": len(all_lat),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(all_lat) / wall, 2) if wall else None,
+        "p50_ms": round(percentile(all_lat, 50), 3),
+        "p95_ms": round(percentile(all_lat, 95), 3),
+        "p99_ms": round(percentile(all_lat, 99), 3),
+    }
+    return endpoints, total
+
+
+def compare(current, baseline, tolerance, min_samples=100):
+    """
+    Regressions of current vs baseline: slower p95 (endpoints with enough samples only),
+    lower total throughput, more DB queries per request or more 5xx responses.
+    """
+    out = []
+    for name, cur in current["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(name)
+        if not base:
+            continue
+        enough = min(cur["requests"], base["requests"]) >= min_samples
+        if enough and base["p95_ms"] and cur["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            out.append(f"{name}: p95 {base['p95_ms']} -> {cur['p95_ms']} ms")
+        if cur["db_queries_per_req"] > base["db_queries_per_req"] * 1.05 + 0.02:
+            out.append(f"{name}: db queries/req {base['db_queries_per_req']} -> {cur['db_queries_per_req']}")
+        if cur["errors"] > base.get("errors", 0):
+            out.append(f"{name}: errors {base.get('errors', 0)} -> {cur['errors']}")
+    bt, ct = baseline.get("total", {}).get("throughput_rps"), current["total"]["throughput_rps"]
+    if bt and ct < bt * (1 - tolerance):
+        out.append(f"total: throughput {bt} -> {ct} req/s")
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--moods-per-user", type=int, default=50)
+    parser.add_argument("--friends-per-user", type=int, default=3)
+    parser.add_argument("--no-rollups", action="store_true", help="skip seeding moodRollup")
+    parser.add_argument("--db", help="SQLite file (default: bench/.data/load_<users>_<moods>.sqlite)")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=200, help="unmeasured requests before timing")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per query")
+    parser.add_argument("--mix", help="override weights, e.g. 'GET /users=1,POST /signup=0'")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="JSON from a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95/throughput drift")
+    parser.add_argument("--min-samples", type=int, default=100, help="min requests before p95 is compared")
+    args = parser.parse_args()
+
+    seed_path = args.db or os.path.join(DATA_DIR, f"load_{args.users}_{args.moods_per_user}.sqlite")
+    run_path = seed_path + ".run"
+    os.makedirs(os.path.dirname(os.path.abspath(seed_path)), exist_ok=True)
+    if args.reseed and os.path.exists(seed_path):
+        os.remove(seed_path)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(run_path + suffix):
+            os.remove(run_path + suffix)
+    seeded = os.path.exists(seed_path)
+    if seeded:
+        shutil.copyfile(seed_path, run_path)
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = run_path
+    os.environ["SQLITE_LATENCY_MS"] = "0"  # no simulated latency while seeding
+
+    from core.db import supabase
+    from app import create_app
+
+    if not seeded:
+        t0 = time.perf_counter()
+        seed_database(supabase, args.users, args.moods_per_user, args.friends_per_user, not args.no_rollups)
+        supabase.backup_to(seed_path)
+        # create_app() at import may have indexed the empty database
+        from core.username_index import username_index
+        from core.users_repo import iter_usernames
+        username_index.rebuild(iter_usernames())
+        print(f"seeded {seed_path} in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    supabase.latency = args.latency_ms / 1000.0
+
+    weights = parse_mix(args.mix)
+    endpoints, total = run_load(
+        create_app(), weights, args.requests, args.concurrency, args.users, args.seed, warmup=args.warmup
+    )
+    result = {
+        "meta": {
+            "users": args.users,
+            "mood_rows": supabase.row_count("moodMetric"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "latency_ms": args.latency_ms,
+            "mix": weights,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+    text = json.dumps(result, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance, args.min_samples)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("no regressions vs baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Micro-benchmarks for the scoring and time-bucketing helpers in routes/mood.py.
+
+Reference data is served from a pre-filled ref_cache (default scoringWeights rows and
+a representative scoreBands set), so nothing touches a database. Each case is timed
+with an auto-calibrated loop (best median over --repeat runs) and reported as ns/op;
+batch cases report ns per element. Allocations come from tracemalloc: peak bytes
+allocated during one call, and blocks still alive per call after many calls (leaks or
+unbounded caching show up there).
+
+    cd backend && python -m bench.micro
+    python -m bench.micro --filter band --json > bench/results/micro.json
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_BACKEND", "sqlite")
+
+from bench import fixtures  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def _raw_values(rng):
+    return {
+        "sleepHours": round(rng.uniform(3, 11), 1),
+        "exerciseHours": round(rng.uniform(0, 3), 2),
+        "workingHrs": round(rng.uniform(0, 14), 1),
+        "sleepQuality": rng.randint(1, 10),
+        "mood": rng.randint(1, 10),
+        "energy": rng.randint(1, 10),
+        "stress": rng.randint(1, 10),
+        "timeOutsideMin": rng.randint(0, 300),
+        "connectwithfamily": rng.random() < 0.5,
+        "notes": None,
+    }
+
+
+def build_cases(rng):
+    """name -> (callable, elements per call)."""
+    import routes.mood as mood
+    from core.bands import parse_tips
+    from core.ref_cache import ref_cache
+    from core.db import SCORING_WEIGHTS_TABLE, SCORE_BANDS_TABLE
+    from core.scoring import DEFAULT_WEIGHT_ROWS
+
+    has_numpy = importlib.util.find_spec("numpy") is not None
+
+    ref_cache.invalidate()
+    ref_cache.get(SCORING_WEIGHTS_TABLE, lambda: [dict(r) for r in DEFAULT_WEIGHT_ROWS])
+    band_rows = [dict(r) for r in fixtures.REFERENCE_DATA["scoreBands"]]
+    for r in band_rows:
+        r["tips"] = json.dumps(r["tips"])
+    ref_cache.get(SCORE_BANDS_TABLE, lambda: band_rows)
+
+    values = [_raw_values(rng) for _ in range(max(BATCH_SIZES))]
+    scores = [round(rng.uniform(0, 10), 1) for _ in range(max(BATCH_SIZES))]
+    stamps = [f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:"
+              f"{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 999999):06d}+00:00"
+              for _ in range(max(BATCH_SIZES))]
+    index = mood.get_band_index()
+    comp = DEFAULT_WEIGHT_ROWS[0]
+    v0, s0, t0 = values[0], scores[0], stamps[0]
+
+    cases = {
+        "compute_final_score_from_weights": (lambda: mood.compute_final_score_from_weights(v0), 1),
+        "_normalize_component": (lambda: mood._normalize_component(
+            comp["component_key"], comp["transform"], comp["direction"], comp.get("notes"), v0), 1),
+        "pick_score_band_for[BandIndex]": (lambda: mood.pick_score_band_for(s0, index), 1),
+        "pick_score_band_for[rows]": (lambda: mood.pick_score_band_for(s0, band_rows), 1),
+        "parse_tips[json]": (lambda: parse_tips(band_rows[1]["tips"]), 1),
+        "parse_tips[list]": (lambda: parse_tips(["a", "b"]), 1),
+        "parse_ts": (lambda: mood.parse_ts(t0), 1),
+        "sg_day_bounds_from_ts": (lambda: mood.sg_day_bounds_from_ts(t0), 1),
+        "sg_week_bounds_from_ts": (lambda: mood.sg_week_bounds_from_ts(t0), 1),
+    }
+
+    for n in BATCH_SIZES:
+        vals, scs, tss = values[:n], scores[:n], stamps[:n]
+        columns = {k: [v[k] for v in vals] for k in vals[0]}
+        cases[f"score loop x{n}"] = (
+            lambda vals=vals: [mood.compute_final_score_from_weights(v) for v in vals], n)
+        if has_numpy:
+            cases[f"compute_final_scores_batch x{n}"] = (
+                lambda columns=columns, n=n: mood.compute_final_scores_batch(columns, n=n), n)
+        cases[f"BandIndex.lookup_many x{n}"] = (lambda scs=scs: index.lookup_many(scs), n)
+        cases[f"sg_day_bounds_from_ts x{n}"] = (
+            lambda tss=tss: [mood.sg_day_bounds_from_ts(t) for t in tss], n)
+        cases[f"sg_week_bounds_from_ts x{n}"] = (
+            lambda tss=tss: [mood.sg_week_bounds_from_ts(t) for t in tss], n)
+    return cases
+
+
+def time_case(fn, min_time=0.2, repeat=5):
+    """Median-of-best ns per call with an auto-calibrated iteration count."""
+    fn()  # warm caches (scorer compile, band index, zoneinfo)
+    iters = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in range(iters):
+            fn()
+        elapsed = time.perf_counter_ns() - t0
+        if elapsed >= min_time * 1e9 / repeat or iters >= 1 << 24:
+            break
+        iters *= 2
+    runs = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter_ns()
+            for _ in range(iters):
+                fn()
+            runs.append((time.perf_counter_ns() - t0) / iters)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return statistics.median(runs), min(runs)
+
+
+def alloc_case(fn, n=1, budget=2000):
+    """(peak bytes allocated during one call, blocks retained per call over many calls)."""
+    calls = max(2, budget // n)  # tracemalloc is slow; keep the traced element count roughly constant
+    fn()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        for _ in range(calls):
+            fn()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+    return max(0, peak - base), retained / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only cases whose name contains this substring")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds of timing per case")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    cases = build_cases(random.Random(42))
+    results = {}
+    for name, (fn, n) in cases.items():
+        if args.filter and args.filter not in name:
+            continue
+        median_ns, best_ns = time_case(fn, args.min_time, args.repeat)
+        peak_bytes, retained = alloc_case(fn, n)
+        results[name] = {
+            "elements": n,
+            "ns_per_call": round(median_ns, 1),
+            "ns_per_op": round(median_ns / n, 1),
+            "best_ns_per_op": round(best_ns / n, 1),
+            "peak_bytes_per_call": peak_bytes,
+            "peak_bytes_per_op": round(peak_bytes / n, 1),
+            "retained_blocks_per_call": round(retained, 3),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'case':<40}{'ns/op':>12}{'ns/call':>14}{'peak B/op':>12}{'retained/call':>15}")
+    for name, r in results.items():
+        print(f"{name:<40}{r['ns_per_op']:>12,.1f}{r['ns_per_call']:>14,.0f}"
+              f"{r['peak_bytes_per_op']:>12,.1f}{r['retained_blocks_per_call']:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
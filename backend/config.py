@@ -4,6 +4,78 @@ class Settings:
     # Allow overriding from env; defaults to your dev frontend
     FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173")
 
+    # In-process cache for reference tables (scoringWeights, scoreBands, ...)
+    REF_CACHE_TTL_SECONDS = float(os.getenv("REF_CACHE_TTL_SECONDS", "300"))
+
+    # Max rows accepted by POST /moodMetric/batch
+    MOOD_BATCH_MAX_ROWS = int(os.getenv("MOOD_BATCH_MAX_ROWS", "500"))
+
+    # GET /moodMetric page sizes
+    MOOD_PAGE_DEFAULT_LIMIT = int(os.getenv("MOOD_PAGE_DEFAULT_LIMIT", "200"))
+    MOOD_PAGE_MAX_LIMIT = int(os.getenv("MOOD_PAGE_MAX_LIMIT", "1000"))
+    # GET /users pages (keyset on userId) and ?q= prefix length cap
+    USERS_PAGE_DEFAULT_LIMIT = int(os.getenv("USERS_PAGE_DEFAULT_LIMIT", "50"))
+    USERS_PAGE_MAX_LIMIT = int(os.getenv("USERS_PAGE_MAX_LIMIT", "200"))
+    USERS_SEARCH_MAX_LEN = int(os.getenv("USERS_SEARCH_MAX_LEN", "64"))
+
+    # Rows fetched per round trip by GET /moodMetric/export
+    MOOD_EXPORT_CHUNK_SIZE = int(os.getenv("MOOD_EXPORT_CHUNK_SIZE", "1000"))
+
+    # Concurrent fan-out of independent reads (core/aio.py)
+    AIO_FANOUT = os.getenv("AIO_FANOUT", "true").lower() == "true"
+    AIO_MAX_WORKERS = int(os.getenv("AIO_MAX_WORKERS", "16"))
+
+    # users_repo lookups (core/user_cache.py): LRU+TTL by userId/email/username, negative caching for misses
+    USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+    USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", "10"))
+
+    # GET /users/search typeahead (core/username_index.py)
+    USERNAME_INDEX_ENABLED = os.getenv("USERNAME_INDEX_ENABLED", "true").lower() == "true"
+    USERNAME_INDEX_REFRESH_SECONDS = float(os.getenv("USERNAME_INDEX_REFRESH_SECONDS", "300"))
+    USERNAME_INDEX_MIN_SIMILARITY = float(os.getenv("USERNAME_INDEX_MIN_SIMILARITY", "0.3"))
+    USERNAME_INDEX_PAGE_SIZE = int(os.getenv("USERNAME_INDEX_PAGE_SIZE", "1000"))
+
+    # Cache-Control for reference endpoints (browser max-age, CDN s-maxage, stale-while-revalidate)
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+    HTTP_CACHE_S_MAXAGE = int(os.getenv("HTTP_CACHE_S_MAXAGE", "300"))
+    HTTP_CACHE_SWR = int(os.getenv("HTTP_CACHE_SWR", "600"))
+
+    # Serverless cold starts: build the DB client on first query and Swagger on first /apidocs hit
+    FAST_START = os.getenv("FAST_START", "false").lower() == "true"
+    # Serve openapi/ from `flask build-openapi` instead of parsing view docstrings at runtime
+    OPENAPI_PREBUILT = os.getenv("OPENAPI_PREBUILT", "false").lower() == "true"
+
+    # Data backend: "supabase" (hosted PostgREST) or "sqlite" (core/local_db.py, offline runs/benchmarks)
+    DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+    SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+    SQLITE_LATENCY_MS = float(os.getenv("SQLITE_LATENCY_MS", "0"))  # simulated round trip per query
+
+    # Supabase/PostgREST HTTP transport (core/transport.py)
+    DB_POOL_MAX_CONNECTIONS = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "20"))
+    DB_POOL_MAX_KEEPALIVE = int(os.getenv("DB_POOL_MAX_KEEPALIVE", "10"))
+    DB_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("DB_KEEPALIVE_EXPIRY_SECONDS", "30"))
+    DB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "5"))
+    DB_READ_TIMEOUT_SECONDS = float(os.getenv("DB_READ_TIMEOUT_SECONDS", "15"))
+    DB_WRITE_TIMEOUT_SECONDS = float(os.getenv("DB_WRITE_TIMEOUT_SECONDS", "15"))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+    DB_HTTP2 = os.getenv("DB_HTTP2", "true").lower() == "true"
+    DB_RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "2"))
+    DB_RETRY_BACKOFF_BASE = float(os.getenv("DB_RETRY_BACKOFF_BASE", "0.1"))
+    DB_RETRY_BACKOFF_MAX = float(os.getenv("DB_RETRY_BACKOFF_MAX", "1.0"))
+
+    # Request instrumentation (core/metrics.py): histograms at /metrics, Server-Timing header
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+    # Query tracing (core/query_trace.py): per-request query capture, N+1/redundant-query detection,
+    # GET /debug/queries. Needs METRICS_ENABLED; off by default (keeps filter values in memory).
+    QUERY_TRACE = os.getenv("QUERY_TRACE", "false").lower() == "true"
+    QUERY_TRACE_BUFFER = int(os.getenv("QUERY_TRACE_BUFFER", "200"))
+    QUERY_TRACE_N_PLUS_ONE = int(os.getenv("QUERY_TRACE_N_PLUS_ONE", "3"))
+    QUERY_TRACE_LOG = os.getenv("QUERY_TRACE_LOG", "true").lower() == "true"
+
     SWAGGER = {
         "title": "API",
         "uiversion": 3
@@ -0,0 +1,70 @@
+"""
+Async fan-out for independent blocking data-access calls.
+
+Handlers stay synchronous (Flask/gunicorn), but can hand several independent reads to
+fan_out(); they run concurrently via asyncio.gather on a shared background event loop,
+each call on a worker thread (the supabase-py sync client is thread-safe), so the
+handler waits for the slowest call instead of the sum of all of them.
+
+    weights, bands = fan_out(load_weight_rows, load_score_bands)
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from config import Settings
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Lazily start the shared event loop thread (one per process)."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(
+                    ThreadPoolExecutor(max_workers=Settings.AIO_MAX_WORKERS, thread_name_prefix="aio-io")
+                )
+                threading.Thread(target=loop.run_forever, name="aio-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+async def gather_calls(*calls: Callable[[], Any], return_exceptions: bool = False) -> List[Any]:
+    """Async API: run blocking zero-arg callables concurrently, results in call order."""
+    return await asyncio.gather(
+        *(asyncio.to_thread(c) for c in calls),
+        return_exceptions=return_exceptions,
+    )
+
+
+def fan_out(*calls: Callable[[], Any], return_exceptions: bool = False) -> List[Any]:
+    """
+    Sync facade over gather_calls for Flask handlers.
+    With return_exceptions=True a failing call yields its exception instead of raising,
+    so each result can keep its own error handling.
+    """
+    if not calls:
+        return []
+    if len(calls) == 1 or not Settings.AIO_FANOUT:
+        results = []
+        for c in calls:
+            try:
+                results.append(c())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+    # Run each call in a copy of the caller's context so Flask's request/app context
+    # (contextvars-based) stays visible on the worker threads.
+    bound = [lambda c=c, ctx=contextvars.copy_context(): ctx.run(c) for c in calls]
+    future = asyncio.run_coroutine_threadsafe(
+        gather_calls(*bound, return_exceptions=return_exceptions), _get_loop()
+    )
+    return future.result()
@@ -0,0 +1,86 @@
+import json
+from bisect import bisect_left
+from typing import Iterable, List, Optional
+
+from .scoring import as_bool
+
+
+def parse_tips(tips_raw):
+    if isinstance(tips_raw, list):
+        return tips_raw
+    if isinstance(tips_raw, str) and tips_raw.strip():
+        try:
+            return json.loads(tips_raw)
+        except Exception:
+            return [tips_raw]
+    return []
+
+
+class BandIndex:
+    """
+    Score → scoreBand lookup built once from scoreBands rows.
+
+    All band boundaries are sorted into one array, which splits the number line into
+    elementary segments: each boundary point itself and the open gap between neighbours.
+    Every segment is pre-assigned the first band (in row order, i.e. display_order) that
+    covers it, so overlaps resolve exactly like the old linear scan and gaps map to None.
+    Band payloads (including decoded tips) are materialized up front and shared.
+    """
+
+    def __init__(self, bands: Iterable[dict]):
+        parsed = []
+        for r in bands:
+            try:
+                lo = float(r.get("min_score")) if r.get("min_score") is not None else None
+                hi = float(r.get("max_score")) if r.get("max_score") is not None else None
+            except (TypeError, ValueError):
+                continue
+            if lo is None or hi is None:
+                continue
+            inc_lo = as_bool(r.get("inclusive_min"))
+            if inc_lo is None: inc_lo = True
+            inc_hi = as_bool(r.get("inclusive_max"))
+            if inc_hi is None: inc_hi = True
+            payload = {
+                "band_key": r.get("band_key"),
+                "label": r.get("label"),
+                "min_score": lo,
+                "max_score": hi,
+                "inclusive_min": bool(inc_lo),
+                "inclusive_max": bool(inc_hi),
+                "message": r.get("message"),
+                "crisis_note": r.get("crisis_note"),
+                "display_order": r.get("display_order"),
+                "tips": parse_tips(r.get("tips")),
+            }
+            parsed.append((lo, hi, inc_lo, inc_hi, payload))
+
+        self.bands = [p[4] for p in parsed]
+        self.points: List[float] = sorted({p[0] for p in parsed} | {p[1] for p in parsed})
+
+        # at_point[i]: band for score == points[i]
+        # in_gap[i]:   band for points[i-1] < score < points[i] (in_gap[0] / in_gap[-1] are the unbounded ends)
+        self.at_point: List[Optional[dict]] = []
+        self.in_gap: List[Optional[dict]] = [None]
+        for i, x in enumerate(self.points):
+            self.at_point.append(next(
+                (pl for lo, hi, inc_lo, inc_hi, pl in parsed
+                 if (x > lo or (inc_lo and x == lo)) and (x < hi or (inc_hi and x == hi))),
+                None,
+            ))
+            if i + 1 < len(self.points):
+                a, b = x, self.points[i + 1]
+                self.in_gap.append(next((pl for lo, hi, _, _, pl in parsed if lo <= a and b <= hi), None))
+        self.in_gap.append(None)
+
+    def lookup(self, score) -> Optional[dict]:
+        """Band payload for score (None for missing/NaN scores or scores outside every band)."""
+        if score is None or score != score:
+            return None
+        i = bisect_left(self.points, score)
+        if i < len(self.points) and self.points[i] == score:
+            return self.at_point[i]
+        return self.in_gap[i]
+
+    def lookup_many(self, scores: Iterable) -> List[Optional[dict]]:
+        return [self.lookup(s) for s in scores]
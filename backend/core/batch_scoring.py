@@ -0,0 +1,83 @@
+"""
+Vectorized (NumPy) scoring for many check-ins at once.
+
+Inputs are columnar: {"sleepHours": [...], "mood": [...], ...} with NaN/None for missing
+values. Semantics mirror core.scoring.CompiledScorer.score row for row, including the
+per-row renormalization of the weight denominator when components are missing.
+"""
+import numpy as np
+
+from .scoring import CompiledScorer
+
+# Input fields that the scalar path coerces with as_int (truncation toward zero)
+_INT_FIELDS = {"mood", "energy", "stress", "sleepQuality", "timeOutsideMin"}
+
+
+def _column(columns, field, n):
+    col = columns.get(field)
+    if col is None:
+        return np.full(n, np.nan)
+    arr = np.asarray(col, dtype=float)
+    if arr.shape != (n,):
+        raise ValueError(f"column '{field}' has shape {arr.shape}, expected ({n},)")
+    return np.trunc(arr) if field in _INT_FIELDS else arr
+
+
+def _apply(spec, x):
+    kind = spec[0]
+    if kind == "scale10":
+        return np.clip(x / 10.0, 0.0, 1.0)
+    if kind == "inverse_scale10":
+        return np.clip(1.0 - np.clip(x / 10.0, 0.0, 1.0), 0.0, 1.0)
+    if kind == "peak":
+        _, _, center, width = spec
+        return np.clip(1.0 - np.abs(x - center) / width, 0.0, 1.0)
+    if kind == "saturate_hours":
+        return np.clip(x * 60.0 / spec[2], 0.0, 1.0)
+    if kind == "saturate":
+        return np.clip(x / spec[2], 0.0, 1.0)
+    if kind == "boolean":
+        return np.where(x != 0, 1.0, 0.0)
+    raise ValueError(f"unsupported transform '{kind}'")
+
+
+def _round1(values):
+    """round(v, 1) for every element, matching Python's correctly-rounded builtin."""
+    out = np.round(values, 1)
+    # np.round scales by 10 before rounding, which can flip results right at a .x5 tie;
+    # defer to the builtin for those few elements.
+    scaled = values * 10.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie & ~np.isnan(values)):
+        out[i] = round(float(values[i]), 1)
+    return out
+
+
+def score_batch(columns, scorer: CompiledScorer, n=None):
+    """
+    Score columnar inputs with a CompiledScorer.
+
+    columns: mapping of field name -> 1-D array-like (NaN/None = missing). Columns that are
+             absent count as missing for every row. connectwithfamily is truthy when non-zero.
+    n:       row count (defaults to the length of the first column given).
+
+    Returns a float array of 0–10 scores rounded to 1 dp; NaN where no component applies.
+    """
+    if n is None:
+        n = next((len(c) for c in columns.values() if c is not None), 0)
+
+    num = np.zeros(n)
+    den = np.zeros(n)
+    for _, w, fn in scorer.components:
+        spec = fn.spec
+        x = _column(columns, spec[1], n)
+        present = ~np.isnan(x)
+        with np.errstate(invalid="ignore"):
+            v = _apply(spec, np.where(present, x, 0.0))
+        num = num + np.where(present, w * v, 0.0)
+        den = den + np.where(present, w, 0.0)
+
+    scores = np.full(n, np.nan)
+    ok = den > 0
+    scores[ok] = num[ok] / den[ok] * 10.0
+    return _round1(scores)
@@ -1,16 +1,91 @@
-from supabase import create_client, Client
 from dotenv import load_dotenv
 import os
+import threading
+
+from config import Settings
 
 # Ensure .env is loaded for SUPABASE_URL/KEY
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise RuntimeError("Missing SUPABASE_URL or SUPABASE_KEY in .env")
+http_client = None
+_client = None
+_client_lock = threading.Lock()
+_on_ready = []
+
+
+def _build_client():
+    """Construct the data client (imports supabase/httpx or the SQLite stand-in only now)."""
+    global http_client
+    if Settings.DB_BACKEND == "sqlite":
+        # Offline stand-in with the same query-builder API (core/local_db.py)
+        from .local_db import LocalClient
+
+        return LocalClient(Settings.SQLITE_PATH, latency_ms=Settings.SQLITE_LATENCY_MS)
+
+    SUPABASE_URL = os.getenv("SUPABASE_URL")
+    SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise RuntimeError("Missing SUPABASE_URL or SUPABASE_KEY in .env")
+
+    from supabase import create_client, ClientOptions
+    from .transport import build_http_client
+
+    # One pooled, timeout-bounded HTTP client per process, shared by every query
+    http_client = build_http_client()
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http_client))
+
+
+def get_client():
+    """The process-wide client, built on first use (thread-safe)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = _build_client()
+                for callback in _on_ready:
+                    callback()
+                _client = client
+    return _client
+
+
+def on_client_ready(callback) -> None:
+    """Run callback once the client (and its imports) exist; immediately if they already do."""
+    with _client_lock:
+        if _client is None:
+            _on_ready.append(callback)
+            return
+    callback()
+
+
+class _LazyClient:
+    """Stands in for the client at import time so `from core.db import supabase` stays cheap."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(get_client(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_client(), name, value)
+
+    def __repr__(self):
+        return f"<lazy {Settings.DB_BACKEND} client{'' if _client is None else ' (built)'}>"
+
+
+supabase = _LazyClient()
+
+if not Settings.FAST_START:
+    # Eager construction keeps the old fail-at-import behaviour for long-running servers
+    get_client()
+
+
+def db_pool_stats() -> dict:
+    """Connection pool usage (in_use/idle/queued/waits) and retry counters."""
+    if http_client is None:
+        return {}
+    from .transport import pool_stats
+    return pool_stats(http_client)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Table names
 USERS_TABLE         = "users"
@@ -20,6 +95,9 @@ QUIZQN_TABLE        = "quizqn"
 LABEL_OPTIONS_TABLE = "label_options"
 RANGE_CONFIG_TABLE  = "range_config"
 MASCOT_TABLE        = "mascot"
+SCORING_WEIGHTS_TABLE = "scoringWeights"
+SCORE_BANDS_TABLE   = "scoreBands"
+MOOD_ROLLUP_TABLE   = "moodRollup"
 
 
 def exec_data(response):
@@ -36,3 +114,17 @@ def exec_data(response):
         return response.get("data")
     else:
         return response
+
+
+def is_unique_violation(exc: BaseException) -> bool:
+    """True for a Postgres unique_violation (23505) surfaced by PostgREST (or core/local_db.py)."""
+    return getattr(exc, "code", None) == "23505"
+
+
+def is_data_error(exc: BaseException) -> bool:
+    """
+    True when Postgres rejected the statement's data: a data exception (22xxx) or an
+    integrity violation (23xxx). The statement wrote nothing, so it is safe to retry a part
+    of it. Transport errors (timeouts, dropped connections) are not: the write may have landed.
+    """
+    return str(getattr(exc, "code", None) or "")[:2] in ("22", "23")
@@ -0,0 +1,178 @@
+"""
+Swagger/OpenAPI docs without paying for them at startup.
+
+Lazy Swagger UI: flasgger (and jsonschema, mistune, yaml) cost a large share of
+cold-start import time and the UI is only ever needed by a human opening /apidocs.
+LazyDocs wraps the app's WSGI callable and routes the docs paths to a separate docs
+app that is built on the first such request: same blueprints, same view docstrings,
+so the generated spec matches the eager Swagger(app) one.
+
+Prebuilt spec: `flask --app app build-openapi` generates the document once from the
+registered blueprints and writes openapi/openapi.<hash>.json plus openapi/manifest.json.
+With OPENAPI_PREBUILT=true the app serves that file (immutable under its versioned
+name, revalidated via ETag under /openapi.json and /apispec_1.json) and docstrings are
+never parsed at runtime; the lazily built docs app then only serves the UI.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import click
+from flask import Flask, abort, request
+
+from config import Settings
+
+DOCS_PREFIXES = ("/apidocs", "/apispec", "/flasgger_static")
+UI_PREFIXES = ("/apidocs", "/flasgger_static")
+OPENAPI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "openapi")
+MANIFEST = "manifest.json"
+
+
+def build_docs_app() -> Flask:
+    from flasgger import Swagger
+    from routes import register_blueprints
+
+    docs = Flask(__name__)
+    docs.config["SWAGGER"] = Settings.SWAGGER
+    register_blueprints(docs)
+    Swagger(docs)
+    return docs
+
+
+class LazyDocs:
+    """WSGI middleware: docs paths go to a lazily built docs app, everything else to `app`."""
+
+    def __init__(self, app, factory=build_docs_app, prefixes=DOCS_PREFIXES):
+        self.app = app
+        self._factory = factory
+        self._prefixes = tuple(prefixes)
+        self._docs = None
+        self._lock = threading.Lock()
+
+    def _docs_app(self):
+        if self._docs is None:
+            with self._lock:
+                if self._docs is None:
+                    self._docs = self._factory()
+        return self._docs
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "").startswith(self._prefixes):
+            return self._docs_app()(environ, start_response)
+        return self.app(environ, start_response)
+
+
+# ---------- prebuilt spec ----------
+
+def generate_spec() -> bytes:
+    """The OpenAPI document flasgger would serve, as canonical (sorted, compact) JSON."""
+    docs = build_docs_app()
+    resp = docs.test_client().get("/apispec_1.json")
+    if resp.status_code != 200:
+        raise RuntimeError(f"spec generation failed: HTTP {resp.status_code}")
+    return json.dumps(resp.get_json(), sort_keys=True, separators=(",", ":")).encode()
+
+
+def write_spec(body: bytes, out_dir: str = OPENAPI_DIR, keep_old: bool = False) -> dict:
+    version = hashlib.sha256(body).hexdigest()[:12]
+    name = f"openapi.{version}.json"
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, name), "wb") as f:
+        f.write(body)
+    manifest = {"version": version, "file": name, "bytes": len(body)}
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    if not keep_old:
+        for old in os.listdir(out_dir):
+            if old.startswith("openapi.") and old.endswith(".json") and old != name:
+                os.remove(os.path.join(out_dir, old))
+    return manifest
+
+
+def read_manifest(out_dir: str = OPENAPI_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class PrebuiltSpec:
+    """Versioned spec file from build-openapi, read once and held in memory."""
+
+    def __init__(self, out_dir: str = OPENAPI_DIR):
+        self.out_dir = out_dir
+        self.manifest = read_manifest(out_dir)
+        self._body = None
+
+    def body(self):
+        if self.manifest is None:
+            return None
+        if self._body is None:
+            with open(os.path.join(self.out_dir, self.manifest["file"]), "rb") as f:
+                self._body = f.read()
+        return self._body
+
+
+def register_spec_routes(app: Flask, spec: PrebuiltSpec) -> None:
+    def respond(immutable: bool):
+        body = spec.body()
+        if body is None:
+            return {"error": "OpenAPI spec not built; run `flask --app app build-openapi`"}, 503
+        etag = spec.manifest["version"]
+        if request.if_none_match.contains(etag):
+            resp = app.response_class(status=304)
+        else:
+            resp = app.response_class(body, mimetype="application/json")
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = (
+            "public, max-age=31536000, immutable" if immutable else "public, max-age=300, must-revalidate"
+        )
+        return resp
+
+    @app.get("/openapi.json")
+    @app.get("/apispec_1.json")
+    def openapi_spec():
+        return respond(immutable=False)
+
+    @app.get("/openapi/<name>")
+    def openapi_versioned(name):
+        if spec.manifest is None or name != spec.manifest["file"]:
+            abort(404)
+        return respond(immutable=True)
+
+
+def init_docs(app: Flask) -> None:
+    """Swagger UI + spec per FAST_START / OPENAPI_PREBUILT, and the build-openapi command."""
+    if Settings.OPENAPI_PREBUILT:
+        spec = PrebuiltSpec()
+        if spec.manifest is None:
+            print("Warning: OPENAPI_PREBUILT is set but openapi/manifest.json is missing; run build-openapi")
+        register_spec_routes(app, spec)
+        app.wsgi_app = LazyDocs(app.wsgi_app, prefixes=UI_PREFIXES)
+    elif Settings.FAST_START:
+        app.wsgi_app = LazyDocs(app.wsgi_app)
+    else:
+        from flasgger import Swagger
+        Swagger(app)
+
+    @app.cli.command("build-openapi")
+    @click.option("--out", "out_dir", default=OPENAPI_DIR, show_default=True, help="Output directory")
+    @click.option("--keep-old", is_flag=True, help="Keep previously built versions")
+    @click.option("--check", is_flag=True, help="Exit 1 if the committed spec is stale instead of writing")
+    def build_openapi_command(out_dir, keep_old, check):
+        """Generate the OpenAPI document from route docstrings into a versioned JSON file."""
+        body = generate_spec()
+        version = hashlib.sha256(body).hexdigest()[:12]
+        if check:
+            current = read_manifest(out_dir)
+            if not current or current.get("version") != version:
+                raise click.ClickException(
+                    f"OpenAPI spec is stale ({(current or {}).get('version')} != {version}); run build-openapi"
+                )
+            click.echo(f"OpenAPI spec {version} is up to date")
+            return
+        manifest = write_spec(body, out_dir, keep_old=keep_old)
+        click.echo(f"Wrote {manifest['file']} ({manifest['bytes']} bytes)")
@@ -0,0 +1,85 @@
+"""
+HTTP caching for near-static reference endpoints (/labelOptions, /rangeConfig, /quizqn, ...).
+
+Whole reference tables are kept in the shared ref_cache; each distinct response
+(endpoint + query args) is serialized and hashed once per table version and memoized,
+so a repeat request is a dict lookup and an If-None-Match hit is answered with 304
+without touching the database or re-serializing the payload.
+
+Only 200 responses are memoized: a 404 for a made-up field_name/feeling is rebuilt each
+time, so junk query args cannot fill the memo. It is bounded LRU, so a flood of distinct
+valid keys evicts the least recently used entries rather than everything.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+from flask import current_app, request
+
+from config import Settings
+from .db import supabase, exec_data
+from .ref_cache import ref_cache
+
+# memo_key -> (version, body, etag) for 200 responses, least recently used first
+_responses: "OrderedDict[str, Tuple[Any, bytes, str]]" = OrderedDict()
+_responses_lock = threading.Lock()
+_MAX_MEMO_ENTRIES = 1024
+
+
+def table_key(table: str, columns: str, order: Optional[str] = None, desc: bool = False) -> str:
+    """ref_cache key cached_table() stores the rows under (for ref_cache.is_fresh checks)."""
+    return f"table:{table}:{columns}:{order}:{desc}"
+
+
+def cached_table(table: str, columns: str, order: Optional[str] = None, desc: bool = False) -> Tuple[List[dict], int]:
+    """All rows of a reference table via ref_cache -> (rows, version)."""
+    def load():
+        q = supabase.table(table).select(columns)
+        if order:
+            q = q.order(order, desc=desc)
+        return exec_data(q.execute()) or []
+
+    return ref_cache.get_versioned(table_key(table, columns, order, desc), load)
+
+
+def cache_control() -> str:
+    return (
+        f"public, max-age={Settings.HTTP_CACHE_MAX_AGE}, s-maxage={Settings.HTTP_CACHE_S_MAXAGE}, "
+        f"stale-while-revalidate={Settings.HTTP_CACHE_SWR}"
+    )
+
+
+def conditional_json(memo_key: str, version: Any, build: Callable[[], Tuple[Any, int]]):
+    """
+    JSON response for build() -> (payload, status), memoized per (memo_key, version).
+    200 responses carry a strong ETag (sha256 of the body) plus Cache-Control, and
+    If-None-Match matches short-circuit to 304. Other statuses are neither memoized nor cached.
+    """
+    with _responses_lock:
+        entry = _responses.get(memo_key)
+        if entry is not None and entry[0] == version:
+            _responses.move_to_end(memo_key)
+        else:
+            entry = None
+
+    if entry is None:
+        payload, status = build()
+        body = current_app.json.response(payload).get_data()
+        if status != 200:
+            return current_app.response_class(body, status=status, mimetype="application/json")
+        entry = (version, body, hashlib.sha256(body).hexdigest())
+        with _responses_lock:
+            _responses[memo_key] = entry
+            _responses.move_to_end(memo_key)
+            while len(_responses) > _MAX_MEMO_ENTRIES:
+                _responses.popitem(last=False)
+
+    _, body, etag = entry
+    if request.if_none_match.contains_weak(etag):
+        resp = current_app.response_class(status=304)
+    else:
+        resp = current_app.response_class(body, status=200, mimetype="application/json")
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = cache_control()
+    return resp
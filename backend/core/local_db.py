@@ -0,0 +1,795 @@
+"""
+SQLite stand-in for the Supabase client (DB_BACKEND=sqlite, see core/db.py).
+
+LocalClient implements the subset of the supabase-py / postgrest-py query builder the
+routes use, with PostgREST semantics where they matter (type coercion, NULL ordering,
+`or_` logic trees, resource embedding, RETURNING rows, error codes), so the API can be
+run, load-tested and benchmarked without a Supabase project:
+
+    supabase.table("moodMetric").select("*").eq("userId", 1)
+        .order("created_timestamp", desc=True).limit(10).execute()
+
+Schema and indexes mirror the hosted tables (userId, created_timestamp, email,
+username, friendofuid, ...). Errors are raised as postgrest APIError with the
+Postgres/PostgREST code (23505 unique violation, 42703 unknown column, ...).
+Postgres functions called through supabase.rpc() (sql/*.sql) have SQLite
+counterparts registered in RPC_FUNCTIONS.
+"""
+import json
+import re
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from postgrest import APIError, APIResponse
+from postgrest.base_request_builder import SingleAPIResponse
+
+# ---------- schema ----------
+# table -> {column: type}; types: pk (integer identity), int, real, text, bool, ts (timestamptz), json
+SCHEMA: Dict[str, Dict[str, str]] = {
+    "users": {
+        "userId": "pk", "email": "text", "password": "text", "username": "text", "mobile": "text",
+        "daily_quiz_at": "ts", "created_at": "ts",
+    },
+    "moodMetric": {
+        "id": "pk", "userId": "int", "created_timestamp": "ts", "sleepHours": "real",
+        "exerciseHours": "real", "workingHrs": "real", "sleepQuality": "int", "mood": "int",
+        "energy": "int", "stress": "int", "timeOutsideMin": "int", "connectwithfamily": "bool",
+        "notes": "text", "finalMoodScores": "real",
+    },
+    "friend": {
+        "id": "pk", "friendofuid": "int", "username": "text", "email": "text", "phone": "text",
+        "relationship": "text", "tags": "json", "emergencycontact": "bool", "created_at": "ts",
+    },
+    "quizqn": {
+        "key": "text", "prompt": "text", "input_type": "text", "unit": "text", "min_value": "real",
+        "max_value": "real", "step": "real", "scale_positive_high": "bool", "required": "bool",
+        "section": "text", "display_order": "int", "active": "bool",
+    },
+    "label_options": {"id": "pk", "field_name": "text", "labelvalue": "text"},
+    "range_config": {
+        "id": "pk", "min_value": "real", "max_value": "real", "step_value": "real", "field_name": "text",
+    },
+    "mascot": {"id": "pk", "feeling": "text", "encourageWords": "text"},
+    "scoringWeights": {
+        "component_key": "text", "weight": "real", "direction": "text", "transform": "text", "notes": "text",
+    },
+    "scoreBands": {
+        "band_key": "text", "label": "text", "min_score": "real", "max_score": "real",
+        "inclusive_min": "bool", "inclusive_max": "bool", "message": "text", "crisis_note": "text",
+        "display_order": "int", "tips": "json",
+    },
+    "moodRollup": {
+        "userId": "int", "granularity": "text", "bucket": "text", "row_count": "int",
+        "scored_count": "int", "score_sum": "real", "score_min": "real", "score_max": "real",
+        "last_score": "real", "last_timestamp": "ts", "last_mood_id": "int", "updated_at": "ts",
+    },
+}
+
+# Non-identity primary keys (default upsert conflict target)
+PRIMARY_KEYS = {
+    "quizqn": ("key",),
+    "scoringWeights": ("component_key",),
+    "scoreBands": ("band_key",),
+    "moodRollup": ("userId", "granularity", "bucket"),
+}
+
+_NOW_SQL = "(strftime('%Y-%m-%dT%H:%M:%f', 'now') || '000+00:00')"
+DEFAULTS = {
+    ("users", "created_at"): _NOW_SQL,
+    ("moodMetric", "created_timestamp"): _NOW_SQL,
+    ("friend", "created_at"): _NOW_SQL,
+    ("moodRollup", "row_count"): "0",
+    ("moodRollup", "scored_count"): "0",
+    ("moodRollup", "score_sum"): "0.0",
+    ("moodRollup", "updated_at"): _NOW_SQL,
+}
+
+INDEXES = [
+    'CREATE UNIQUE INDEX IF NOT EXISTS "users_email_key" ON "users" ("email")',
+    'CREATE INDEX IF NOT EXISTS "users_username_idx" ON "users" ("username")',
+    'CREATE INDEX IF NOT EXISTS "moodMetric_userId_idx" ON "moodMetric" ("userId")',
+    'CREATE INDEX IF NOT EXISTS "moodMetric_created_timestamp_idx" ON "moodMetric" ("created_timestamp")',
+    'CREATE INDEX IF NOT EXISTS "moodMetric_userId_created_id_idx" '
+    'ON "moodMetric" ("userId", "created_timestamp" DESC, "id" DESC)',
+    'CREATE INDEX IF NOT EXISTS "friend_friendofuid_idx" ON "friend" ("friendofuid")',
+    'CREATE INDEX IF NOT EXISTS "moodRollup_bucket_idx" ON "moodRollup" ("bucket")',
+]
+
+# (parent, child) -> (parent column, child column) for resource embedding
+EMBEDS = {("users", "moodMetric"): ("userId", "userId")}
+
+# Per-request query counter: set to [0] around a request and every execute() in that
+# context (including fan_out workers, which copy the context) increments it.
+query_tally: ContextVar[Optional[list]] = ContextVar("local_db_query_tally", default=None)
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _ddl(table: str, cols: Dict[str, str]) -> str:
+    parts = []
+    for col, typ in cols.items():
+        if typ == "pk":
+            parts.append(f"{_q(col)} INTEGER PRIMARY KEY")
+            continue
+        sql_type = {"int": "INTEGER", "real": "REAL", "bool": "INTEGER"}.get(typ, "TEXT")
+        default = DEFAULTS.get((table, col))
+        parts.append(f"{_q(col)} {sql_type}" + (f" DEFAULT {default}" if default else ""))
+    if table in PRIMARY_KEYS:
+        parts.append("PRIMARY KEY (" + ", ".join(_q(c) for c in PRIMARY_KEYS[table]) + ")")
+    return f"CREATE TABLE IF NOT EXISTS {_q(table)} ({', '.join(parts)})"
+
+
+# ---------- errors and value coercion ----------
+def _error(code: str, message: str, details: Optional[str] = None, hint: Optional[str] = None) -> APIError:
+    return APIError({"code": code, "message": message, "details": details, "hint": hint})
+
+
+def _ts_in(v) -> str:
+    """timestamptz -> fixed-width UTC text, so string order is time order."""
+    if isinstance(v, datetime):
+        dt = v
+    else:
+        try:
+            dt = datetime.fromisoformat(str(v).strip().replace("Z", "+00:00").replace(" ", "T", 1))
+        except ValueError:
+            raise _error("22007", f'invalid input syntax for type timestamp with time zone: "{v}"')
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _ts_out(v: str) -> str:
+    """Stored text -> PostgREST's rendering (fractional seconds without trailing zeros)."""
+    head, _, frac = v[:-6].partition(".")
+    frac = frac.rstrip("0")
+    return head + ("." + frac if frac else "") + v[-6:]
+
+
+_TRUE = {"true", "t", "1", "yes", "y", "on"}
+_FALSE = {"false", "f", "0", "no", "n", "off"}
+
+
+def _to_db(typ: str, v):
+    if v is None:
+        return None
+    try:
+        if typ in ("int", "pk"):
+            if isinstance(v, (bool, int)):
+                return int(v)
+            if isinstance(v, str) and v.strip().lstrip("+-").isdigit():
+                return int(v)
+            f = float(v)
+            if not f.is_integer():
+                raise ValueError
+            return int(f)
+        if typ == "real":
+            return float(v)
+        if typ == "bool":
+            if isinstance(v, bool):
+                return int(v)
+            s = str(v).strip().lower()
+            if s in _TRUE:
+                return 1
+            if s in _FALSE:
+                return 0
+            raise ValueError
+    except (TypeError, ValueError):
+        sql_type = {"int": "bigint", "pk": "bigint", "real": "double precision", "bool": "boolean"}[typ]
+        raise _error("22P02", f'invalid input syntax for type {sql_type}: "{v}"')
+    if typ == "ts":
+        return _ts_in(v)
+    if typ == "json":
+        return json.dumps(v)
+    return v if isinstance(v, str) else str(v)
+
+
+def _from_db(typ: str, v):
+    if v is None:
+        return None
+    if typ == "bool":
+        return bool(v)
+    if typ == "ts":
+        return _ts_out(v)
+    if typ == "json":
+        return json.loads(v)
+    if typ == "real":
+        return float(v)
+    return v
+
+
+# ---------- PostgREST filter syntax ----------
+def _split_top(s: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes."""
+    out, depth, quoted, cur = [], 0, False, []
+    i = 0
+    while i < len(s):
+        ch = s[i]
+        if ch == "\\" and quoted and i + 1 < len(s):
+            cur.append(s[i:i + 2])
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            out.append("".join(cur))
+            cur = []
+        else:
+            cur.append(ch)
+        i += 1
+    if cur:
+        out.append("".join(cur))
+    return [p.strip() for p in out if p.strip()]
+
+
+def _unquote(v: str) -> str:
+    v = v.strip()
+    if len(v) >= 2 and v[0] == '"' and v[-1] == '"':
+        return v[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return v
+
+
+def _like_to_glob(pattern: str) -> str:
+    out, escaped = [], False
+    for ch in pattern:
+        if escaped:
+            out.append(f"[{ch}]" if ch in "*?[]" else ch)  # \% \_ \\ match literally (LIKE's default escape)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in "*%":
+            out.append("*")
+        elif ch == "_":
+            out.append("?")
+        elif ch in "[]?":
+            out.append(f"[{ch}]")
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+_OPS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class _Filters:
+    """WHERE-clause builder shared by select/update/delete."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.cols = SCHEMA[table]
+        self.clauses: List[Tuple[str, list]] = []
+        self.params: List[Tuple[str, str]] = []  # PostgREST query-param form, for tracing
+
+    def _col(self, col: str) -> str:
+        if col not in self.cols:
+            raise _error("42703", f"column {self.table}.{col} does not exist")
+        return _q(col)
+
+    def _val(self, col: str, v):
+        return _to_db(self.cols[col], v)
+
+    def cond(self, col: str, op: str, value, negate: bool = False) -> Tuple[str, list]:
+        c = self._col(col)
+        if op in _OPS:
+            sql, params = f"{c} {_OPS[op]} ?", [self._val(col, value)]
+        elif op == "is":
+            v = str(value).lower() if not isinstance(value, bool) and value is not None else value
+            if v in (None, "null"):
+                sql, params = f"{c} IS NULL", []
+            elif v in (True, "true"):
+                sql, params = f"{c} = 1", []
+            elif v in (False, "false"):
+                sql, params = f"{c} = 0", []
+            else:
+                raise _error("PGRST100", f'"failed to parse filter (is.{value})"')
+        elif op == "in":
+            values = list(value)
+            if not values:
+                sql, params = "0", []
+            else:
+                sql = f"{c} IN ({', '.join('?' for _ in values)})"
+                params = [self._val(col, v) for v in values]
+        elif op == "like":
+            sql, params = f"{c} GLOB ?", [_like_to_glob(str(value))]
+        elif op == "ilike":
+            sql, params = f"lower({c}) GLOB ?", [_like_to_glob(str(value).lower())]
+        else:
+            raise _error("PGRST100", f'"failed to parse filter ({op})"')
+        if negate:
+            sql = f"NOT ({sql})"
+        return sql, params
+
+    def add(self, col: str, op: str, value, negate: bool = False) -> None:
+        self.clauses.append(self.cond(col, op, value, negate))
+        shown = f"({','.join(map(str, value))})" if op == "in" else value
+        self.params.append((col, f"{'not.' if negate else ''}{op}.{shown}"))
+
+    def _tree(self, expr: str, joiner: str) -> Tuple[str, list]:
+        parts, params = [], []
+        for item in _split_top(expr):
+            m = re.match(r"^(not\.)?(and|or)\((.*)\)$", item, re.S)
+            if m:
+                sql, p = self._tree(m.group(3), " AND " if m.group(2) == "and" else " OR ")
+                if m.group(1):
+                    sql = f"NOT {sql}"
+            else:
+                try:
+                    col, op, raw = item.split(".", 2)
+                    negate = op == "not"
+                    if negate:
+                        op, raw = raw.split(".", 1)
+                except ValueError:
+                    raise _error("PGRST100", f'"failed to parse logic tree ({expr})"')
+                if op == "in":
+                    value = [_unquote(v) for v in _split_top(raw.strip()[1:-1])]
+                else:
+                    value = _unquote(raw)
+                sql, p = self.cond(col, op, value, negate)
+            parts.append(sql)
+            params.extend(p)
+        return "(" + joiner.join(parts) + ")", params
+
+    def add_tree(self, expr: str, joiner: str = " OR ") -> None:
+        self.clauses.append(self._tree(expr, joiner))
+        self.params.append(("or" if joiner == " OR " else "and", f"({expr})"))
+
+    def sql(self) -> Tuple[str, list]:
+        if not self.clauses:
+            return "", []
+        params = [p for _, ps in self.clauses for p in ps]
+        return " WHERE " + " AND ".join(s for s, _ in self.clauses), params
+
+
+# ---------- query builder ----------
+class LocalQuery:
+    def __init__(self, client: "LocalClient", table: str):
+        if table not in SCHEMA:
+            raise _error("42P01", f'relation "public.{table}" does not exist')
+        self._client = client
+        self._table = table
+        self._cols = SCHEMA[table]
+        self._op = "select"
+        self._select: List[str] = list(self._cols)
+        self._embeds: Dict[str, List[str]] = {}
+        self._payload: Any = None
+        self._count: Optional[str] = None
+        self._returning = "representation"
+        self._default_to_null = True
+        self._on_conflict: Optional[str] = None
+        self._ignore_duplicates = False
+        self._filters = _Filters(table)
+        self._order: Dict[Optional[str], List[Tuple[str, bool, Optional[bool]]]] = {}
+        self._limit: Dict[Optional[str], int] = {}
+        self._offset: Optional[int] = None
+
+    # --- operations ---
+    def select(self, *columns: str, count: Optional[str] = None) -> "LocalQuery":
+        self._op = "select"
+        self._count = count
+        cols, embeds = [], {}
+        for part in _split_top(",".join(columns) or "*"):
+            m = re.match(r"^(\w+)\((.*)\)$", part, re.S)
+            if m:
+                child = m.group(1)
+                if (self._table, child) not in EMBEDS:
+                    raise _error(
+                        "PGRST200",
+                        f"Could not find a relationship between '{self._table}' and '{child}' in the schema cache",
+                    )
+                inner = _split_top(m.group(2) or "*")
+                embeds[child] = list(SCHEMA[child]) if inner == ["*"] else inner
+            elif part == "*":
+                cols.extend(c for c in self._cols if c not in cols)
+            else:
+                self._filters._col(part)
+                cols.append(part)
+        self._select, self._embeds = cols, embeds
+        return self
+
+    def insert(self, json_, *, count=None, returning="representation", upsert=False, default_to_null=True):
+        self._op = "upsert" if upsert else "insert"
+        self._payload, self._count, self._returning = json_, count, str(getattr(returning, "value", returning))
+        self._default_to_null = default_to_null
+        return self
+
+    def upsert(self, json_, *, count=None, returning="representation", ignore_duplicates=False,
+               on_conflict="", default_to_null=True):
+        self.insert(json_, count=count, returning=returning, default_to_null=default_to_null)
+        self._op = "upsert"
+        self._on_conflict = on_conflict or None
+        self._ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, json_, *, count=None, returning="representation"):
+        self._op = "update"
+        self._payload, self._count, self._returning = json_, count, str(getattr(returning, "value", returning))
+        return self
+
+    def delete(self, *, count=None, returning="representation"):
+        self._op = "delete"
+        self._count, self._returning = count, str(getattr(returning, "value", returning))
+        return self
+
+    # --- filters ---
+    def eq(self, column, value): self._filters.add(column, "eq", value); return self
+    def neq(self, column, value): self._filters.add(column, "neq", value); return self
+    def gt(self, column, value): self._filters.add(column, "gt", value); return self
+    def gte(self, column, value): self._filters.add(column, "gte", value); return self
+    def lt(self, column, value): self._filters.add(column, "lt", value); return self
+    def lte(self, column, value): self._filters.add(column, "lte", value); return self
+    def like(self, column, pattern): self._filters.add(column, "like", pattern); return self
+    def ilike(self, column, pattern): self._filters.add(column, "ilike", pattern); return self
+    def is_(self, column, value): self._filters.add(column, "is", value); return self
+    def in_(self, column, values): self._filters.add(column, "in", values); return self
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "LocalQuery":
+        self._filters.add_tree(filters, " OR ")
+        return self
+
+    def filter(self, column: str, operator: str, criteria) -> "LocalQuery":
+        negate = operator.startswith("not.")
+        op = operator[4:] if negate else operator
+        if op == "in":
+            criteria = [_unquote(v) for v in _split_top(str(criteria).strip()[1:-1])]
+        self._filters.add(column, op, criteria, negate)
+        return self
+
+    # --- modifiers ---
+    def order(self, column, *, desc=False, nullsfirst=None, foreign_table=None) -> "LocalQuery":
+        self._order.setdefault(foreign_table, []).append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table=None) -> "LocalQuery":
+        self._limit[foreign_table] = int(size)
+        return self
+
+    def range(self, start: int, end: int, foreign_table=None) -> "LocalQuery":
+        self._offset = int(start)
+        self._limit[foreign_table] = int(end) - int(start) + 1
+        return self
+
+    def trace_info(self) -> Tuple[str, str, List[Tuple[str, str]], Any]:
+        """(HTTP method, table, filter params, payload) as PostgREST would see them (core/query_trace.py)."""
+        method = {"select": "GET", "insert": "POST", "upsert": "POST", "update": "PATCH", "delete": "DELETE"}[self._op]
+        return method, self._table, list(self._filters.params), self._payload
+
+    # --- execution ---
+    def _order_sql(self, table: str, key: Optional[str]) -> str:
+        terms = []
+        for col, desc, nullsfirst in self._order.get(key, []):
+            if col not in SCHEMA[table]:
+                raise _error("42703", f"column {table}.{col} does not exist")
+            if nullsfirst is None:
+                nullsfirst = desc  # PostgreSQL default: NULLS LAST for ASC, NULLS FIRST for DESC
+            terms.append(f"{_q(col)} {'DESC' if desc else 'ASC'} NULLS {'FIRST' if nullsfirst else 'LAST'}")
+        return " ORDER BY " + ", ".join(terms) if terms else ""
+
+    def _rows_out(self, table: str, rows, cols: Optional[List[str]] = None) -> List[dict]:
+        types = SCHEMA[table]
+        out = []
+        for r in rows:
+            keys = cols or r.keys()
+            out.append({k: _from_db(types[k], r[k]) for k in keys})
+        return out
+
+    def execute(self) -> APIResponse:
+        if self._client.latency:
+            time.sleep(self._client.latency)  # simulated PostgREST round trip
+        with self._client._lock:
+            conn = self._client._conn
+            try:
+                if self._op == "select":
+                    data, count = self._run_select(conn)
+                else:
+                    conn.execute("BEGIN")
+                    try:
+                        data = self._run_write(conn)
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+                    conn.execute("COMMIT")
+                    count = len(data) if self._count else None
+                    if self._returning == "minimal":
+                        data = []
+            except sqlite3.IntegrityError as e:
+                raise self._integrity_error(e)
+            except sqlite3.Error as e:
+                raise _error("XX000", str(e))
+        self._client.queries += 1
+        tally = query_tally.get()
+        if tally is not None:
+            tally[0] += 1
+        return APIResponse(data=data, count=count)
+
+    def _run_select(self, conn) -> Tuple[List[dict], Optional[int]]:
+        where, params = self._filters.sql()
+        cols = list(self._select)
+        link = None
+        for child in self._embeds:
+            link = EMBEDS[(self._table, child)][0]
+            if link not in cols:
+                cols.append(link)
+        sql = f"SELECT {', '.join(_q(c) for c in cols) or '1'} FROM {_q(self._table)}{where}"
+        sql += self._order_sql(self._table, None)
+        if None in self._limit or self._offset is not None:
+            sql += f" LIMIT {self._limit.get(None, -1)} OFFSET {self._offset or 0}"
+        rows = self._rows_out(self._table, conn.execute(sql, params).fetchall(), cols)
+
+        for child, child_cols in self._embeds.items():
+            parent_col, child_col = EMBEDS[(self._table, child)]
+            keys = sorted({r[parent_col] for r in rows if r[parent_col] is not None})
+            grouped: Dict[Any, List[dict]] = {}
+            if keys:
+                csql = (
+                    f"SELECT * FROM {_q(child)} WHERE {_q(child_col)} IN ({', '.join('?' for _ in keys)})"
+                    + self._order_sql(child, child)
+                )
+                for cr in self._rows_out(child, conn.execute(csql, keys).fetchall()):
+                    grouped.setdefault(cr[child_col], []).append(cr)
+            cap = self._limit.get(child)
+            for r in rows:
+                kids = grouped.get(r[parent_col], [])
+                r[child] = [{k: c[k] for k in child_cols} for c in (kids[:cap] if cap is not None else kids)]
+        if link is not None and link not in self._select:
+            for r in rows:
+                r.pop(link, None)
+
+        count = None
+        if self._count:
+            count = conn.execute(f"SELECT COUNT(*) FROM {_q(self._table)}{where}", params).fetchone()[0]
+        return rows, count
+
+    def _payload_rows(self) -> List[dict]:
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        for r in rows:
+            for k in r:
+                if k not in self._cols:
+                    raise _error("PGRST204", f"Could not find the '{k}' column of '{self._table}' in the schema cache")
+        if isinstance(self._payload, list) and self._default_to_null:
+            union = []
+            for r in rows:
+                union.extend(k for k in r if k not in union)
+            rows = [{k: r.get(k) for k in union} for r in rows]
+        return [{k: _to_db(self._cols[k], v) for k, v in r.items()} for r in rows]
+
+    def _run_write(self, conn) -> List[dict]:
+        table = _q(self._table)
+        if self._op in ("update", "delete"):
+            where, params = self._filters.sql()
+            if not where:
+                verb = "UPDATE" if self._op == "update" else "DELETE"
+                raise _error("21000", f"{verb} requires a WHERE clause")
+            if self._op == "update":
+                sets = self._payload_rows()[0]
+                if not sets:
+                    return []
+                assignments = ", ".join(f"{_q(k)} = ?" for k in sets)
+                cur = conn.execute(f"UPDATE {table} SET {assignments}{where} RETURNING *", list(sets.values()) + params)
+            else:
+                cur = conn.execute(f"DELETE FROM {table}{where} RETURNING *", params)
+            return self._rows_out(self._table, cur.fetchall())
+
+        conflict = None
+        if self._op == "upsert":
+            conflict = [c.strip() for c in (self._on_conflict or "").split(",") if c.strip()]
+            if not conflict:
+                conflict = list(PRIMARY_KEYS.get(self._table) or [next(c for c, t in self._cols.items() if t == "pk")])
+        out = []
+        for row in self._payload_rows():
+            cols = list(row)
+            if cols:
+                sql = f"INSERT INTO {table} ({', '.join(_q(c) for c in cols)}) VALUES ({', '.join('?' for _ in cols)})"
+            else:
+                sql = f"INSERT INTO {table} DEFAULT VALUES"
+            if conflict:
+                target = ", ".join(_q(c) for c in conflict)
+                updates = [c for c in cols if c not in conflict]
+                if self._ignore_duplicates or not updates:
+                    sql += f" ON CONFLICT ({target}) DO NOTHING"
+                else:
+                    sql += f" ON CONFLICT ({target}) DO UPDATE SET " + ", ".join(
+                        f"{_q(c)} = excluded.{_q(c)}" for c in updates
+                    )
+            out.extend(self._rows_out(self._table, conn.execute(sql + " RETURNING *", list(row.values())).fetchall()))
+        return out
+
+    def _integrity_error(self, e: sqlite3.IntegrityError) -> APIError:
+        msg = str(e)
+        m = re.search(r"UNIQUE constraint failed: (.+)$", msg)
+        if m:
+            cols = [c.split(".", 1)[-1] for c in m.group(1).split(", ")]
+            key = "_".join(cols)
+            return _error(
+                "23505",
+                f'duplicate key value violates unique constraint "{self._table}_{key}_key"',
+                details=f"Key ({', '.join(cols)}) already exists.",
+            )
+        if "NOT NULL" in msg:
+            return _error("23502", msg)
+        return _error("23000", msg)
+
+
+# ---------- rpc ----------
+# SQLite versions of the Postgres functions in sql/*.sql: name -> fn(conn, params) -> data
+RPC_FUNCTIONS: Dict[str, Callable[[sqlite3.Connection, dict], Any]] = {}
+
+
+def rpc_function(name: str):
+    def register(fn):
+        RPC_FUNCTIONS[name] = fn
+        return fn
+    return register
+
+
+@rpc_function("advance_daily_quiz_at")
+def _advance_daily_quiz_at(conn, params) -> List[int]:
+    """sql/daily_quiz_at.sql: set users.daily_quiz_at per userId, never moving it backwards."""
+    moved = []
+    for u in params.get("updates") or []:
+        ts = _ts_in(u["daily_quiz_at"])
+        rows = conn.execute(
+            'UPDATE "users" SET "daily_quiz_at" = ? WHERE "userId" = ? '
+            'AND ("daily_quiz_at" IS NULL OR "daily_quiz_at" < ?) RETURNING "userId"',
+            (ts, _to_db("int", u["userId"]), ts),
+        ).fetchall()
+        moved.extend(r[0] for r in rows)
+    return moved
+
+
+_ROLLUP_NEWER = (
+    'excluded."last_timestamp" IS NOT NULL AND ("last_timestamp" IS NULL '
+    'OR excluded."last_timestamp" > "last_timestamp" '
+    'OR (excluded."last_timestamp" = "last_timestamp" '
+    'AND coalesce(excluded."last_mood_id", 0) > coalesce("last_mood_id", 0)))'
+)
+
+
+@rpc_function("mood_rollup_apply")
+def _mood_rollup_apply(conn, params) -> int:
+    """sql/mood_rollup.sql: add per-bucket deltas into moodRollup in place."""
+    cols = SCHEMA["moodRollup"]
+    names = [c for c in cols if c != "updated_at"]
+    sql = (
+        f'INSERT INTO "moodRollup" ({", ".join(_q(c) for c in names)}) '
+        f'VALUES ({", ".join("?" for _ in names)}) '
+        'ON CONFLICT ("userId", "granularity", "bucket") DO UPDATE SET '
+        '"row_count" = "row_count" + excluded."row_count", '
+        '"scored_count" = "scored_count" + excluded."scored_count", '
+        '"score_sum" = "score_sum" + excluded."score_sum", '
+        '"score_min" = coalesce(min("score_min", excluded."score_min"), "score_min", excluded."score_min"), '
+        '"score_max" = coalesce(max("score_max", excluded."score_max"), "score_max", excluded."score_max"), '
+        + ", ".join(
+            f'{_q(c)} = CASE WHEN {_ROLLUP_NEWER} THEN excluded.{_q(c)} ELSE {_q(c)} END'
+            for c in ("last_score", "last_mood_id", "last_timestamp")
+        )
+        + f', "updated_at" = {_NOW_SQL}'
+    )
+    deltas = params.get("deltas") or []
+    for d in deltas:
+        conn.execute(sql, [_to_db(cols[c], d.get(c)) for c in names])
+    return len(deltas)
+
+
+class LocalRpc:
+    """supabase.rpc(fn, params): one transaction running a function from RPC_FUNCTIONS."""
+
+    def __init__(self, client: "LocalClient", fn: str, params: Optional[dict]):
+        if fn not in RPC_FUNCTIONS:
+            raise _error("PGRST202", f"Could not find the function public.{fn} in the schema cache")
+        self._client = client
+        self._fn = fn
+        self._params = params or {}
+
+    def trace_info(self) -> Tuple[str, str, List[Tuple[str, str]], Any]:
+        return "POST", f"rpc/{self._fn}", [], self._params
+
+    def execute(self) -> SingleAPIResponse:
+        if self._client.latency:
+            time.sleep(self._client.latency)
+        with self._client._lock:
+            conn = self._client._conn
+            try:
+                conn.execute("BEGIN")
+                try:
+                    data = RPC_FUNCTIONS[self._fn](conn, self._params)
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError as e:
+                raise _error("23000", str(e))
+            except sqlite3.Error as e:
+                raise _error("XX000", str(e))
+        self._client.queries += 1
+        tally = query_tally.get()
+        if tally is not None:
+            tally[0] += 1
+        return SingleAPIResponse(data=data, count=None)  # what postgrest-py's rpc() returns
+
+
+class LocalClient:
+    """
+    Drop-in for supabase.Client's table and rpc API, backed by one SQLite database.
+    latency_ms adds a fixed delay per execute() to approximate the hosted round trip.
+    """
+
+    def __init__(self, path: str = ":memory:", latency_ms: float = 0.0):
+        self.path = path
+        self.latency = latency_ms / 1000.0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            for table, cols in SCHEMA.items():
+                self._conn.execute(_ddl(table, cols))
+            for stmt in INDEXES:
+                self._conn.execute(stmt)
+        self.queries = 0
+
+    def table(self, table_name: str) -> LocalQuery:
+        return LocalQuery(self, table_name)
+
+    from_ = table
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> LocalRpc:
+        return LocalRpc(self, fn, params)
+
+    def bulk_load(self, table: str, rows: Iterable[dict], batch_size: int = 10000) -> int:
+        """
+        Fast fixture load (executemany, no RETURNING) for large synthetic volumes.
+        Every row must have the same keys as the first one. Returns rows written.
+        """
+        types = SCHEMA[table]
+        written, batch, cols = 0, [], None
+
+        def flush():
+            sql = (f"INSERT INTO {_q(table)} ({', '.join(_q(c) for c in cols)}) "
+                   f"VALUES ({', '.join('?' for _ in cols)})")
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(sql, batch)
+                self._conn.execute("COMMIT")
+
+        for r in rows:
+            if cols is None:
+                cols = list(r)
+            batch.append([_to_db(types[c], r.get(c)) for c in cols])
+            if len(batch) >= batch_size:
+                flush()
+                written += len(batch)
+                batch = []
+        if batch:
+            flush()
+            written += len(batch)
+        return written
+
+    def backup_to(self, path: str) -> None:
+        """Consistent copy of the whole database into another SQLite file."""
+        dest = sqlite3.connect(path)
+        try:
+            with self._lock:
+                self._conn.backup(dest)
+        finally:
+            dest.close()
+
+    def row_count(self, table: str) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {_q(table)}").fetchone()[0]
+
+    def seed(self, tables: Dict[str, List[dict]]) -> None:
+        """Insert fixture rows, e.g. reference tables: {"scoreBands": [...], "quizqn": [...]}."""
+        for table, rows in tables.items():
+            if rows:
+                self.table(table).insert(rows).execute()
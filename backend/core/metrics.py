@@ -0,0 +1,250 @@
+"""
+Per-request timing: Server-Timing header + Prometheus histograms at /metrics.
+
+Every request gets a RequestTimings in a ContextVar (fan_out workers copy the context,
+so concurrent reads are attributed to the request that issued them). Query builders'
+.execute() (postgrest-py and core/local_db.py) add their wall time and a count to it,
+and the app's JSON provider adds serialization time. After the response is built the
+totals go out as
+
+    Server-Timing: db;dur=12.3;desc="4 queries", ser;dur=0.4, app;dur=3.1, total;dur=15.8
+
+and are observed into per-endpoint histograms. DB time is the sum over calls, so with
+fan_out it can exceed the request's wall time; "app" is total minus db and ser,
+floored at 0. Metrics are per process (one registry per gunicorn worker).
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, Response, g, request
+from flask.json.provider import DefaultJSONProvider
+
+from config import Settings
+from . import query_trace
+from .db import on_client_ready
+
+# Seconds; roughly x2.5 steps from 1ms to 10s
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestTimings:
+    __slots__ = ("db", "db_calls", "ser", "queries")
+
+    def __init__(self, trace: bool = False):
+        self.db = 0.0
+        self.db_calls = 0
+        self.ser = 0.0
+        self.queries = [] if trace else None  # per-query records for core/query_trace.py
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by a label tuple (cumulative on render)."""
+
+    def __init__(self, name: str, doc: str, labels: Tuple[str, ...], buckets=BUCKETS):
+        self.name, self.doc, self.labels, self.buckets = name, doc, labels, buckets
+        self._series: Dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values: tuple, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(label_values)
+            if s is None:
+                s = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            s[i] += 1
+            s[-1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for label_values, s in sorted(series.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            cum = 0
+            for le, n in zip(self.buckets, s):
+                cum += n
+                lines.append(f'{self.name}_bucket{{{base},le="{le}"}} {cum}')
+            cum += s[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {cum}')
+            lines.append(f"{self.name}_sum{{{base}}} {s[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cum}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, doc: str, labels: Tuple[str, ...]):
+        self.name, self.doc, self.labels = name, doc, labels
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label_values, v in sorted(values.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{base}}} {v:g}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_ENDPOINT = ("blueprint", "endpoint", "method")
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request wall time", _ENDPOINT)
+DB_SECONDS = Histogram("http_request_db_seconds", "Summed DB call time per request", _ENDPOINT)
+SER_SECONDS = Histogram("http_request_serialization_seconds", "JSON serialization time per request", _ENDPOINT)
+REQUESTS = Counter("http_requests_total", "Requests by status code", _ENDPOINT + ("status",))
+DB_CALLS = Counter("db_calls_total", "DB calls (.execute()) issued by requests", _ENDPOINT)
+
+
+def _timed_execute(execute):
+    @wraps(execute)
+    def wrapper(self, *args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return execute(self, *args, **kwargs)
+        t0 = time.perf_counter()
+        result = error = None
+        try:
+            result = execute(self, *args, **kwargs)
+            return result
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            timings.db += elapsed
+            timings.db_calls += 1  # int/float += from fan_out threads: GIL-atomic enough for stats
+            if timings.queries is not None:
+                query_trace.record(timings.queries, self, t0, elapsed, result, error)
+    wrapper._timed = True
+    return wrapper
+
+
+def instrument_execute() -> None:
+    """
+    Wrap .execute() on every sync query builder that defines one (idempotent).
+    Only the active backend's builders are patched, so this imports nothing heavy
+    that the client itself has not already pulled in (core.db.on_client_ready).
+    """
+    if Settings.DB_BACKEND == "sqlite":
+        from .local_db import LocalQuery, LocalRpc
+        classes = [LocalQuery, LocalRpc]
+    else:
+        from postgrest._sync import request_builder as rb
+        classes = [c for c in vars(rb).values() if isinstance(c, type) and "execute" in vars(c)]
+    for cls in classes:
+        execute = vars(cls)["execute"]
+        if not getattr(execute, "_timed", False):
+            cls.execute = _timed_execute(execute)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default provider that charges dumps() time to the current request."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        timings = _current.get()
+        if timings is None:
+            return super().dumps(obj, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            timings.ser += time.perf_counter() - t0
+
+
+def _labels() -> tuple:
+    endpoint = request.endpoint or "<unmatched>"
+    return (request.blueprint or "", endpoint, request.method)
+
+
+_POOL_COUNTERS = {"waits", "requests", "retried", "failures"}
+_CACHE_COUNTERS = {"hits", "misses", "loads", "errors"}
+
+
+def _flat(prefix: str, stats: dict, counters: set) -> list:
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            lines += [f"# TYPE {prefix}_{key}_total counter", f"{prefix}_{key}_total {value}"]
+        else:
+            lines += [f"# TYPE {prefix}_{key} gauge", f"{prefix}_{key} {value}"]
+    return lines
+
+
+def render_metrics() -> str:
+    from .db import db_pool_stats
+    from .ref_cache import ref_cache
+    from .user_cache import user_cache
+
+    lines = []
+    for metric in (REQUEST_SECONDS, DB_SECONDS, SER_SECONDS, REQUESTS, DB_CALLS):
+        lines.extend(metric.render())
+    lines.extend(_flat("db_pool", db_pool_stats(), _POOL_COUNTERS))
+    lines.extend(_flat("ref_cache", ref_cache.stats(), _CACHE_COUNTERS))
+    lines.extend(_flat("user_cache", user_cache.stats(), _CACHE_COUNTERS | {"negative_hits", "coalesced", "evictions"}))
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app: Flask) -> None:
+    """Install the JSON provider, .execute() wrappers, request hooks and GET /metrics."""
+    if not Settings.METRICS_ENABLED:
+        return
+    app.json_provider_class = TimedJSONProvider
+    app.json = TimedJSONProvider(app)
+    on_client_ready(instrument_execute)
+
+    @app.before_request
+    def _start_timing():
+        g._timings_start = time.perf_counter()
+        _current.set(RequestTimings(trace=Settings.QUERY_TRACE))
+
+    @app.after_request
+    def _finish_timing(response):
+        start = g.pop("_timings_start", None)
+        timings = _current.get()
+        if start is None or timings is None:
+            return response
+        _current.set(None)
+        total = time.perf_counter() - start
+        if request.endpoint in ("metrics", "debug_queries"):
+            return response
+        if timings.queries is not None:
+            query_trace.finish(request.method, request.full_path.rstrip("?"), request.endpoint,
+                               response.status_code, total, timings.queries)
+
+        labels = _labels()
+        REQUEST_SECONDS.observe(labels, total)
+        DB_SECONDS.observe(labels, timings.db)
+        SER_SECONDS.observe(labels, timings.ser)
+        REQUESTS.inc(labels + (str(response.status_code),))
+        if timings.db_calls:
+            DB_CALLS.inc(labels, timings.db_calls)
+
+        if Settings.SERVER_TIMING:
+            app_time = max(0.0, total - timings.db - timings.ser)
+            response.headers["Server-Timing"] = (
+                f'db;dur={timings.db * 1000:.1f};desc="{timings.db_calls} queries", '
+                f"ser;dur={timings.ser * 1000:.1f}, app;dur={app_time * 1000:.1f}, "
+                f"total;dur={total * 1000:.1f}"
+            )
+        return response
+
+    @app.get("/metrics")
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,47 @@
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor for the last row of a page (e.g. its sort key and id)."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[list]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_fields(fields_arg: Optional[str], allowed, required=()) -> Optional[list]:
+    """
+    Parse a comma-separated ?fields= projection against an allow-list.
+    Returns None when no projection was asked for; raises ValueError on unknown columns.
+    Columns in `required` (e.g. keyset columns) are always included.
+    """
+    if not fields_arg:
+        return None
+    cols = [c.strip() for c in fields_arg.split(",") if c.strip()]
+    unknown = [c for c in cols if c not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    for c in required:
+        if c not in cols:
+            cols.append(c)
+    return cols
+
+
+def clamp_limit(limit: Optional[int], default: int, maximum: int) -> int:
+    if limit is None:
+        return default
+    return max(1, min(int(limit), maximum))
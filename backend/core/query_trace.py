@@ -0,0 +1,217 @@
+"""
+Query tracing (QUERY_TRACE=true): every .execute() in a request is captured with its
+table, method, filters, duration and rows returned (hooked from core/metrics.py), and
+the finished request is checked for avoidable round trips:
+
+- repeated:          the same read issued more than once in one request
+- n_plus_one:        the same query shape (table, method, filter columns) issued
+                     QUERY_TRACE_N_PLUS_ONE or more times with different values
+- select_then_write: a read on a key followed by a write on the same table and key
+                     (check-then-insert, read-then-update, select-then-delete)
+
+The last QUERY_TRACE_BUFFER request traces are kept in a ring buffer; summary() ranks
+query shapes and findings by cumulative time for GET /debug/queries, and requests with
+findings are printed as they finish.
+"""
+import json
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Settings
+
+# PostgREST params that shape the response but do not select rows
+_NON_FILTER_PARAMS = frozenset({"select", "order", "limit", "offset", "columns", "on_conflict"})
+
+_traces: deque = deque(maxlen=Settings.QUERY_TRACE_BUFFER)
+_traces_lock = threading.Lock()
+
+
+def describe(builder) -> Tuple[str, str, List[Tuple[str, str]], Any]:
+    """(method, table, filter params, payload) for a postgrest-py or LocalQuery builder."""
+    if hasattr(builder, "trace_info"):
+        return builder.trace_info()
+    req = builder.request
+    method = getattr(req.http_method, "value", str(req.http_method))
+    table = str(req.path).rstrip("/").rsplit("/", 1)[-1]
+    params = [(k, v) for k, v in req.params.multi_items() if k not in _NON_FILTER_PARAMS]
+    return method, table, params, req.json
+
+
+def row_count(result) -> Optional[int]:
+    if result is None:
+        return 0
+    data = getattr(result, "data", result)
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        return 1
+    return None
+
+
+def record(queries: list, builder, started: float, duration: float, result, error) -> None:
+    try:
+        method, table, params, payload = describe(builder)
+    except Exception:
+        return  # never let tracing break a query
+    queries.append({
+        "table": table,
+        "method": method,
+        "filters": [f"{k}={v}" for k, v in params],
+        "params": params,
+        "payload": payload,
+        "start": started,
+        "ms": round(duration * 1000, 3),
+        "rows": None if error is not None else row_count(result),
+        "error": None if error is None else type(error).__name__,
+    })
+
+
+_TREE_TERM = re.compile(r"(\w+)\.(?:not\.)?(\w+)\.")
+
+
+def _shape(q: dict) -> str:
+    """Query with filter values dropped: 'GET users?email.eq', 'PATCH users?userId.eq,or(daily_quiz_at.is|...)'."""
+    parts = []
+    for k, v in q["params"]:
+        if k in ("or", "and"):
+            parts.append(f"{k}({'|'.join(f'{c}.{op}' for c, op in _TREE_TERM.findall(v))})")
+        else:
+            parts.append(f"{k}.{v.split('.', 1)[0]}")
+    return f"{q['method']} {q['table']}?{','.join(parts)}"
+
+
+def _fingerprint(q: dict) -> str:
+    payload = json.dumps(q["payload"], sort_keys=True, default=str) if q["payload"] is not None else ""
+    return f"{q['method']} {q['table']}?{'&'.join(q['filters'])} {payload}"
+
+
+def _keys(q: dict) -> set:
+    """(column, value) pairs a query is pinned to: eq filters, or the columns of an inserted payload."""
+    keys = {(k, v[3:]) for k, v in q["params"] if v.startswith("eq.")}
+    if q["method"] == "POST" and q["payload"] is not None:
+        rows = q["payload"] if isinstance(q["payload"], list) else [q["payload"]]
+        for row in rows:
+            if isinstance(row, dict):
+                keys.update((k, str(v)) for k, v in row.items() if v is not None and not isinstance(v, (dict, list)))
+    return keys
+
+
+def analyze(queries: List[dict]) -> List[dict]:
+    findings = []
+    ordered = sorted(queries, key=lambda q: q["start"])
+
+    by_fp: Dict[str, List[dict]] = {}
+    by_shape: Dict[str, List[dict]] = {}
+    for q in ordered:
+        by_shape.setdefault(_shape(q), []).append(q)
+        if q["method"] == "GET":
+            by_fp.setdefault(_fingerprint(q), []).append(q)
+
+    for fp, qs in by_fp.items():
+        if len(qs) > 1:
+            findings.append({"kind": "repeated", "query": _shape(qs[0]), "example": fp.strip(), "count": len(qs),
+                             "ms": round(sum(q["ms"] for q in qs), 3),
+                             "avoidable_ms": round(sum(q["ms"] for q in qs[1:]), 3)})
+
+    threshold = Settings.QUERY_TRACE_N_PLUS_ONE
+    for shape, qs in by_shape.items():
+        distinct = {_fingerprint(q) for q in qs}
+        if len(qs) >= threshold and len(distinct) > 1 and any(q["params"] for q in qs):
+            findings.append({"kind": "n_plus_one", "query": shape, "count": len(qs),
+                             "ms": round(sum(q["ms"] for q in qs), 3),
+                             "avoidable_ms": round(sum(q["ms"] for q in qs) - max(q["ms"] for q in qs), 3)})
+
+    reads: List[Tuple[dict, set]] = []
+    for q in ordered:
+        if q["method"] == "GET":
+            reads.append((q, _keys(q)))
+            continue
+        write_keys = _keys(q)
+        for read, read_keys in reads:
+            shared = read_keys & write_keys if read["table"] == q["table"] else None
+            if shared:
+                col, value = sorted(shared)[0]
+                findings.append({"kind": "select_then_write", "query": f"{_shape(read)} -> {_shape(q)}",
+                                 "key": f"{col}={value}", "count": 2,
+                                 "ms": round(read["ms"] + q["ms"], 3), "avoidable_ms": read["ms"]})
+                break
+    return findings
+
+
+def _public(q: dict, origin: float) -> dict:
+    out = {k: v for k, v in q.items() if k not in ("params", "payload", "start")}
+    out["at_ms"] = round((q["start"] - origin) * 1000, 3)
+    return out
+
+
+def finish(method: str, path: str, endpoint: Optional[str], status: int, total: float, queries: List[dict]) -> None:
+    """Analyze one finished request and push it onto the ring buffer."""
+    findings = analyze(queries)
+    origin = min((q["start"] for q in queries), default=0.0)
+    trace = {
+        "at": time.time(),
+        "method": method,
+        "path": path,
+        "endpoint": endpoint or "<unmatched>",
+        "status": status,
+        "total_ms": round(total * 1000, 3),
+        "db_ms": round(sum(q["ms"] for q in queries), 3),
+        "queries": [_public(q, origin) for q in sorted(queries, key=lambda q: q["start"])],
+        "findings": findings,
+    }
+    with _traces_lock:
+        _traces.append(trace)
+    if findings and Settings.QUERY_TRACE_LOG:
+        kinds = ", ".join(f"{f['kind']} x{f['count']} ({f['query']})" for f in findings)
+        print(f"Query trace {method} {path}: {len(queries)} queries, {trace['db_ms']}ms db; {kinds}")
+
+
+def summary(top: int = 20, recent: int = 0) -> dict:
+    """Worst query shapes and findings over the ring buffer, by cumulative time."""
+    with _traces_lock:
+        traces = list(_traces)
+
+    shapes: Dict[Tuple[str, str], dict] = {}
+    findings: Dict[Tuple[str, str, str], dict] = {}
+    for t in traces:
+        for q in t["queries"]:
+            key = (t["endpoint"], f"{q['method']} {q['table']}?{','.join(f.split('=', 1)[0] for f in q['filters'])}")
+            agg = shapes.setdefault(key, {"endpoint": key[0], "query": key[1], "count": 0, "ms": 0.0, "rows": 0})
+            agg["count"] += 1
+            agg["ms"] += q["ms"]
+            agg["rows"] += q["rows"] or 0
+        for f in t["findings"]:
+            key = (t["endpoint"], f["kind"], f["query"])
+            agg = findings.setdefault(key, {"endpoint": key[0], "kind": key[1], "query": key[2],
+                                            "requests": 0, "queries": 0, "ms": 0.0, "avoidable_ms": 0.0})
+            agg["requests"] += 1
+            agg["queries"] += f["count"]
+            agg["ms"] += f["ms"]
+            agg["avoidable_ms"] += f["avoidable_ms"]
+
+    def ranked(rows, key):
+        out = sorted(rows, key=lambda r: r[key], reverse=True)[:top]
+        for r in out:
+            for k in ("ms", "avoidable_ms"):
+                if k in r:
+                    r[k] = round(r[k], 3)
+        return out
+
+    result = {
+        "enabled": Settings.QUERY_TRACE,
+        "requests": len(traces),
+        "buffer": _traces.maxlen,
+        "offenders": ranked(findings.values(), "avoidable_ms"),
+        "queries": ranked(shapes.values(), "ms"),
+    }
+    if recent:
+        result["recent"] = traces[-recent:][::-1]
+    return result
+
+
+def clear() -> None:
+    with _traces_lock:
+        _traces.clear()
@@ -0,0 +1,125 @@
+"""
+Question catalog (quizqn table), loaded and normalized once per reference-cache version.
+
+Rows are normalized with normalize_row, pre-sorted by (display_order, key) and indexed
+by key and by (section, include_inactive), so /quizqn lookups and section listings are
+dict hits. The catalog follows the ref_cache TTL; invalidate() forces a reload.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from .db import supabase, exec_data, QUIZQN_TABLE
+from .ref_cache import ref_cache
+
+QUIZQN_COLS = ["key","prompt","input_type","unit","min_value","max_value","step",
+               "scale_positive_high","required","section","display_order","active"]
+
+# ---------- normalization (CSV-backed table, robust to types) ----------
+def truthy(v, default=False):
+    if v is None:
+        return default
+    if isinstance(v, bool):
+        return v
+    s = str(v).strip().lower()
+    return s in ("1","true","t","yes","y","on")
+
+def to_float(v):
+    if v is None: return None
+    s = str(v).strip()
+    if s == "": return None
+    try: return float(s)
+    except ValueError: return None
+
+def to_int(v):
+    f = to_float(v)
+    return int(f) if f is not None else None
+
+def norm_str(v):
+    if v is None: return None
+    s = str(v).strip()
+    return s if s != "" else None
+
+def normalize_row(r):
+    return {
+        "key": r.get("key"),
+        "prompt": r.get("prompt"),
+        "input_type": (r.get("input_type") or "").strip().lower(),
+        "unit": norm_str(r.get("unit")),
+        "min_value": to_float(r.get("min_value")),
+        "max_value": to_float(r.get("max_value")),
+        "step": to_float(r.get("step")),
+        "scale_positive_high": truthy(r.get("scale_positive_high"), default=True),
+        "required": truthy(r.get("required"), default=True),
+        "section": (r.get("section") or "").strip(),
+        "display_order": to_int(r.get("display_order")) or 0,
+        "active": truthy(r.get("active"), default=True),
+    }
+
+
+class QuizCatalog:
+    """Immutable, indexed view over the normalized question rows."""
+
+    def __init__(self, raw_rows):
+        normalized = [normalize_row(r) for r in raw_rows]
+        self.by_key: Dict[str, dict] = {}
+        for r in normalized:
+            self.by_key.setdefault(r["key"], r)
+
+        self.rows: List[dict] = sorted(normalized, key=lambda r: (r["display_order"], r["key"] or ""))
+        # (section lower-cased or None for 'all', include_inactive) -> rows in display order
+        self._listings: Dict[Tuple[Optional[str], bool], List[dict]] = {
+            (None, True): self.rows,
+            (None, False): [r for r in self.rows if r["active"]],
+        }
+        for r in self.rows:
+            sec = r["section"].lower()
+            self._listings.setdefault((sec, True), []).append(r)
+            self._listings.setdefault((sec, False), [])
+            if r["active"]:
+                self._listings[(sec, False)].append(r)
+
+    @staticmethod
+    def _section_key(section: Optional[str]) -> Optional[str]:
+        s = (section or "").strip().lower()
+        return None if s == "all" else s
+
+    def has_section(self, section: Optional[str]) -> bool:
+        """True for 'all' and for sections that have at least one question."""
+        return (self._section_key(section), True) in self._listings
+
+    def listing(self, section: Optional[str] = "daily", include_inactive: bool = False) -> List[dict]:
+        """Rows of one section (or every section for 'all'), sorted by display_order."""
+        return self._listings.get((self._section_key(section), bool(include_inactive)), [])
+
+    def get(self, key: str, section: Optional[str] = "daily", include_inactive: bool = False) -> Optional[dict]:
+        """Row by key, or None if missing, in another section, or inactive (unless include_inactive)."""
+        row = self.by_key.get(key)
+        if row is None:
+            return None
+        want = self._section_key(section)
+        if want is not None and row["section"].lower() != want:
+            return None
+        if not include_inactive and not row["active"]:
+            return None
+        return row
+
+
+def _fetch_quiz_rows():
+    resp = supabase.table(QUIZQN_TABLE).select(",".join(QUIZQN_COLS)).execute()
+    return exec_data(resp) or []
+
+# (quizqn cache version, QuizCatalog) — swapped atomically
+_catalog_state = (None, None)
+
+def get_catalog() -> QuizCatalog:
+    """Current catalog; rebuilt only when the cached quizqn rows change."""
+    global _catalog_state
+    raw_rows, version = ref_cache.get_versioned(QUIZQN_TABLE, _fetch_quiz_rows)
+    cached_version, catalog = _catalog_state
+    if catalog is None or cached_version != version:
+        catalog = QuizCatalog(raw_rows)
+        _catalog_state = (version, catalog)
+    return catalog
+
+def invalidate() -> None:
+    """Drop the cached rows; the next get_catalog() reloads from the database."""
+    ref_cache.invalidate(QUIZQN_TABLE)
@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import Settings
+
+
+class RefCache:
+    """
+    Process-local TTL cache for slow-changing reference tables (scoringWeights, scoreBands, ...).
+
+    Each key carries a version stamp that is bumped whenever a reload returns a different
+    value (or the key is invalidated), so callers can cheaply rebuild derived structures
+    only when the underlying data actually changed.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.errors = 0
+
+    def get(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for key, calling loader() when missing or expired.
+        If the loader fails and a stale value exists, the stale value is served.
+        """
+        return self.get_versioned(key, loader, ttl)[0]
+
+    def get_versioned(self, key: str, loader: Callable[[], Any], ttl: Optional[float] = None) -> Tuple[Any, int]:
+        """Like get(), but returns (value, version) read together so they always match."""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["loaded_at"] < ttl:
+                self.hits += 1
+                return entry["value"], entry["version"]
+            self.misses += 1
+
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            if entry is not None:
+                return entry["value"], entry["version"]
+            raise
+
+        with self._lock:
+            self.loads += 1
+            current = self._entries.get(key)
+            if current is None or current["value"] != value:
+                self._versions[key] = self._versions.get(key, 0) + 1
+            version = self._versions[key]
+            self._entries[key] = {"value": value, "version": version, "loaded_at": time.monotonic()}
+        return value, version
+
+    def is_fresh(self, key: str, ttl: Optional[float] = None) -> bool:
+        """True when get(key) would be served from cache without calling the loader."""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() - entry["loaded_at"] < ttl
+
+    def peek(self, key: str) -> Any:
+        """Return the cached value for key (even if expired) without loading, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry["value"] if entry is not None else None
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key (or everything when key is None); the next get() reloads."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                if self._entries.pop(k, None) is not None:
+                    self._versions[k] = self._versions.get(k, 0) + 1
+
+    def version(self, key: str) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "ttl_seconds": self.ttl_seconds,
+                "keys": {k: {"version": self._versions.get(k, 0)} for k in self._entries},
+            }
+
+
+# Shared instance used by the route modules
+ref_cache = RefCache(ttl_seconds=Settings.REF_CACHE_TTL_SECONDS)
@@ -0,0 +1,214 @@
+"""
+Per-user mood rollups by Asia/Singapore local day and ISO week (schema: sql/mood_rollup.sql).
+
+Inserts are folded in incrementally (count/sum/min/max/last) by a database function, so
+concurrent inserts add up; updates recompute the affected buckets from raw moodMetric
+rows since min/max cannot be "subtracted".
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from .db import supabase, exec_data, MOOD_TABLE, MOOD_ROLLUP_TABLE
+
+SGT = timezone(timedelta(hours=8))
+ROLLUP_CONFLICT_COLS = "userId,granularity,bucket"
+
+BucketKey = Tuple[int, str, str]  # (userId, granularity, bucket)
+
+
+def _to_utc(ts) -> Optional[datetime]:
+    if not ts:
+        return None
+    if isinstance(ts, datetime):
+        dt = ts
+    else:
+        try:
+            dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _score(v) -> Optional[float]:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def bucket_keys(user_id, ts) -> List[BucketKey]:
+    """[(userId, 'day', 'YYYY-MM-DD'), (userId, 'week', 'YYYY-Www')] for a row, SGT local time."""
+    dt = _to_utc(ts)
+    if user_id is None or dt is None:
+        return []
+    local = dt.astimezone(SGT)
+    iso_year, iso_week, _ = local.isocalendar()
+    return [
+        (int(user_id), "day", local.date().isoformat()),
+        (int(user_id), "week", f"{iso_year}-W{iso_week:02d}"),
+    ]
+
+
+def bucket_bounds_utc(granularity: str, bucket: str) -> Tuple[str, str]:
+    """UTC ISO [start, end) covering one SGT day or ISO week bucket."""
+    if granularity == "day":
+        start = datetime.fromisoformat(bucket).replace(tzinfo=SGT)
+        end = start + timedelta(days=1)
+    else:
+        year, week = bucket.split("-W")
+        start = datetime.fromisocalendar(int(year), int(week), 1).replace(tzinfo=SGT)
+        end = start + timedelta(days=7)
+    return start.astimezone(timezone.utc).isoformat(), end.astimezone(timezone.utc).isoformat()
+
+
+def _empty(key: BucketKey) -> dict:
+    user_id, granularity, bucket = key
+    return {
+        "userId": user_id,
+        "granularity": granularity,
+        "bucket": bucket,
+        "row_count": 0,
+        "scored_count": 0,
+        "score_sum": 0.0,
+        "score_min": None,
+        "score_max": None,
+        "last_score": None,
+        "last_timestamp": None,
+        "last_mood_id": None,
+    }
+
+
+def _fold(acc: dict, row: dict) -> None:
+    """Add one moodMetric row (id, finalMoodScores, created_timestamp) into a rollup accumulator."""
+    acc["row_count"] = (acc.get("row_count") or 0) + 1
+    sc = _score(row.get("finalMoodScores"))
+    if sc is not None:
+        acc["scored_count"] = (acc.get("scored_count") or 0) + 1
+        acc["score_sum"] = (_score(acc.get("score_sum")) or 0.0) + sc
+        lo, hi = _score(acc.get("score_min")), _score(acc.get("score_max"))
+        acc["score_min"] = sc if lo is None else min(lo, sc)
+        acc["score_max"] = sc if hi is None else max(hi, sc)
+    # "last" = newest created_timestamp, ties broken by id so the result is order-independent
+    dt = _to_utc(row.get("created_timestamp"))
+    last = _to_utc(acc.get("last_timestamp"))
+    row_id = row.get("id") or 0
+    if dt is not None and (last is None or (dt, row_id) > (last, acc.get("last_mood_id") or 0)):
+        acc["last_timestamp"] = dt.isoformat()
+        acc["last_mood_id"] = row.get("id")
+        acc["last_score"] = sc
+
+
+def _stamp(rows: List[dict]) -> List[dict]:
+    now = datetime.now(timezone.utc).isoformat()
+    for r in rows:
+        r["updated_at"] = now
+    return rows
+
+
+def apply_inserted_rows(rows: Iterable[dict]) -> int:
+    """
+    Fold freshly inserted moodMetric rows into their day/week rollups.
+    One round trip regardless of row count: the per-bucket deltas are added in the database
+    (mood_rollup_apply, sql/mood_rollup.sql), so concurrent inserts into the same bucket
+    cannot overwrite each other. Returns the number of rollup rows written.
+    """
+    deltas = accumulate(r for r in rows if r)
+    if not deltas:
+        return 0
+    supabase.rpc("mood_rollup_apply", {"deltas": list(deltas.values())}).execute()
+    return len(deltas)
+
+
+def recompute_buckets(keys: Iterable[BucketKey]) -> int:
+    """
+    Recompute rollups for the given buckets from raw moodMetric rows (used after updates).
+    Three round trips however many buckets: one read of their raw rows, one upsert of the
+    non-empty buckets and one delete of the emptied ones.
+    """
+    keys = set(keys)
+    if not keys:
+        return 0
+    ranges = []
+    for user_id, granularity, bucket in sorted(keys):
+        start, end = bucket_bounds_utc(granularity, bucket)
+        ranges.append(
+            f'and(userId.eq.{int(user_id)},created_timestamp.gte."{start}",created_timestamp.lt."{end}")'
+        )
+    resp = (
+        supabase.table(MOOD_TABLE)
+        .select("id,userId,finalMoodScores,created_timestamp")
+        .or_(",".join(ranges))
+        .execute()
+    )
+    accs = {key: acc for key, acc in accumulate(exec_data(resp) or []).items() if key in keys}
+
+    if accs:
+        supabase.table(MOOD_ROLLUP_TABLE).upsert(
+            _stamp(list(accs.values())), on_conflict=ROLLUP_CONFLICT_COLS
+        ).execute()
+    emptied = sorted(keys - set(accs))
+    if emptied:
+        supabase.table(MOOD_ROLLUP_TABLE).delete().or_(",".join(
+            f"and(userId.eq.{int(u)},granularity.eq.{g},bucket.eq.{b})" for u, g, b in emptied
+        )).execute()
+    return len(accs)
+
+
+def accumulate(rows: Iterable[dict]) -> dict:
+    """{bucket key: rollup row} folded from raw moodMetric rows; memory is O(buckets), not O(rows)."""
+    accs = {}
+    for r in rows:
+        for key in bucket_keys(r.get("userId"), r.get("created_timestamp")):
+            acc = accs.get(key)
+            if acc is None:
+                acc = accs[key] = _empty(key)
+            _fold(acc, r)
+    return accs
+
+
+def rebuild(rows: Iterable[dict], user_id: Optional[int] = None, chunk_size: int = 500) -> int:
+    """
+    Recompute all rollups (or one user's) from a full pass over raw moodMetric rows.
+    Returns the number of rollup rows written.
+    """
+    accs = accumulate(rows)
+
+    delete_q = supabase.table(MOOD_ROLLUP_TABLE).delete()
+    if user_id is not None:
+        delete_q = delete_q.eq("userId", user_id)
+    else:
+        delete_q = delete_q.gte("row_count", 0)  # PostgREST refuses unfiltered deletes
+    delete_q.execute()
+
+    out = _stamp(list(accs.values()))
+    for i in range(0, len(out), chunk_size):
+        supabase.table(MOOD_ROLLUP_TABLE).upsert(out[i:i + chunk_size], on_conflict=ROLLUP_CONFLICT_COLS).execute()
+    return len(out)
+
+
+def summarize(rollups: Iterable[dict]) -> dict:
+    """Combine rollup rows into count/avg/min/max/last for the whole range."""
+    total = _empty((None, None, None))
+    for r in rollups:
+        total["row_count"] += r.get("row_count") or 0
+        total["scored_count"] += r.get("scored_count") or 0
+        total["score_sum"] += _score(r.get("score_sum")) or 0.0
+        for col, pick in (("score_min", min), ("score_max", max)):
+            v = _score(r.get(col))
+            if v is not None:
+                total[col] = v if total[col] is None else pick(total[col], v)
+        ts = _to_utc(r.get("last_timestamp"))
+        if ts is not None and (total["last_timestamp"] is None or ts >= _to_utc(total["last_timestamp"])):
+            total["last_timestamp"] = ts.isoformat()
+            total["last_score"] = _score(r.get("last_score"))
+    n = total["scored_count"]
+    return {
+        "count": total["row_count"],
+        "avgScore": round(total["score_sum"] / n, 1) if n else None,
+        "minScore": total["score_min"],
+        "maxScore": total["score_max"],
+        "lastScore": total["last_score"],
+        "lastTimestamp": total["last_timestamp"],
+    }
@@ -0,0 +1,174 @@
+import re
+from typing import Callable, List, Optional, Tuple
+
+# Fallback weights used when public.scoringWeights is empty
+DEFAULT_WEIGHT_ROWS = [
+    {"component_key":"mood","weight":0.25,"direction":"positive","transform":"scale10","notes":"1-10"},
+    {"component_key":"energy","weight":0.15,"direction":"positive","transform":"scale10","notes":"1-10"},
+    {"component_key":"stress","weight":0.15,"direction":"negative","transform":"inverse_scale10","notes":"1-10"},
+    {"component_key":"sleep_quality","weight":0.10,"direction":"positive","transform":"scale10","notes":"1-10"},
+    {"component_key":"sleep_hours","weight":0.10,"direction":"positive","transform":"peak","notes":"peak at 8h; width=4"},
+    {"component_key":"exercise","weight":0.10,"direction":"positive","transform":"saturate","notes":"45"},
+    {"component_key":"outside","weight":0.05,"direction":"positive","transform":"saturate","notes":"30"},
+    {"component_key":"work_balance","weight":0.07,"direction":"positive","transform":"peak","notes":"peak at 8h; width=4"},
+    {"component_key":"connect","weight":0.03,"direction":"positive","transform":"boolean","notes":"1 if connected else 0"},
+]
+
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+")
+
+# ---------- coercion helpers (shared with routes.mood) ----------
+def as_bool(v):
+    if isinstance(v, bool): return v
+    if v is None: return None
+    return str(v).strip().lower() in ("1", "true", "t", "yes", "y", "on")
+
+def as_float(v):
+    if v is None or v == "": return None
+    try: return float(v)
+    except (TypeError, ValueError): return None
+
+def as_int(v):
+    f = as_float(v)
+    return int(f) if f is not None else None
+
+def _clamp01(x):
+    return max(0.0, min(1.0, float(x)))
+
+def _nums_in(text):
+    """Extract numbers found in a free-text notes field ('peak at 8h; width=4' -> [8,4])"""
+    if not text:
+        return []
+    return [float(n) for n in _NUM_RE.findall(str(text))]
+
+# ---------- transforms ----------
+# Each factory returns fn(raw_values) -> normalized value in [0..1] or None.
+# fn.spec = (transform, input field, *params) lets other evaluators (e.g. core.batch_scoring)
+# reuse the resolved parameters.
+
+def _scale10(field, invert):
+    def fn(raw_values):
+        val = as_int(raw_values.get(field))
+        if val is None: return None
+        x = _clamp01(val / 10.0)
+        if invert:
+            x = 1.0 - x
+        return _clamp01(x)
+    fn.spec = ("inverse_scale10" if invert else "scale10", field)
+    return fn
+
+def _peak(field, center, width):
+    def fn(raw_values):
+        h = as_float(raw_values.get(field))
+        if h is None: return None
+        return _clamp01(1.0 - abs(h - center) / width)
+    fn.spec = ("peak", field, center, width)
+    return fn
+
+def _saturate_hours_as_minutes(field, cap):
+    def fn(raw_values):
+        hours = as_float(raw_values.get(field))
+        if hours is None: return None
+        return _clamp01(hours * 60.0 / cap)
+    fn.spec = ("saturate_hours", field, cap)
+    return fn
+
+def _saturate_int(field, cap):
+    def fn(raw_values):
+        mins = as_int(raw_values.get(field))
+        if mins is None: return None
+        return _clamp01(mins / cap)
+    fn.spec = ("saturate", field, cap)
+    return fn
+
+def _boolean(field):
+    def fn(raw_values):
+        b = as_bool(raw_values.get(field))
+        if b is None: return None
+        return 1.0 if b else 0.0
+    fn.spec = ("boolean", field)
+    return fn
+
+def _peak_params(notes):
+    nums = _nums_in(notes)
+    center = nums[0] if len(nums) >= 1 else 8.0
+    width  = nums[1] if len(nums) >= 2 else 4.0
+    if width <= 0: width = 4.0
+    return center, width
+
+def _cap_param(notes, default):
+    nums = _nums_in(notes)
+    cap = nums[0] if len(nums) >= 1 else default
+    if cap <= 0: cap = default
+    return cap
+
+def compile_component(component_key, transform, direction, notes) -> Optional[Callable]:
+    """
+    Resolve one scoringWeights row to its transform function, with numeric parameters
+    already parsed out of notes. Returns None for unknown components.
+    transform/direction are expected stripped and lower-cased.
+    """
+    if component_key == "mood":
+        return _scale10("mood", transform == "inverse_scale10" or direction == "negative")
+    if component_key == "energy":
+        return _scale10("energy", False)
+    if component_key == "stress":
+        # lower is better, regardless of how transform/direction are set
+        return _scale10("stress", True)
+    if component_key == "sleep_quality":
+        return _scale10("sleepQuality", False)
+    if component_key == "sleep_hours":
+        return _peak("sleepHours", *_peak_params(notes))
+    if component_key == "exercise":
+        # Expect minutes for scoring; input is hours
+        return _saturate_hours_as_minutes("exerciseHours", _cap_param(notes, 45.0))
+    if component_key == "outside":
+        return _saturate_int("timeOutsideMin", _cap_param(notes, 30.0))
+    if component_key == "work_balance":
+        return _peak("workingHrs", *_peak_params(notes))
+    if component_key == "connect":
+        return _boolean("connectwithfamily")
+    return None
+
+
+class CompiledScorer:
+    """Weights rows parsed once into (component_key, weight, transform fn) tuples."""
+
+    def __init__(self, components: List[Tuple[str, float, Callable]]):
+        self.components = components
+
+    def score(self, raw_values) -> Optional[float]:
+        """0–10 score rounded to 1 dp, or None when no component applies."""
+        num = 0.0
+        den = 0.0
+        for _, w, fn in self.components:
+            v = fn(raw_values)
+            if v is None:
+                continue
+            num += w * v
+            den += w
+        if den <= 0:
+            return None
+        return round(num / den * 10.0, 1)
+
+
+def compile_scorer(weight_rows) -> CompiledScorer:
+    """Build a CompiledScorer from scoringWeights rows (falls back to DEFAULT_WEIGHT_ROWS when empty)."""
+    components = []
+    for row in weight_rows or DEFAULT_WEIGHT_ROWS:
+        key = (row.get("component_key") or "").strip()
+        if not key:
+            continue
+        try:
+            w = float(row.get("weight"))
+        except (TypeError, ValueError):
+            continue
+        if w <= 0:
+            continue
+
+        direction = (row.get("direction") or "positive").strip().lower()
+        transform = (row.get("transform") or "").strip().lower()
+        fn = compile_component(key, transform, direction, row.get("notes"))
+        if fn is None:
+            continue
+        components.append((key, w, fn))
+    return CompiledScorer(components)
@@ -0,0 +1,115 @@
+"""
+Pooled, timeout-bounded HTTP transport shared by the Supabase client (see core/db.py).
+
+One httpx.Client per process: bounded keep-alive pool, connect/read/write/pool timeouts
+from Settings, and bounded retry with full-jitter exponential backoff. Connection
+failures are retried for any method (the request never reached PostgREST); read
+timeouts, dropped connections and 502/504 are retried for idempotent reads only.
+"""
+import random
+import threading
+import time
+
+import httpx
+
+from config import Settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({502, 504})  # 503/520 are already retried by postgrest-py itself
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_READ_ERRORS = (httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(max, base * 2**attempt))."""
+    cap = min(Settings.DB_RETRY_BACKOFF_MAX, Settings.DB_RETRY_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+class PooledTransport(httpx.BaseTransport):
+    """httpx.HTTPTransport with bounded retries and pool accounting."""
+
+    def __init__(self, limits: httpx.Limits, http2: bool = False, retries: int = 2):
+        self._inner = httpx.HTTPTransport(limits=limits, http2=http2)
+        self.max_connections = limits.max_connections
+        self.retries = retries
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.waits = 0
+
+    def _idle_and_total(self):
+        conns = list(self._inner._pool.connections)
+        return sum(1 for c in conns if c.is_idle()), len(conns)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        idle, total = self._idle_and_total()
+        with self._lock:
+            self.requests += 1
+            if idle == 0 and self.max_connections is not None and total >= self.max_connections:
+                self.waits += 1  # every pooled connection busy: this request queues for one
+
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self._inner.handle_request(request)
+            except _CONNECT_ERRORS + _READ_ERRORS as e:
+                retryable = isinstance(e, _CONNECT_ERRORS) or idempotent
+                if not retryable or attempt >= self.retries:
+                    with self._lock:
+                        self.failures += 1
+                    raise
+            else:
+                if not (idempotent and response.status_code in RETRY_STATUSES and attempt < self.retries):
+                    return response
+                response.close()
+            attempt += 1
+            with self._lock:
+                self.retried += 1
+            time.sleep(backoff_delay(attempt - 1))
+
+    def stats(self) -> dict:
+        idle, total = self._idle_and_total()
+        try:
+            queued = sum(1 for r in self._inner._pool._requests if r.is_queued())
+        except AttributeError:
+            queued = None
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "connections": total,
+                "in_use": total - idle,
+                "idle": idle,
+                "queued": queued,
+                "waits": self.waits,
+                "requests": self.requests,
+                "retried": self.retried,
+                "failures": self.failures,
+            }
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+def build_http_client() -> httpx.Client:
+    """The shared httpx.Client handed to supabase-py (ClientOptions.httpx_client)."""
+    limits = httpx.Limits(
+        max_connections=Settings.DB_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=Settings.DB_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=Settings.DB_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        connect=Settings.DB_CONNECT_TIMEOUT_SECONDS,
+        read=Settings.DB_READ_TIMEOUT_SECONDS,
+        write=Settings.DB_WRITE_TIMEOUT_SECONDS,
+        pool=Settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    transport = PooledTransport(limits, http2=Settings.DB_HTTP2, retries=Settings.DB_RETRY_ATTEMPTS)
+    return httpx.Client(transport=transport, timeout=timeout, follow_redirects=True)
+
+
+def pool_stats(client: httpx.Client) -> dict:
+    transport = getattr(client, "_transport", None)
+    return transport.stats() if isinstance(transport, PooledTransport) else {}
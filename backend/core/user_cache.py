@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import Settings
+
+_MISS = object()
+_FIELDS = ("userId", "email", "username")
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class UserCache:
+    """
+    Process-local LRU+TTL cache of users rows, indexed by userId, email and username.
+
+    - Rows live once, keyed by userId; email/username map to the userId (kept in step on put).
+    - Misses ("no such user") can be cached separately for a shorter negative TTL
+      (get(..., negative=True)), so repeated lookups of an unknown id do not each hit the database.
+    - Concurrent lookups of the same key share one load (single-flight); the others wait.
+    - Writers keep it current: put(row) after insert/update, invalidate_id() after writes that
+      bypass users_repo. A load that overlaps a write is not stored, so it cannot resurrect
+      the pre-write row. Other processes only converge via the TTL.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60.0, negative_ttl_seconds: float = 10.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._lock = threading.Lock()
+        self._rows: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()  # userId -> (row, expires_at)
+        self._index: Dict[Tuple[str, str], str] = {}  # (email|username, value) -> userId
+        self._negative: "OrderedDict[Tuple[str, str], float]" = OrderedDict()  # (field, value) -> expires_at
+        self._inflight: Dict[Tuple[str, str], _Flight] = {}
+        self._generation = 0
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.evictions = 0
+
+    # --- internals (call with the lock held) ---
+    def _lookup(self, key: Tuple[str, str], now: float) -> Any:
+        uid = key[1] if key[0] == "userId" else self._index.get(key)
+        if uid is not None:
+            entry = self._rows.get(uid)
+            if entry is not None:
+                if entry[1] > now:
+                    self._rows.move_to_end(uid)
+                    return dict(entry[0])  # callers may mutate what they get back
+                self._drop(uid)
+        expires = self._negative.get(key)
+        if expires is not None:
+            if expires > now:
+                return None
+            del self._negative[key]
+        return _MISS
+
+    def _drop(self, uid: str) -> None:
+        entry = self._rows.pop(uid, None)
+        if entry is None:
+            return
+        for field in ("email", "username"):
+            value = entry[0].get(field)
+            if value is not None and self._index.get((field, str(value))) == uid:
+                del self._index[(field, str(value))]
+
+    def _store(self, row: dict, now: float) -> None:
+        uid = str(row["userId"])
+        self._drop(uid)
+        self._rows[uid] = (dict(row), now + self.ttl_seconds)
+        for field in _FIELDS:
+            value = row.get(field)
+            if value is not None:
+                if field != "userId":
+                    self._index[(field, str(value))] = uid
+                self._negative.pop((field, str(value)), None)
+        while len(self._rows) > self.max_entries:
+            oldest = next(iter(self._rows))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _store_negative(self, key: Tuple[str, str], now: float) -> None:
+        self._negative[key] = now + self.negative_ttl_seconds
+        self._negative.move_to_end(key)
+        while len(self._negative) > self.max_entries:
+            self._negative.popitem(last=False)
+
+    # --- public API ---
+    def get(self, field: str, value: Any, loader: Callable[[], Optional[dict]],
+            negative: bool = True) -> Optional[dict]:
+        """
+        Cached row for field == value (None if no such user), calling loader() on a miss.
+        negative=False does not remember a None result. Loader exceptions propagate to
+        every waiter and are not cached.
+        """
+        key = (field, str(value))
+        with self._lock:
+            found = self._lookup(key, time.monotonic())
+            if found is not _MISS:
+                if found is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return found
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                generation = self._generation
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return dict(flight.result) if flight.result else flight.result
+
+        try:
+            row = loader()
+            with self._lock:
+                self.loads += 1
+                if generation == self._generation:
+                    if row:
+                        self._store(row, time.monotonic())
+                    elif negative:
+                        self._store_negative(key, time.monotonic())
+            flight.result = row
+            return row
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def put(self, row: Optional[dict]) -> None:
+        """Write-through after an insert/update that returned the full row."""
+        if not row or row.get("userId") is None:
+            return
+        with self._lock:
+            self._generation += 1
+            self._store(row, time.monotonic())
+
+    def invalidate_id(self, user_id: Any) -> None:
+        with self._lock:
+            self._generation += 1
+            self._drop(str(user_id))
+            self._negative.pop(("userId", str(user_id)), None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._rows.clear()
+            self._index.clear()
+            self._negative.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else None,
+                "entries": len(self._rows),
+                "negative_entries": len(self._negative),
+                "max_entries": self.max_entries,
+            }
+
+
+# Shared instance used by core/users_repo.py
+user_cache = UserCache(
+    max_entries=Settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=Settings.USER_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=Settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+)
@@ -0,0 +1,225 @@
+import bisect
+import heapq
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import Settings
+
+_EMPTY: Set[int] = frozenset()
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams of a lower-cased, space-padded string ("  jo " -> {"  j", " jo", "jo "})."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class UsernameIndex:
+    """
+    In-process typeahead index over users.username: a sorted (lower(username), userId) list for
+    prefix lookups (bisect + scan of k entries) and trigram postings for fuzzy matches
+    (similarity = shared / union of trigram sets, as pg_trgm's similarity()).
+
+    Built from a paged scan (rebuild), kept current by users_repo writes (upsert), and
+    rebuilt in the background once older than refresh_seconds so other processes' writes
+    show up eventually. Writes that land while a rebuild is running are replayed on top of it.
+    """
+
+    def __init__(self, refresh_seconds: float = 300.0, min_similarity: float = 0.3):
+        self.refresh_seconds = refresh_seconds
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._names: Dict[int, str] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._tri_count: Dict[int, int] = {}
+        self._built_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._building = False
+        self._pending: List[Tuple[int, Optional[str]]] = []
+        self.builds = 0
+        self.build_ms = None
+        self.queries = 0
+
+    # --- maintenance ---
+    @staticmethod
+    def _add(names, sorted_keys, postings, tri_count, uid: int, username: str) -> None:
+        names[uid] = username
+        bisect.insort(sorted_keys, (username.lower(), uid))
+        tris = trigrams(username)
+        tri_count[uid] = len(tris)
+        for t in tris:
+            postings.setdefault(t, set()).add(uid)
+
+    def _remove(self, uid: int) -> None:
+        old = self._names.pop(uid, None)
+        if old is None:
+            return
+        key = (old.lower(), uid)
+        i = bisect.bisect_left(self._sorted, key)
+        if i < len(self._sorted) and self._sorted[i] == key:
+            del self._sorted[i]
+        for t in trigrams(old):
+            ids = self._postings.get(t)
+            if ids is not None:
+                ids.discard(uid)
+                if not ids:
+                    del self._postings[t]
+        self._tri_count.pop(uid, None)
+
+    def _apply(self, uid: int, username: Optional[str]) -> None:
+        self._remove(uid)
+        if username:
+            self._add(self._names, self._sorted, self._postings, self._tri_count, uid, username)
+
+    def upsert(self, user_id, username: Optional[str]) -> None:
+        """Record a user's current username (None removes them)."""
+        if user_id is None:
+            return
+        uid = int(user_id)
+        with self._lock:
+            if self._building:
+                self._pending.append((uid, username))
+            if self._built_at is not None:
+                self._apply(uid, username)
+
+    def rebuild(self, rows: Iterable[Tuple[int, Optional[str]]], wait: bool = True) -> Optional[int]:
+        """
+        Replace the index with (userId, username) rows, e.g. from users_repo.iter_usernames().
+        One build at a time: wait=False returns None instead of queueing behind a running build.
+        """
+        if not self._build_lock.acquire(blocking=wait):
+            return None
+        with self._lock:
+            self._building = True
+            self._pending = []
+        started = time.perf_counter()
+        try:
+            names, postings, tri_count = {}, {}, {}
+            pairs = []
+            for uid, username in rows:
+                if username:
+                    uid = int(uid)
+                    names[uid] = username
+                    pairs.append((username.lower(), uid))
+                    tris = trigrams(username)
+                    tri_count[uid] = len(tris)
+                    for t in tris:
+                        postings.setdefault(t, set()).add(uid)
+            pairs.sort()
+            with self._lock:
+                self._names, self._sorted, self._postings, self._tri_count = names, pairs, postings, tri_count
+                for uid, username in self._pending:
+                    self._apply(uid, username)
+                self._built_at = time.monotonic()
+                self.builds += 1
+                self.build_ms = round((time.perf_counter() - started) * 1000, 1)
+                return len(self._names)
+        finally:
+            with self._lock:
+                self._building = False
+                self._pending = []
+            self._build_lock.release()
+
+    def rebuild_async(self, loader: Callable[[], Iterable[Tuple[int, Optional[str]]]]) -> None:
+        """Background rebuild; at most one attempt per 10s, so a failing database is not hammered."""
+        now = time.monotonic()
+        with self._lock:
+            if self._building or (self._attempted_at is not None and now - self._attempted_at < 10):
+                return
+            self._attempted_at = now
+
+        def run():
+            try:
+                self.rebuild(loader(), wait=False)
+            except Exception as e:
+                print("username index rebuild failed:", e)
+
+        threading.Thread(target=run, name="username-index", daemon=True).start()
+
+    @property
+    def ready(self) -> bool:
+        return self._built_at is not None
+
+    def stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds
+
+    # --- queries ---
+    def prefix(self, q: str, k: int) -> List[Tuple[int, str]]:
+        """Up to k (userId, username) whose username starts with q (case-insensitive), alphabetical."""
+        q = q.lower()
+        out = []
+        with self._lock:
+            self.queries += 1
+            i = bisect.bisect_left(self._sorted, (q, -1))
+            while i < len(self._sorted) and len(out) < k:
+                key, uid = self._sorted[i]
+                if not key.startswith(q):
+                    break
+                out.append((uid, self._names[uid]))
+                i += 1
+        return out
+
+    def fuzzy(self, q: str, k: int, exclude: Set[int] = frozenset()) -> List[Tuple[int, str, float]]:
+        """
+        Up to k (userId, username, similarity) by trigram similarity >= min_similarity, best first.
+
+        Posting lists are walked rarest first. A user first met in list i is in none of the
+        earlier ones, so only the later lists are checked to count its shared trigrams. Users
+        not yet met share at most the remaining lists, so similarity <= remaining / |Q|: the
+        walk stops once k results beat that, and at the latest once fewer lists remain than
+        min_similarity * |Q| (prefix filtering).
+        """
+        if k <= 0:
+            return []
+        q_tris = trigrams(q)
+        nq = len(q_tris)
+        floor = max(1, math.ceil(self.min_similarity * nq - 1e-9))
+        best: List[Tuple[float, int]] = []  # min-heap of (similarity, -userId)
+        with self._lock:
+            self.queries += 1
+            lists = sorted((self._postings.get(t, _EMPTY) for t in q_tris), key=len)
+            seen: Set[int] = set()
+            for i in range(nq - floor + 1):
+                later = lists[i + 1:]
+                for uid in lists[i].difference(seen, exclude):
+                    n = 1
+                    for ids in later:
+                        if uid in ids:
+                            n += 1
+                    if n < floor:
+                        continue
+                    item = (n / (nq + self._tri_count[uid] - n), -uid)
+                    if item[0] < self.min_similarity:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                seen |= lists[i]
+                if len(best) == k and best[0][0] > (nq - i - 1) / nq:
+                    break
+            return [(-neg, self._names[-neg], round(sim, 3)) for sim, neg in sorted(best, reverse=True)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self._built_at is not None,
+                "building": self._building,
+                "users": len(self._names),
+                "trigrams": len(self._postings),
+                "builds": self.builds,
+                "build_ms": self.build_ms,
+                "age_seconds": None if self._built_at is None else round(time.monotonic() - self._built_at, 1),
+                "queries": self.queries,
+            }
+
+
+# Shared instance kept current by core/users_repo.py
+username_index = UsernameIndex(
+    refresh_seconds=Settings.USERNAME_INDEX_REFRESH_SECONDS,
+    min_similarity=Settings.USERNAME_INDEX_MIN_SIMILARITY,
+)
@@ -1,8 +1,15 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator, List, Tuple
+from config import Settings
 from .db import supabase, exec_data, USERS_TABLE
+from .pagination import encode_cursor
+from .user_cache import user_cache
+from .username_index import username_index
 
 PublicUser = Dict
 
+# Columns safe to return to other users (never password)
+PUBLIC_USER_COLUMNS = "userId,email,username,mobile"
+
 def row_to_public_user(row: dict) -> Optional[PublicUser]:
     if not row:
         return None
@@ -13,30 +20,103 @@ def row_to_public_user(row: dict) -> Optional[PublicUser]:
         "mobile": row.get("mobile"),
     }
 
-def get_user_by_email(email: str) -> Optional[dict]:
+def _select_user(column: str, value, columns: str = "*") -> Optional[dict]:
+    resp = supabase.table(USERS_TABLE).select(columns).eq(column, value).limit(1).execute()
+    data = exec_data(resp)
+    return data[0] if data else None
+
+def _get_user(column: str, value) -> Optional[dict]:
+    """
+    Public columns only, so a cached row can never answer a credential check. Misses are
+    cached for userId only: an email/username that does not exist yet may be taken by a
+    signup on another instance at any moment.
+    """
+    def load():
+        return _select_user(column, value, PUBLIC_USER_COLUMNS)
     try:
-        resp = supabase.table(USERS_TABLE).select("*").eq("email", email).limit(1).execute()
-        data = exec_data(resp)
-        return data[0] if data else None
+        if not Settings.USER_CACHE_ENABLED:
+            return load()
+        return user_cache.get(column, value, load, negative=column == "userId")
     except Exception:
         return None
 
+def get_user_by_email(email: str) -> Optional[dict]:
+    return _get_user("email", email)
+
 def get_user_by_username(username: str) -> Optional[dict]:
-    try:
-        resp = supabase.table(USERS_TABLE).select("*").eq("username", username).limit(1).execute()
-        data = exec_data(resp)
-        return data[0] if data else None
-    except Exception:
-        return None
+    return _get_user("username", username)
 
 def get_user_by_id(user_id: str) -> Optional[dict]:
+    return _get_user("userId", user_id)
+
+def get_user_credentials_by_email(email: str) -> Optional[dict]:
+    """
+    Full row (with password) straight from the database for login. Never cached, so a
+    password change or a signup on another instance takes effect immediately.
+    """
     try:
-        resp = supabase.table(USERS_TABLE).select("*").eq("userId", user_id).limit(1).execute()
-        data = exec_data(resp)
-        return data[0] if data else None
+        return _select_user("email", email)
     except Exception:
         return None
 
+def _escape_like(q: str) -> str:
+    """q with LIKE metachars escaped and PostgREST's * wildcard dropped."""
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("*", "")
+
+def _like_prefix(q: str) -> str:
+    """PostgREST or_() value matching names starting with q: LIKE metachars escaped, quoted."""
+    quoted = (_escape_like(q) + "*").replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{quoted}"'
+
+def list_public_users(limit: int, after_user_id: Optional[int] = None,
+                      q: Optional[str] = None) -> Tuple[List[PublicUser], Optional[str]]:
+    """
+    One keyset page of public user rows, newest userId first; q is a case-insensitive
+    prefix on username or email. Returns (rows, next_cursor), next_cursor None on the last page.
+    """
+    query = supabase.table(USERS_TABLE).select(PUBLIC_USER_COLUMNS)
+    if after_user_id is not None:
+        query = query.lt("userId", after_user_id)
+    if q:
+        pattern = _like_prefix(q)
+        query = query.or_(f"username.ilike.{pattern},email.ilike.{pattern}")
+    # One extra row tells us whether another page exists
+    rows = exec_data(query.order("userId", desc=True).limit(limit + 1).execute()) or []
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["userId"])
+
+def search_usernames_by_prefix(q: str, limit: int) -> List[Tuple[int, str]]:
+    """Up to limit (userId, username) whose username starts with q (case-insensitive), alphabetical."""
+    resp = (supabase.table(USERS_TABLE).select("userId,username")
+            .ilike("username", _escape_like(q) + "%")
+            .order("username").limit(limit).execute())
+    return [(r["userId"], r["username"]) for r in exec_data(resp) or [] if r.get("username")]
+
+def iter_usernames(page_size: int = 1000) -> Iterator[Tuple[int, Optional[str]]]:
+    """(userId, username) for every user, via keyset pages on userId."""
+    last = None
+    while True:
+        query = supabase.table(USERS_TABLE).select("userId,username")
+        if last is not None:
+            query = query.gt("userId", last)
+        rows = exec_data(query.order("userId").limit(page_size).execute()) or []
+        for r in rows:
+            yield r["userId"], r.get("username")
+        if len(rows) < page_size:
+            return
+        last = rows[-1]["userId"]
+
+def refresh_username_index(force: bool = False) -> None:
+    """Kick off a background rebuild of the typeahead index when it is missing or stale."""
+    if force or username_index.stale():
+        username_index.rebuild_async(lambda: iter_usernames(Settings.USERNAME_INDEX_PAGE_SIZE))
+
+def invalidate_user(user_id) -> None:
+    """Drop a cached user after a write that bypasses this module (e.g. users.daily_quiz_at)."""
+    user_cache.invalidate_id(user_id)
+
 def create_user(email: str, password: str, username: str | None = None, mobile: str | None = None) -> Optional[dict]:
     payload = {
         "email": email,
@@ -47,12 +127,26 @@ def create_user(email: str, password: str, username: str | None = None, mobile:
     payload = {k: v for k, v in payload.items() if v is not None}
     resp = supabase.table(USERS_TABLE).insert(payload).execute()
     data = exec_data(resp)
-    return data[0] if data else None
+    created = data[0] if data else None
+    user_cache.put(row_to_public_user(created))
+    if created:
+        username_index.upsert(created.get("userId"), created.get("username"))
+    return created
 
 def update_user_fields_by_id(user_id: str, fields: dict) -> Optional[dict]:
     fields = {k: v for k, v in fields.items() if v is not None}
     if not fields:
         return None
-    resp = supabase.table(USERS_TABLE).update(fields).eq("userId", user_id).execute()
+    try:
+        resp = supabase.table(USERS_TABLE).update(fields).eq("userId", user_id).execute()
+    except Exception:
+        user_cache.invalidate_id(user_id)
+        raise
     data = exec_data(resp)
-    return data[0] if data else None
+    updated = data[0] if data else None
+    if updated:
+        user_cache.put(row_to_public_user(updated))
+        username_index.upsert(updated.get("userId"), updated.get("username"))
+    else:
+        user_cache.invalidate_id(user_id)
+    return updated
@@ -6,6 +6,7 @@ from .label_options import bp as label_options_bp
 from .range_config import bp as range_config_bp
 from .encouragement import bp as encouragement_bp
 from .friends import bp as friends_bp
+from .bootstrap import bp as bootstrap_bp
 
 def register_blueprints(app):
     app.register_blueprint(auth_bp)
@@ -16,3 +17,4 @@ def register_blueprints(app):
     app.register_blueprint(range_config_bp)
     app.register_blueprint(encouragement_bp)
     app.register_blueprint(friends_bp)
+    app.register_blueprint(bootstrap_bp)
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
+from core.db import is_unique_violation
 from core.users_repo import (
-    get_user_by_email,
+    get_user_credentials_by_email,
     create_user,
     row_to_public_user,
 )
@@ -37,7 +38,7 @@ def login():
     if not email or not password:
         return jsonify({"error": "Missing email or password"}), 400
 
-    user = get_user_by_email(email)
+    user = get_user_credentials_by_email(email)
     if not user or user.get("password") != password:
         return jsonify({"error": "Invalid credentials"}), 401
 
@@ -70,8 +71,6 @@ def signup():
       400: {description: Missing or bad request}
       409: {description: Email already exists}
     """
-    from core.users_repo import get_user_by_email  # local import to avoid circular hints
-
     data = request.get_json(silent=True) or {}
     email = data.get("email")
     password = data.get("password")
@@ -81,9 +80,11 @@ def signup():
     if not email or not password:
         return jsonify({"error": "Missing email or password"}), 400
 
-    existing = get_user_by_email(email)
-    if existing:
-        return jsonify({"error": "Email already exists"}), 409
-
-    created = create_user(email=email, password=password, username=username, mobile=mobile)
+    # One round trip: the users_email_key unique index decides, not a racy pre-check
+    try:
+        created = create_user(email=email, password=password, username=username, mobile=mobile)
+    except Exception as e:
+        if is_unique_violation(e):
+            return jsonify({"error": "Email already exists"}), 409
+        raise
     return jsonify({"message": "User created", "user": row_to_public_user(created)}), 201
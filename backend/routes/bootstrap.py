@@ -0,0 +1,82 @@
+import hashlib
+import json
+
+from flask import Blueprint, jsonify
+
+from core.aio import fan_out
+from core.db import QUIZQN_TABLE, RANGE_CONFIG_TABLE, LABEL_OPTIONS_TABLE, SCORE_BANDS_TABLE
+from core.http_cache import conditional_json, table_key
+from core.quiz_catalog import get_catalog
+from core.ref_cache import ref_cache
+from .range_config import RANGE_CONFIG_COLS, load_range_configs
+from .label_options import LABEL_OPTION_COLS, load_label_options
+from .mood import get_band_index
+
+bp = Blueprint("bootstrap", __name__)
+
+
+# (ref_cache key, loader) for each part of the payload, in payload order
+_SOURCES = (
+    (QUIZQN_TABLE, get_catalog),
+    (table_key(RANGE_CONFIG_TABLE, RANGE_CONFIG_COLS, order="id"), load_range_configs),
+    (table_key(LABEL_OPTIONS_TABLE, LABEL_OPTION_COLS, order="id"), load_label_options),
+    (SCORE_BANDS_TABLE, get_band_index),
+)
+
+
+def _load_sources():
+    """
+    Loader results in _SOURCES order. Warm caches are read inline (a thread hop costs more
+    than the lookup); only cold ones are fanned out, and only when more than one is cold.
+    """
+    results = [None] * len(_SOURCES)
+    cold = [i for i, (key, _) in enumerate(_SOURCES) if not ref_cache.is_fresh(key)]
+    if len(cold) > 1:
+        for i, value in zip(cold, fan_out(*(_SOURCES[i][1] for i in cold))):
+            results[i] = value
+    for i, (_, load) in enumerate(_SOURCES):
+        if results[i] is None:
+            results[i] = load()
+    return results
+
+
+def _group_by_field(rows):
+    out = {}
+    for r in rows:
+        out.setdefault(r.get("field_name"), []).append(r)
+    return out
+
+
+@bp.route("/bootstrap", methods=["GET"])
+def get_bootstrap():
+    """
+    All reference data needed to render the daily check-in, in one payload
+    ---
+    tags:
+      - bootstrap
+    responses:
+      200:
+        description: >
+          version (content hash), quiz (active questions, normalized, sorted by display_order),
+          rangeConfig and labelOptions grouped by field_name, scoreBands. Strong ETag + Cache-Control.
+      304: {description: Not modified (If-None-Match matched)}
+      500: {description: Server error}
+    """
+    try:
+        catalog, (ranges, ranges_v), (labels, labels_v), bands = _load_sources()
+
+        def build():
+            data = {
+                "quiz": catalog.listing("all"),
+                "rangeConfig": _group_by_field(ranges),
+                "labelOptions": _group_by_field(labels),
+                "scoreBands": bands.bands,
+            }
+            digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+            return {"version": digest[:16], **data}, 200
+
+        # QuizCatalog/BandIndex are rebuilt only when their tables change, so they double as versions
+        return conditional_json("bootstrap", (catalog, ranges_v, labels_v, bands), build)
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify
-from core.db import supabase, exec_data, MASCOT_TABLE
+from core.db import MASCOT_TABLE
+from core.http_cache import cached_table, conditional_json
 
 bp = Blueprint("encouragement", __name__)
 
+MASCOT_COLS = "id, feeling, encourageWords"
+
+def _mascot_rows():
+    """All mascot rows (newest id first) and their cache version."""
+    return cached_table(MASCOT_TABLE, MASCOT_COLS, order="id", desc=True)
+
 @bp.route("/mascotWords", methods=["GET"])
 def get_encouragement():
     """
@@ -18,7 +25,8 @@ def get_encouragement():
         description: Return encouragement words that match this feeling
         example: sad
     responses:
-      200: {description: Matching encouragement words}
+      200: {description: Matching encouragement words (strong ETag, Cache-Control)}
+      304: {description: Not modified (If-None-Match matched)}
       400: {description: Missing feeling}
       404: {description: No rows found}
       500: {description: Server error}
@@ -28,13 +36,16 @@ def get_encouragement():
         if not feeling:
             return jsonify({"error": "Missing feeling"}), 400
 
-        resp = supabase.table(MASCOT_TABLE).select("id, feeling, encourageWords").eq("feeling", feeling).execute()
-        rows = exec_data(resp) or []
-        if not rows:
-            return jsonify({"error": "No rows found"}), 404
+        all_rows, version = _mascot_rows()
+
+        def build():
+            rows = [r for r in all_rows if r.get("feeling") == feeling]
+            if not rows:
+                return {"error": "No rows found"}, 404
+            words = [row["encourageWords"] for row in rows if row.get("encourageWords")]
+            return {"feeling": feeling, "encourageWords": words}, 200
 
-        words = [row["encourageWords"] for row in rows if row.get("encourageWords")]
-        return jsonify({"feeling": feeling, "encourageWords": words}), 200
+        return conditional_json(f"mascotWords:{feeling}", version, build)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -48,12 +59,12 @@ def get_all_encouragement():
     tags:
       - encouragement
     responses:
-      200: {description: List of all encouragement rows}
+      200: {description: List of all encouragement rows (strong ETag, Cache-Control)}
+      304: {description: Not modified (If-None-Match matched)}
       500: {description: Server error}
     """
     try:
-        resp = supabase.table(MASCOT_TABLE).select("id, feeling, encourageWords").order("id", desc=True).execute()
-        rows = exec_data(resp) or []
-        return jsonify({"rows": rows, "count": len(rows)}), 200
+        rows, version = _mascot_rows()
+        return conditional_json("encouragementAll", version, lambda: ({"rows": rows, "count": len(rows)}, 200))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
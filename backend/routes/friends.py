@@ -87,21 +87,14 @@ def deleteFriendById():
         if row_id is None:
             return jsonify({"error": "Missing id"}), 400
 
-        q = supabase.table(FRIENDS_TABLE).select("id, friendofuid").eq("id", row_id).limit(1)
-        if owner is not None:
-            q = q.eq("friendofuid", owner)
-
-        exists_resp = q.execute()
-        exists_rows = exec_data(exists_resp) or []
-        if not exists_rows:
-            return jsonify({"error": "Row not found"}), 404
-
+        # One round trip: DELETE returns the removed rows, so an empty result means not found
         del_q = supabase.table(FRIENDS_TABLE).delete().eq("id", row_id)
         if owner is not None:
             del_q = del_q.eq("friendofuid", owner)
 
-        del_resp = del_q.execute()
-        _ = exec_data(del_resp)
+        deleted = exec_data(del_q.execute()) or []
+        if not deleted:
+            return jsonify({"error": "Row not found"}), 404
 
         return jsonify({"message": "Deleted", "id": row_id}), 200
 
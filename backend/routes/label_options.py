@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify
-from core.db import supabase, exec_data, LABEL_OPTIONS_TABLE
+from core.db import LABEL_OPTIONS_TABLE
+from core.http_cache import cached_table, conditional_json
 
 bp = Blueprint("label_options", __name__)
 
+LABEL_OPTION_COLS = "id,field_name,labelvalue"
+
+def load_label_options():
+    """All labelOptions rows (by id) and their cache version."""
+    return cached_table(LABEL_OPTIONS_TABLE, LABEL_OPTION_COLS, order="id")
+
 @bp.route("/labelOptions", methods=["GET"])
 def get_fields():
     """
@@ -18,23 +25,26 @@ def get_fields():
         description: Return rows that match this field_name
         example: sleepquality
     responses:
-      200: {description: List of matching rows}
+      200: {description: List of matching rows (strong ETag, Cache-Control)}
+      304: {description: Not modified (If-None-Match matched)}
       400: {description: Missing field_name}
       404: {description: No rows found}
       500: {description: Server error}
     """
     try:
-        cols = ["id", "field_name", "labelvalue"]
         field_name = request.args.get("field_name")
         if not field_name:
             return jsonify({"error": "Missing field_name"}), 400
 
-        resp = supabase.table(LABEL_OPTIONS_TABLE).select(",".join(cols)).eq("field_name", field_name).execute()
-        rows = exec_data(resp) or []
-        if not rows:
-            return jsonify({"error": "No rows found"}), 404
+        all_rows, version = load_label_options()
+
+        def build():
+            rows = [r for r in all_rows if r.get("field_name") == field_name]
+            if not rows:
+                return {"error": "No rows found"}, 404
+            return {"rows": rows, "count": len(rows)}, 200
 
-        return jsonify({"rows": rows, "count": len(rows)}), 200
+        return conditional_json(f"labelOptions:{field_name}", version, build)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1,10 +1,37 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from datetime import datetime, timezone, timedelta
-from core.db import supabase, exec_data, MOOD_TABLE, USERS_TABLE
-import re
-import json 
+from core.db import (
+    supabase, exec_data, is_data_error, MOOD_TABLE, USERS_TABLE, SCORING_WEIGHTS_TABLE, SCORE_BANDS_TABLE, MOOD_ROLLUP_TABLE,
+)
+from core import rollups
+from core.aio import fan_out
+from core.users_repo import invalidate_user
+from core.ref_cache import ref_cache
+from core.scoring import as_bool, as_float, as_int, compile_component, compile_scorer
+from core.bands import BandIndex
+from core.pagination import clamp_limit, decode_cursor, encode_cursor, parse_fields
+from config import Settings
 from zoneinfo import ZoneInfo
+import click
+import csv
+import io
+import json
+import logging
 bp = Blueprint("mood", __name__)
+logger = logging.getLogger(__name__)
+
+# Columns clients may project with ?fields=
+MOOD_COLUMNS = (
+    "id", "userId", "created_timestamp", "sleepHours", "exerciseHours", "workingHrs",
+    "sleepQuality", "mood", "energy", "stress", "timeOutsideMin", "connectwithfamily",
+    "notes", "finalMoodScores",
+)
+# Keyset columns, always returned so the next cursor can be built
+MOOD_KEYSET = ("created_timestamp", "id")
+# Updating any of these moves a row between rollup buckets or changes its stats
+ROLLUP_FIELDS = {"userId", "created_timestamp", "finalMoodScores"}
+# Default look-back for /userMoodSummary when ?from= is omitted
+SUMMARY_WINDOW_DAYS = {"day": 30, "week": 7 * 12, "month": 365}
 
 @bp.route("/moodMetric", methods=["GET"])
 def get_mood_metrics():
@@ -26,8 +53,38 @@ def get_mood_metrics():
         required: false
         description: Filter by userId
         example: 42
+      - in: query
+        name: from
+        type: string
+        required: false
+        description: Only rows with created_timestamp >= from
+        example: "2025-09-01 00:00:00"
+      - in: query
+        name: to
+        type: string
+        required: false
+        description: Only rows with created_timestamp < to
+        example: "2025-10-01 00:00:00"
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated columns to return (id and created_timestamp are always included)
+        example: finalMoodScores,mood,stress
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 200, max 1000)
+        example: 50
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: next_cursor from the previous page
     responses:
-      200: {description: List or single mood metric (all fields)}
+      200: {description: "Single row, or a page of rows newest first with next_cursor (null on the last page)"}
+      400: {description: Invalid cursor or unknown field}
       404: {description: Row not found (when id is provided)}
       500: {description: Server error}
     """
@@ -35,10 +92,19 @@ def get_mood_metrics():
         q_id = request.args.get("id", type=int)
         user_id = request.args.get("userId", type=int)
 
+        try:
+            cols = parse_fields(request.args.get("fields"), MOOD_COLUMNS, required=MOOD_KEYSET)
+            cursor = decode_cursor(request.args.get("cursor"))
+            if cursor is not None and not _valid_mood_cursor(cursor):
+                raise ValueError("Invalid cursor")
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+        select = ",".join(cols) if cols else "*"
+
         if q_id is not None:
             resp = (
                 supabase.table(MOOD_TABLE)
-                .select("*")
+                .select(select)
                 .eq("id", q_id)
                 .limit(1)
                 .execute()
@@ -48,22 +114,172 @@ def get_mood_metrics():
                 return jsonify({"error": "Row not found"}), 404
             return jsonify({"row": data[0]}), 200
 
-        query = supabase.table(MOOD_TABLE).select("*")
-        if user_id is not None:
-            query = query.eq("userId", user_id)
+        limit = clamp_limit(
+            request.args.get("limit", type=int),
+            Settings.MOOD_PAGE_DEFAULT_LIMIT,
+            Settings.MOOD_PAGE_MAX_LIMIT,
+        )
+        rows, next_cursor = fetch_mood_page(
+            select,
+            user_id=user_id,
+            ts_from=request.args.get("from"),
+            ts_to=request.args.get("to"),
+            cursor=cursor,
+            limit=limit,
+        )
+        return jsonify({"rows": rows, "count": len(rows), "next_cursor": next_cursor}), 200
 
-        # Order newest first (by created_timestamp if present, else by id)
-        try:
-            resp = query.order("created_timestamp", desc=True).execute()
-        except Exception:
-            resp = query.order("id", desc=True).execute()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-        rows = exec_data(resp) or []
-        return jsonify({"rows": rows}), 200
 
+@bp.route("/moodMetric/export", methods=["GET"])
+def export_mood_metrics():
+    """
+    Stream mood history as NDJSON or CSV
+    Pages through moodMetric in keyset chunks and writes rows out as they arrive, so memory
+    stays flat regardless of table size.
+    ---
+    tags:
+      - moodMetric
+    produces:
+      - application/x-ndjson
+      - text/csv
+    parameters:
+      - in: query
+        name: format
+        type: string
+        enum: [ndjson, csv]
+        default: ndjson
+      - in: query
+        name: userId
+        type: integer
+        required: false
+        example: 42
+      - in: query
+        name: from
+        type: string
+        required: false
+        description: Only rows with created_timestamp >= from
+        example: "2025-09-01 00:00:00"
+      - in: query
+        name: to
+        type: string
+        required: false
+        description: Only rows with created_timestamp < to
+        example: "2025-10-01 00:00:00"
+      - in: query
+        name: fields
+        type: string
+        required: false
+        description: Comma-separated columns (id and created_timestamp are always included)
+        example: userId,finalMoodScores
+      - in: query
+        name: include_band
+        type: boolean
+        required: false
+        description: Attach the score band key/label for each row (from the cached band table)
+    responses:
+      200:
+        description: >-
+          Streamed rows. If the database fails part-way, an NDJSON stream ends with an
+          {"error", "truncated": true} record and the response is aborted (no clean end of body).
+      400: {description: Unknown format or field, or an invalid userId/from/to/include_band}
+      500: {description: The first page could not be read}
+    """
+    fmt = (request.args.get("format") or "ndjson").strip().lower()
+    if fmt not in ("ndjson", "csv"):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    try:
+        cols = parse_fields(request.args.get("fields"), MOOD_COLUMNS, required=MOOD_KEYSET)
+    except ValueError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    # Validate everything before the stream starts: afterwards the status is already 200
+    user_id = request.args.get("userId", type=int)
+    if request.args.get("userId") and user_id is None:
+        return jsonify({"error": "userId must be an integer"}), 400
+    ts_from = request.args.get("from")
+    ts_to = request.args.get("to")
+    for name, value in (("from", ts_from), ("to", ts_to)):
+        if value and parse_ts(value) is None:
+            return jsonify({"error": f"{name} must be an ISO timestamp"}), 400
+    raw_band = (request.args.get("include_band") or "").strip().lower()
+    if raw_band not in ("", "1", "0", "true", "false", "t", "f", "yes", "no", "y", "n", "on", "off"):
+        return jsonify({"error": "include_band must be a boolean"}), 400
+    include_band = as_bool(raw_band) or False
+    # finalMoodScores is needed to resolve the band even if not projected
+    select_cols = list(cols or MOOD_COLUMNS)
+    if include_band and "finalMoodScores" not in select_cols:
+        select_cols.append("finalMoodScores")
+    out_cols = list(cols or MOOD_COLUMNS) + (["band_key", "band_label"] if include_band else [])
+
+    def fetch(cursor):
+        return fetch_mood_page(
+            ",".join(select_cols),
+            user_id=user_id,
+            ts_from=ts_from,
+            ts_to=ts_to,
+            cursor=cursor,
+            limit=Settings.MOOD_EXPORT_CHUNK_SIZE,
+        )
+
+    # The first page is read before any byte is sent, so a failing query is a 500, not an empty 200
+    try:
+        bands = get_band_index() if include_band else None
+        first_page = fetch(None)
     except Exception as e:
+        logger.exception("moodMetric export failed")
         return jsonify({"error": str(e)}), 500
 
+    def rows():
+        page, next_cursor = first_page
+        while True:
+            for r in page:
+                if bands is not None:
+                    band = bands.lookup(as_float(r.get("finalMoodScores")))
+                    r["band_key"] = band["band_key"] if band else None
+                    r["band_label"] = band["label"] if band else None
+                yield r
+            if next_cursor is None:
+                return
+            page, next_cursor = fetch(decode_cursor(next_cursor))
+
+    def generate():
+        try:
+            if fmt == "csv":
+                buf = io.StringIO()
+                writer = csv.DictWriter(buf, fieldnames=out_cols, extrasaction="ignore")
+                writer.writeheader()
+                yield buf.getvalue()  # send headers now so a later failure aborts the chunked body
+                buf.seek(0)
+                buf.truncate()
+                for r in rows():
+                    writer.writerow(r)
+                    if buf.tell() >= 64 * 1024:
+                        yield buf.getvalue()
+                        buf.seek(0)
+                        buf.truncate()
+                yield buf.getvalue()
+            else:
+                for r in rows():
+                    yield json.dumps({c: r.get(c) for c in out_cols}, default=str) + "\n"
+        except Exception as e:
+            # Headers are already sent: mark the truncation, then re-raise so the server
+            # aborts the body instead of ending it cleanly (a clean end would look complete)
+            logger.exception("moodMetric export failed mid-stream")
+            if fmt != "csv":
+                yield json.dumps({"error": str(e), "truncated": True}) + "\n"
+            raise
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"moodMetric.{'csv' if fmt == 'csv' else 'ndjson'}"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @bp.route("/moodMetric", methods=["POST"])
 def create_mood_metric():
@@ -335,23 +551,8 @@ def create_mood_metric():
     if user_id is None:
         return jsonify({"error": "Missing userId"}), 400
 
-    # backward compat for "excerciseHours"
-    exercise_hours = data.get("exerciseHours", data.get("excerciseHours"))
-
-    # Build typed raw_values for scoring
-    raw_values = {
-        "userId": as_int(user_id),
-        "sleepHours": as_float(data.get("sleepHours")),
-        "exerciseHours": as_float(exercise_hours),   # hours; score uses minutes internally
-        "workingHrs": as_float(data.get("workingHrs")),
-        "sleepQuality": as_int(data.get("sleepQuality")),  # 1-10
-        "mood": as_int(data.get("mood")),                  # 1-10
-        "energy": as_int(data.get("energy")),              # 1-10
-        "stress": as_int(data.get("stress")),              # 1-10
-        "timeOutsideMin": as_int(data.get("timeOutsideMin")),
-        "connectwithfamily": as_bool(data.get("connectwithfamily")),
-        "notes": data.get("notes"),
-    }
+    raw_values = _typed_mood_values(data)
+    prefetch_reference_data()
 
     # Compute final score (0–10); ignore any client-provided value
     computed_score = compute_final_score_from_weights(raw_values)
@@ -360,42 +561,31 @@ def create_mood_metric():
     score_band = None
     if computed_score is not None:
         # Load bands once
-        bands = load_score_bands()
+        bands = get_band_index()
         score_band = pick_score_band_for(computed_score, bands)
         
     # ---------------------------------------------------------------------------
-    payload = {
-        "userId": raw_values["userId"],
-        "sleepHours": raw_values["sleepHours"],
-        "exerciseHours": raw_values["exerciseHours"],
-        "workingHrs": raw_values["workingHrs"],
-        "sleepQuality": raw_values["sleepQuality"],
-        "mood": raw_values["mood"],
-        "energy": raw_values["energy"],
-        "stress": raw_values["stress"],
-        "timeOutsideMin": raw_values["timeOutsideMin"],
-        "connectwithfamily": raw_values["connectwithfamily"],
-        "notes": raw_values["notes"],
-        "finalMoodScores": computed_score,
-        "created_timestamp": data.get("created_timestamp") or now_iso(),
-    }
-    # Drop Nones to avoid overwriting with NULLs
-    payload = {k: v for k, v in payload.items() if v is not None}
+    payload = _mood_insert_payload(raw_values, computed_score, data.get("created_timestamp"))
 
     try:
         resp = supabase.table(MOOD_TABLE).insert(payload).execute()
         created = exec_data(resp)
 
-        # --- update users.daily_quiz_at (timestamptz) ---
+        # --- update users.daily_quiz_at (timestamptz) and rollups, concurrently ---
         daily_quiz_at = datetime.now(timezone.utc).isoformat()  # e.g. 2025-09-06T12:34:56+00:00
-        try:
-            supabase.table(USERS_TABLE) \
-                .update({"daily_quiz_at": daily_quiz_at}) \
-                .eq("userId", raw_values["userId"]) \
-                .execute()
-        except Exception as ue:
-            # Non-fatal: keep the mood entry, just log the issue
-            print("Warning: failed to update users.daily_quiz_at:", ue)
+
+        def update_daily_quiz_at():
+            try:
+                supabase.table(USERS_TABLE) \
+                    .update({"daily_quiz_at": daily_quiz_at}) \
+                    .eq("userId", raw_values["userId"]) \
+                    .execute()
+                invalidate_user(raw_values["userId"])
+            except Exception as ue:
+                # Non-fatal: keep the mood entry, just log the issue
+                print("Warning: failed to update users.daily_quiz_at:", ue)
+
+        fan_out(update_daily_quiz_at, lambda: _update_rollups_for_inserts(created))
 
         return jsonify({
             "message": "Created",
@@ -410,6 +600,128 @@ def create_mood_metric():
 
 
 
+@bp.route("/moodMetric/batch", methods=["POST"])
+def create_mood_metrics_batch():
+    """
+    Create many mood metric entries in one request
+
+    Scores every row with a single weights/bands load, inserts all valid rows with one
+    multi-row insert, and moves **users.daily_quiz_at** of every user in the batch (to the
+    latest created_timestamp of that user's rows) with one statement. Invalid rows are
+    reported per index and do not fail the rest of the batch.
+    ---
+    tags:
+      - moodMetric
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required: [rows]
+          properties:
+            rows:
+              type: array
+              description: Same fields as POST /moodMetric (userId required per row)
+              items:
+                type: object
+              example:
+                - {userId: 42, mood: 7, stress: 3, sleepHours: 7.5, created_timestamp: "2025-09-02 21:30:00"}
+                - {userId: 43, mood: 5, energy: 6}
+    responses:
+      200:
+        description: Batch processed; see per-row results
+        examples:
+          application/json:
+            message: Processed
+            inserted: 1
+            failed: 1
+            results:
+              - {index: 0, status: created, finalScore: 7.4, scoreBand: {band_key: solid}, row: {id: 123, userId: 42}}
+              - {index: 1, status: error, error: Missing userId}
+      400: {description: Body is not a non-empty list of rows, or exceeds the batch limit}
+    """
+    data = request.get_json(silent=True)
+    items = data.get("rows") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Body must contain a non-empty 'rows' array"}), 400
+    if len(items) > Settings.MOOD_BATCH_MAX_ROWS:
+        return jsonify({"error": f"Too many rows (max {Settings.MOOD_BATCH_MAX_ROWS})"}), 400
+
+    # One weights and one bands load for the whole batch
+    prefetch_reference_data()
+    scorer = get_scorer()
+    bands = get_band_index()
+
+    results = [None] * len(items)
+    pending = []  # (index, payload, score_band)
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = {"index": i, "status": "error", "error": "Row must be an object"}
+            continue
+        raw_values = _typed_mood_values(item)
+        if raw_values["userId"] is None:
+            results[i] = {"index": i, "status": "error", "error": "Missing userId"}
+            continue
+        computed_score = scorer.score(raw_values)
+        score_band = bands.lookup(computed_score)
+        payload = _mood_insert_payload(raw_values, computed_score, item.get("created_timestamp"))
+        pending.append((i, payload, score_band))
+
+    created_rows = _insert_mood_rows([p for _, p, _ in pending])
+
+    latest_by_user = {}
+    for (i, payload, score_band), (row, err) in zip(pending, created_rows):
+        if err is not None:
+            results[i] = {"index": i, "status": "error", "error": err}
+            continue
+        results[i] = {
+            "index": i,
+            "status": "created",
+            "row": row,
+            "finalScore": payload.get("finalMoodScores"),
+            "scoreBand": score_band,
+        }
+        ts = parse_ts(payload["created_timestamp"])
+        if ts is not None:
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            uid = payload["userId"]
+            if uid not in latest_by_user or ts > latest_by_user[uid]:
+                latest_by_user[uid] = ts
+
+    # --- rollups + users.daily_quiz_at for every user in one statement (never moves it backwards) ---
+    def update_daily_quiz_at():
+        if not latest_by_user:
+            return
+        updates = [
+            {"userId": uid, "daily_quiz_at": ts.astimezone(timezone.utc).isoformat()}
+            for uid, ts in latest_by_user.items()
+        ]
+        try:
+            supabase.rpc("advance_daily_quiz_at", {"updates": updates}).execute()
+        except Exception as ue:
+            # Non-fatal: keep the mood entries, just log the issue
+            print("Warning: failed to update users.daily_quiz_at:", ue)
+        finally:
+            for uid in latest_by_user:
+                invalidate_user(uid)
+
+    created_ok = [row for row, err in created_rows if err is None]
+    fan_out(lambda: _update_rollups_for_inserts(created_ok), update_daily_quiz_at)
+
+    inserted = sum(1 for r in results if r["status"] == "created")
+    return jsonify({
+        "message": "Processed",
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results,
+    }), 200
+
+
+
 @bp.route("/moodMetric", methods=["PUT"])
 def update_mood_metric():
     """
@@ -474,10 +786,33 @@ def update_mood_metric():
         return jsonify({"error": "No fields to update"}), 400
 
     try:
+        # Moving a row to another user/day leaves its old rollup buckets stale; note them first
+        stale_keys = []
+        if "userId" in fields or "created_timestamp" in fields:
+            old_resp = (
+                supabase.table(MOOD_TABLE)
+                .select("userId,created_timestamp")
+                .eq("id", as_int(row_id))
+                .limit(1)
+                .execute()
+            )
+            for old in exec_data(old_resp) or []:
+                stale_keys += rollups.bucket_keys(old.get("userId"), old.get("created_timestamp"))
+
         resp = supabase.table(MOOD_TABLE).update(fields).eq("id", as_int(row_id)).execute()
         updated = exec_data(resp)
         if not updated:
             return jsonify({"error": "Row not found"}), 404
+
+        if stale_keys or ROLLUP_FIELDS & fields.keys():
+            row = updated[0]
+            try:
+                rollups.recompute_buckets(
+                    stale_keys + rollups.bucket_keys(row.get("userId"), row.get("created_timestamp"))
+                )
+            except Exception as re_err:
+                # Non-fatal: `flask mood rebuild-rollups` repairs drift
+                print("Warning: failed to refresh mood rollups:", re_err)
         return jsonify({"message": "Updated", "row": updated[0]}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -505,54 +840,62 @@ def userDailyQuizResult():
         if user_id is None:
             return jsonify({"error": "Missing userId"}), 400
 
-        # 1) Fetch user (daily_quiz_at first)
+        # 1) One round trip: user's daily_quiz_at plus their newest moodMetric row (embedded).
+        #    The newest row overall is also the newest row of daily_quiz_at's SGT day whenever
+        #    it falls inside that day, which is the normal case right after a check-in.
+        #    Bands are cached; on a cold cache they load concurrently with the user query.
         daily_quiz_at = None
-        try:
-            uresp = (
-                supabase.table(USERS_TABLE)
-                .select("userId,daily_quiz_at")
-                .eq("userId", user_id)
-                .limit(1)
-                .execute()
-            )
-            udata = exec_data(uresp) or []
+        latest = None
+        embedded_ok = False
+        udata, bands = _with_bands(lambda: _fetch_user_with_latest_mood(user_id))
+        if isinstance(udata, Exception):
+            print("users.daily_quiz_at (with latest moodMetric) fetch error:", udata)
+            daily_quiz_at, udata = _fetch_daily_quiz_at(user_id)
+            if udata is not None and not udata:
+                return jsonify({"error": "User not found"}), 404
+        else:
             if not udata:
                 return jsonify({"error": "User not found"}), 404
             daily_quiz_at = (udata[0] or {}).get("daily_quiz_at")
-        except Exception as ue:
-            print("users.daily_quiz_at fetch error:", ue)
-            # keep daily_quiz_at=None, still proceed
-
-        # Load bands once
-        bands = load_score_bands()
+            latest = ((udata[0] or {}).get(MOOD_TABLE) or [None])[0]
+            embedded_ok = True
 
-        # 2) Using (userId, daily_quiz_at) → fetch that SGT day's moodMetric
+        # 2) Using (userId, daily_quiz_at) → that SGT day's newest moodMetric row
         row_for_daily = None
         if daily_quiz_at:
             start_iso, end_iso = sg_day_bounds_from_ts(daily_quiz_at)
             if start_iso and end_iso:
-                try:
-                    mresp = (
-                        supabase.table(MOOD_TABLE)
-                        .select("*")
-                        .eq("userId", user_id)
-                        .gte("created_timestamp", start_iso)
-                        .lt("created_timestamp", end_iso)
-                        .order("created_timestamp", desc=True)
-                        .limit(1)
-                        .execute()
-                    )
-                    mrows = exec_data(mresp) or []
-                    if mrows:
-                        row_for_daily = mrows[0]
-                        # attach scoreBand
-                        try:
-                            sc = float(row_for_daily.get("finalMoodScores")) if row_for_daily.get("finalMoodScores") is not None else None
-                        except (TypeError, ValueError):
-                            sc = None
-                        row_for_daily["scoreBand"] = pick_score_band_for(sc, bands)
-                except Exception as me:
-                    print("moodMetric (daily_quiz_at day) fetch error:", me)
+                latest_ts = parse_ts(latest.get("created_timestamp")) if latest else None
+                if latest_ts is not None and latest_ts.tzinfo is None:
+                    latest_ts = latest_ts.replace(tzinfo=timezone.utc)
+                in_day = latest_ts is not None and parse_ts(start_iso) <= latest_ts < parse_ts(end_iso)
+                if in_day:
+                    row_for_daily = latest
+                elif latest is not None or not embedded_ok:
+                    # Newest row lies outside that day (back-dated entries) or the embed failed
+                    try:
+                        mresp = (
+                            supabase.table(MOOD_TABLE)
+                            .select("*")
+                            .eq("userId", user_id)
+                            .gte("created_timestamp", start_iso)
+                            .lt("created_timestamp", end_iso)
+                            .order("created_timestamp", desc=True)
+                            .limit(1)
+                            .execute()
+                        )
+                        mrows = exec_data(mresp) or []
+                        row_for_daily = mrows[0] if mrows else None
+                    except Exception as me:
+                        print("moodMetric (daily_quiz_at day) fetch error:", me)
+
+        if row_for_daily is not None:
+            # attach scoreBand
+            try:
+                sc = float(row_for_daily.get("finalMoodScores")) if row_for_daily.get("finalMoodScores") is not None else None
+            except (TypeError, ValueError):
+                sc = None
+            row_for_daily["scoreBand"] = pick_score_band_for(sc, bands)
 
         
         return jsonify({
@@ -594,22 +937,10 @@ def userWeeklyQuizResult():
         if user_id is None:
             return jsonify({"error": "Missing userId"}), 400
 
-        # 1) Fetch user's daily_quiz_at
-        try:
-            uresp = (
-                supabase.table(USERS_TABLE)
-                .select("userId,daily_quiz_at")
-                .eq("userId", user_id)
-                .limit(1)
-                .execute()
-            )
-            udata = exec_data(uresp) or []
-            if not udata:
-                return jsonify({"error": "User not found"}), 404
-            daily_quiz_at = (udata[0] or {}).get("daily_quiz_at")
-        except Exception as ue:
-            print("users.daily_quiz_at fetch error:", ue)
-            daily_quiz_at = None
+        # 1) Fetch user's daily_quiz_at (bands load concurrently when their cache is cold)
+        (daily_quiz_at, udata), bands = _with_bands(lambda: _fetch_daily_quiz_at(user_id))
+        if udata is not None and not udata:
+            return jsonify({"error": "User not found"}), 404
 
         # 2) Determine the SGT week bounds
         if daily_quiz_at:
@@ -623,10 +954,7 @@ def userWeeklyQuizResult():
         if not week_start_utc or not week_end_utc:
             return jsonify({"error": "Unable to derive SGT week bounds"}), 500
 
-        # 3) Load bands once
-        bands = load_score_bands()
-
-        # 4) Fetch all moodMetric rows for that user within the week (SGT → UTC bounds)
+        # 3) Fetch all moodMetric rows for that user within the week (SGT → UTC bounds)
         try:
             mresp = (
                 supabase.table(MOOD_TABLE)
@@ -642,7 +970,7 @@ def userWeeklyQuizResult():
             print("moodMetric weekly fetch error:", me)
             mrows = []
 
-        # 5) Attach scoreBand to each row and compute stats
+        # 4) Attach scoreBand to each row and compute stats
         scores = []
         for r in mrows:
             try:
@@ -673,61 +1001,171 @@ def userWeeklyQuizResult():
         print("Error in userWeeklyQuizResult:", e)
         return jsonify({"error": str(e)}), 500
 
-# --- add near top of the file (helpers) --------------------------------------
-def _parse_tips(tips_raw):
-    if isinstance(tips_raw, list):
-        return tips_raw
-    if isinstance(tips_raw, str) and tips_raw.strip():
+@bp.route("/userMoodSummary", methods=["GET"])
+def userMoodSummary():
+    """
+    Get a user's mood summary per day, ISO week or month from the precomputed rollups
+    Reads O(buckets) rollup rows instead of raw moodMetric rows.
+    ---
+    tags:
+      - moodMetric
+    parameters:
+      - in: query
+        name: userId
+        type: integer
+        required: true
+        example: 42
+      - in: query
+        name: granularity
+        type: string
+        enum: [day, week, month]
+        default: week
+      - in: query
+        name: from
+        type: string
+        required: false
+        description: First SGT date to include (YYYY-MM-DD); defaults to a window ending today
+        example: "2025-07-01"
+      - in: query
+        name: to
+        type: string
+        required: false
+        description: Last SGT date to include (YYYY-MM-DD); defaults to today (SGT)
+        example: "2025-09-30"
+    responses:
+      200:
+        description: Per-bucket stats plus an overall summary
+        examples:
+          application/json:
+            userId: 42
+            granularity: week
+            from: "2025-07-01"
+            to: "2025-09-30"
+            buckets:
+              - {bucket: "2025-W36", count: 3, avgScore: 6.9, minScore: 6.2, maxScore: 7.5, lastScore: 7.5}
+            summary: {count: 3, avgScore: 6.9, minScore: 6.2, maxScore: 7.5, lastScore: 7.5, lastTimestamp: "2025-09-05T13:01:42+00:00"}
+      400: {description: Missing userId, bad granularity or bad date}
+      500: {description: Server error}
+    """
+    try:
+        user_id = request.args.get("userId", type=int)
+        if user_id is None:
+            return jsonify({"error": "Missing userId"}), 400
+        granularity = (request.args.get("granularity") or "week").strip().lower()
+        if granularity not in SUMMARY_WINDOW_DAYS:
+            return jsonify({"error": "granularity must be day, week or month"}), 400
+
         try:
-            return json.loads(tips_raw)
-        except Exception:
-            return [tips_raw]
-    return []
+            to_date = (
+                datetime.fromisoformat(request.args["to"]).date() if request.args.get("to")
+                else datetime.now(rollups.SGT).date()
+            )
+            from_date = (
+                datetime.fromisoformat(request.args["from"]).date() if request.args.get("from")
+                else to_date - timedelta(days=SUMMARY_WINDOW_DAYS[granularity])
+            )
+        except ValueError:
+            return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+
+        # Months are folded from day buckets; weeks have their own rollups
+        source = "week" if granularity == "week" else "day"
+        if source == "week":
+            lo = "{}-W{:02d}".format(*from_date.isocalendar()[:2])
+            hi = "{}-W{:02d}".format(*to_date.isocalendar()[:2])
+        else:
+            lo, hi = from_date.isoformat(), to_date.isoformat()
 
-def load_score_bands():
+        resp = (
+            supabase.table(MOOD_ROLLUP_TABLE)
+            .select("bucket,row_count,scored_count,score_sum,score_min,score_max,last_score,last_timestamp")
+            .eq("userId", user_id)
+            .eq("granularity", source)
+            .gte("bucket", lo)
+            .lte("bucket", hi)
+            .order("bucket", desc=False)
+            .execute()
+        )
+        rows = exec_data(resp) or []
+
+        grouped = {}
+        for r in rows:
+            key = r["bucket"][:7] if granularity == "month" else r["bucket"]
+            grouped.setdefault(key, []).append(r)
+        buckets = [{"bucket": key, **rollups.summarize(group)} for key, group in grouped.items()]
+        for b in buckets:
+            b.pop("lastTimestamp", None)
+
+        return jsonify({
+            "userId": user_id,
+            "granularity": granularity,
+            "from": from_date.isoformat(),
+            "to": to_date.isoformat(),
+            "buckets": buckets,
+            "summary": rollups.summarize(rows),
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.cli.command("rebuild-rollups")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user's rollups")
+def rebuild_rollups_command(user_id):
+    """Recompute moodRollup from raw moodMetric history (repair)."""
+    def all_rows():
+        cursor = None
+        while True:
+            page, next_cursor = fetch_mood_page(
+                "id,userId,created_timestamp,finalMoodScores",
+                user_id=user_id,
+                cursor=cursor,
+                limit=Settings.MOOD_EXPORT_CHUNK_SIZE,
+            )
+            yield from page
+            if next_cursor is None:
+                return
+            cursor = decode_cursor(next_cursor)
+
+    written = rollups.rebuild(all_rows(), user_id=user_id)
+    click.echo(f"Rebuilt {written} rollup rows")
+
+# --- add near top of the file (helpers) --------------------------------------
+def _fetch_score_bands():
     cols = (
         "band_key,label,min_score,max_score,inclusive_min,inclusive_max,"
         "message,crisis_note,display_order,tips"
     )
+    resp = supabase.table(SCORE_BANDS_TABLE).select(cols).order("display_order", desc=False).execute()
+    return exec_data(resp) or []
+
+def load_score_bands():
+    """scoreBands rows ordered by display_order, served from the shared reference cache."""
     try:
-        resp = supabase.table("scoreBands").select(cols).order("display_order", desc=False).execute()
-        return exec_data(resp) or []
+        return ref_cache.get(SCORE_BANDS_TABLE, _fetch_score_bands)
     except Exception as e:
         print("scoreBands fetch error (GET):", e)
         return []
 
+# (bands cache version, BandIndex) — swapped atomically
+_band_index_state = (None, None)
+
+def get_band_index():
+    """BandIndex over the cached scoreBands; rebuilt only when the cached rows change."""
+    global _band_index_state
+    bands = load_score_bands()
+    version = ref_cache.version(SCORE_BANDS_TABLE) if bands else None
+    cached_version, index = _band_index_state
+    if index is None or cached_version != version:
+        index = BandIndex(bands)
+        _band_index_state = (version, index)
+    return index
+
 def pick_score_band_for(score, bands):
-    if score is None:
-        return None
-    for r in bands:
-        try:
-            lo = float(r.get("min_score")) if r.get("min_score") is not None else None
-            hi = float(r.get("max_score")) if r.get("max_score") is not None else None
-        except (TypeError, ValueError):
-            continue
-        if lo is None or hi is None:
-            continue
-        inc_lo = as_bool(r.get("inclusive_min"))
-        if inc_lo is None: inc_lo = True
-        inc_hi = as_bool(r.get("inclusive_max"))
-        if inc_hi is None: inc_hi = True
-
-        lo_ok = score >= lo if inc_lo else score > lo
-        hi_ok = score <= hi if inc_hi else score < hi
-        if lo_ok and hi_ok:
-            return {
-                "band_key": r.get("band_key"),
-                "label": r.get("label"),
-                "min_score": lo,
-                "max_score": hi,
-                "inclusive_min": bool(inc_lo),
-                "inclusive_max": bool(inc_hi),
-                "message": r.get("message"),
-                "crisis_note": r.get("crisis_note"),
-                "display_order": r.get("display_order"),
-                "tips": _parse_tips(r.get("tips")),
-            }
-    return None
+    """Band payload for score; bands is a BandIndex (preferred) or raw scoreBands rows."""
+    if not isinstance(bands, BandIndex):
+        bands = BandIndex(bands)
+    return bands.lookup(score)
+
 def parse_ts(iso):
     if not iso:
         return None
@@ -751,175 +1189,236 @@ def sg_day_bounds_from_ts(iso_or_dt):
     end_utc = end_sgt.astimezone(timezone.utc)
     return start_utc.isoformat(), end_utc.isoformat()
 
-def as_bool(v):
-    if isinstance(v, bool): return v
-    if v is None: return None
-    return str(v).strip().lower() in ("1", "true", "t", "yes", "y", "on")
+def _typed_mood_values(data):
+    """Build typed raw_values (used for scoring and the insert payload) from a request body."""
+    # backward compat for "excerciseHours"
+    exercise_hours = data.get("exerciseHours", data.get("excerciseHours"))
 
-def as_float(v):
-    if v is None or v == "": return None
-    try: return float(v)
-    except (TypeError, ValueError): return None
+    return {
+        "userId": as_int(data.get("userId")),
+        "sleepHours": as_float(data.get("sleepHours")),
+        "exerciseHours": as_float(exercise_hours),   # hours; score uses minutes internally
+        "workingHrs": as_float(data.get("workingHrs")),
+        "sleepQuality": as_int(data.get("sleepQuality")),  # 1-10
+        "mood": as_int(data.get("mood")),                  # 1-10
+        "energy": as_int(data.get("energy")),              # 1-10
+        "stress": as_int(data.get("stress")),              # 1-10
+        "timeOutsideMin": as_int(data.get("timeOutsideMin")),
+        "connectwithfamily": as_bool(data.get("connectwithfamily")),
+        "notes": data.get("notes"),
+    }
 
-def as_int(v):
-    f = as_float(v)
-    return int(f) if f is not None else None
+def _mood_insert_payload(raw_values, computed_score, created_timestamp=None):
+    payload = {
+        "userId": raw_values["userId"],
+        "sleepHours": raw_values["sleepHours"],
+        "exerciseHours": raw_values["exerciseHours"],
+        "workingHrs": raw_values["workingHrs"],
+        "sleepQuality": raw_values["sleepQuality"],
+        "mood": raw_values["mood"],
+        "energy": raw_values["energy"],
+        "stress": raw_values["stress"],
+        "timeOutsideMin": raw_values["timeOutsideMin"],
+        "connectwithfamily": raw_values["connectwithfamily"],
+        "notes": raw_values["notes"],
+        "finalMoodScores": computed_score,
+        "created_timestamp": created_timestamp or now_iso(),
+    }
+    # Drop Nones to avoid overwriting with NULLs
+    return {k: v for k, v in payload.items() if v is not None}
+
+def prefetch_reference_data():
+    """Load scoringWeights and scoreBands concurrently when both caches are cold."""
+    cold = [
+        fn for key, fn in ((SCORING_WEIGHTS_TABLE, get_scorer), (SCORE_BANDS_TABLE, get_band_index))
+        if not ref_cache.is_fresh(key)
+    ]
+    if len(cold) > 1:
+        fan_out(*cold, return_exceptions=True)
+
+def _with_bands(fetch):
+    """
+    (fetch() result or its exception, BandIndex). The user-specific fetch and the band load
+    run concurrently when the band cache is cold; otherwise bands are a cache hit.
+    """
+    if ref_cache.is_fresh(SCORE_BANDS_TABLE):
+        return fan_out(fetch, return_exceptions=True)[0], get_band_index()
+    result, bands = fan_out(fetch, get_band_index, return_exceptions=True)
+    return result, bands
+
+def _fetch_user_with_latest_mood(user_id):
+    """users row (userId, daily_quiz_at) with the user's newest moodMetric row embedded."""
+    uresp = (
+        supabase.table(USERS_TABLE)
+        .select(f"userId,daily_quiz_at,{MOOD_TABLE}(*)")
+        .eq("userId", user_id)
+        .order("created_timestamp", desc=True, foreign_table=MOOD_TABLE)
+        .order("id", desc=True, foreign_table=MOOD_TABLE)
+        .limit(1, foreign_table=MOOD_TABLE)
+        .limit(1)
+        .execute()
+    )
+    return exec_data(uresp) or []
 
-def now_iso():
-    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+def _fetch_daily_quiz_at(user_id):
+    """(daily_quiz_at, rows) from users; rows is None when the query itself failed."""
+    try:
+        uresp = (
+            supabase.table(USERS_TABLE)
+            .select("userId,daily_quiz_at")
+            .eq("userId", user_id)
+            .limit(1)
+            .execute()
+        )
+        udata = exec_data(uresp) or []
+        return ((udata[0] or {}).get("daily_quiz_at") if udata else None), udata
+    except Exception as ue:
+        print("users.daily_quiz_at fetch error:", ue)
+        return None, None
 
-def _clamp01(x):
-    return max(0.0, min(1.0, float(x)))
+def _update_rollups_for_inserts(created_rows):
+    """Fold inserted rows into the day/week rollups; failures are logged, not raised."""
+    try:
+        rollups.apply_inserted_rows(created_rows or [])
+    except Exception as e:
+        # Non-fatal: `flask mood rebuild-rollups` repairs drift
+        print("Warning: failed to update mood rollups:", e)
 
-def _nums_in(text):
-    """Extract numbers found in a free-text notes field ('peak at 8h; width=4' -> [8,4])"""
-    if not text:
+def _insert_mood_rows(payloads):
+    """
+    Insert payloads with one multi-row insert; returns [(row, error)] aligned with payloads.
+    A multi-row insert is all-or-nothing, so when Postgres rejects the data (22xxx/23xxx) the
+    batch is split in halves and retried until only the bad rows fail: O(bad * log n) round
+    trips instead of one per row. Any other error of the first insert (timeout, dropped
+    connection) is raised, since the rows may already be committed and a retry would
+    duplicate them.
+    """
+    if not payloads:
         return []
-    return [float(n) for n in re.findall(r"[-+]?\d*\.?\d+", str(text))]
+    try:
+        return _insert_mood_chunk(payloads)
+    except Exception as e:
+        if not is_data_error(e):
+            raise
+        print("Bulk moodMetric insert rejected, isolating bad rows:", e)
+    mid = len(payloads) // 2
+    return _insert_mood_split(payloads[:mid]) + _insert_mood_split(payloads[mid:])
+
+def _insert_mood_chunk(payloads):
+    resp = supabase.table(MOOD_TABLE).insert(payloads, default_to_null=False).execute()
+    created = exec_data(resp) or []
+    return [(created[i] if i < len(created) else None, None) for i in range(len(payloads))]
+
+def _insert_mood_split(payloads):
+    if not payloads:
+        return []
+    try:
+        return _insert_mood_chunk(payloads)
+    except Exception as e:
+        if len(payloads) == 1 or not is_data_error(e):
+            # Rejected row, or an unknown outcome that must not be retried
+            return [(None, str(e))] * len(payloads)
+    mid = len(payloads) // 2
+    return _insert_mood_split(payloads[:mid]) + _insert_mood_split(payloads[mid:])
+
+def _valid_mood_cursor(cursor):
+    return (
+        len(cursor) == 2
+        and isinstance(cursor[0], str) and '"' not in cursor[0] and parse_ts(cursor[0]) is not None
+        and isinstance(cursor[1], int)
+    )
+
+def fetch_mood_page(select="*", user_id=None, ts_from=None, ts_to=None, cursor=None, limit=200):
+    """
+    One keyset page of moodMetric rows, newest first (created_timestamp desc, id desc).
+    cursor is a decoded [created_timestamp, id] pair from a previous page.
+    Returns (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    query = supabase.table(MOOD_TABLE).select(select)
+    if user_id is not None:
+        query = query.eq("userId", user_id)
+    if ts_from:
+        query = query.gte("created_timestamp", ts_from)
+    if ts_to:
+        query = query.lt("created_timestamp", ts_to)
+    if cursor:
+        last_ts, last_id = cursor
+        query = query.or_(
+            f'created_timestamp.lt."{last_ts}",'
+            f'and(created_timestamp.eq."{last_ts}",id.lt.{int(last_id)})'
+        )
+
+    # Fetch one extra row to learn whether another page exists
+    resp = (
+        query.order("created_timestamp", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute()
+    )
+    rows = exec_data(resp) or []
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.get("created_timestamp"), last.get("id"))
+
+def now_iso():
+    return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
 def _normalize_component(component_key, transform, direction, notes, raw_values):
     """
     Return normalized value in [0..1] for the given component or None if not applicable.
     raw_values is a dict with typed inputs pulled from the request payload.
     """
-    # Map component -> input value
-    # (Use minutes for exercise; others as given)
-    if component_key == "mood":
-        val = as_int(raw_values.get("mood"))
-        if val is None: return None
-        x = _clamp01(val / 10.0)
-        if transform == "inverse_scale10" or direction == "negative":
-            x = 1.0 - x
-        return _clamp01(x)
-
-    if component_key == "energy":
-        val = as_int(raw_values.get("energy"))
-        if val is None: return None
-        x = _clamp01(val / 10.0)
-        return _clamp01(x)
-
-    if component_key == "stress":
-        val = as_int(raw_values.get("stress"))
-        if val is None: return None
-        x = _clamp01(val / 10.0)
-        # lower is better
-        if transform in ("inverse_scale10",) or direction == "negative":
-            x = 1.0 - x
-        else:
-            # safety: treat as negative even if transform not set correctly
-            x = 1.0 - x
-        return _clamp01(x)
-
-    if component_key == "sleep_quality":
-        val = as_int(raw_values.get("sleepQuality"))
-        if val is None: return None
-        return _clamp01(val / 10.0)
-
-    if component_key == "sleep_hours":
-        h = as_float(raw_values.get("sleepHours"))
-        if h is None: return None
-        nums = _nums_in(notes)
-        center = nums[0] if len(nums) >= 1 else 8.0
-        width  = nums[1] if len(nums) >= 2 else 4.0
-        if width <= 0: width = 4.0
-        return _clamp01(1.0 - abs(h - center) / width)
-
-    if component_key == "exercise":
-        # Expect minutes for scoring; convert from hours if provided
-        hours = as_float(raw_values.get("exerciseHours"))
-        mins = hours * 60.0 if hours is not None else None
-        if mins is None: return None
-        nums = _nums_in(notes)
-        cap = nums[0] if len(nums) >= 1 else 45.0
-        if cap <= 0: cap = 45.0
-        return _clamp01(mins / cap)
-
-    if component_key == "outside":
-        mins = as_int(raw_values.get("timeOutsideMin"))
-        if mins is None: return None
-        nums = _nums_in(notes)
-        cap = nums[0] if len(nums) >= 1 else 30.0
-        if cap <= 0: cap = 30.0
-        return _clamp01(mins / cap)
-
-    if component_key == "work_balance":
-        h = as_float(raw_values.get("workingHrs"))
-        if h is None: return None
-        nums = _nums_in(notes)
-        center = nums[0] if len(nums) >= 1 else 8.0
-        width  = nums[1] if len(nums) >= 2 else 4.0
-        if width <= 0: width = 4.0
-        return _clamp01(1.0 - abs(h - center) / width)
-
-    if component_key == "connect":
-        b = as_bool(raw_values.get("connectwithfamily"))
-        if b is None: return None
-        return 1.0 if b else 0.0
-
-    # Unknown component -> ignore
-    return None
+    fn = compile_component(component_key, transform, direction, notes)
+    return fn(raw_values) if fn is not None else None
+
+def _fetch_weight_rows():
+    resp = (
+        supabase.table(SCORING_WEIGHTS_TABLE)
+        .select("component_key,weight,direction,transform,notes")
+        .execute()
+    )
+    return exec_data(resp) or []
 
-def compute_final_score_from_weights(raw_values):
-    """
-    Pull weights from 'scoringWeights' and compute a 0–10 score (rounded to 1 dp).
-    raw_values are the request fields (typed).
-    """
-    # Fetch weights
+def load_weight_rows():
+    """scoringWeights rows, served from the shared reference cache (raises if never loaded)."""
+    return ref_cache.get(SCORING_WEIGHTS_TABLE, _fetch_weight_rows)
+
+# (weights cache version, CompiledScorer) — swapped atomically
+_scorer_state = (None, None)
+
+def get_scorer():
+    """CompiledScorer for the current scoringWeights; recompiled only when the cached rows change."""
+    global _scorer_state
     try:
-        resp = (
-            supabase.table("scoringWeights")
-            .select("component_key,weight,direction,transform,notes")
-            .execute()
-        )
-        weight_rows = exec_data(resp) or []
+        weight_rows = load_weight_rows()
+        version = ref_cache.version(SCORING_WEIGHTS_TABLE)
     except Exception as e:
         print("compute_final_score_from_weights: failed to fetch weights:", e)
-        weight_rows = []
-
-    # Fallback defaults if table empty
-    if not weight_rows:
-        weight_rows = [
-            {"component_key":"mood","weight":0.25,"direction":"positive","transform":"scale10","notes":"1-10"},
-            {"component_key":"energy","weight":0.15,"direction":"positive","transform":"scale10","notes":"1-10"},
-            {"component_key":"stress","weight":0.15,"direction":"negative","transform":"inverse_scale10","notes":"1-10"},
-            {"component_key":"sleep_quality","weight":0.10,"direction":"positive","transform":"scale10","notes":"1-10"},
-            {"component_key":"sleep_hours","weight":0.10,"direction":"positive","transform":"peak","notes":"peak at 8h; width=4"},
-            {"component_key":"exercise","weight":0.10,"direction":"positive","transform":"saturate","notes":"45"},
-            {"component_key":"outside","weight":0.05,"direction":"positive","transform":"saturate","notes":"30"},
-            {"component_key":"work_balance","weight":0.07,"direction":"positive","transform":"peak","notes":"peak at 8h; width=4"},
-            {"component_key":"connect","weight":0.03,"direction":"positive","transform":"boolean","notes":"1 if connected else 0"},
-        ]
-
-    num = 0.0
-    den = 0.0
-
-    for row in weight_rows:
-        key = (row.get("component_key") or "").strip()
-        if not key:
-            continue
-        try:
-            w = float(row.get("weight"))
-        except (TypeError, ValueError):
-            continue
-        if w <= 0:
-            continue
+        weight_rows, version = [], None
 
-        direction = (row.get("direction") or "positive").strip().lower()
-        transform = (row.get("transform") or "").strip().lower()
-        notes = row.get("notes")
+    cached_version, scorer = _scorer_state
+    if scorer is None or cached_version != version:
+        scorer = compile_scorer(weight_rows)
+        _scorer_state = (version, scorer)
+    return scorer
 
-        v = _normalize_component(key, transform, direction, notes, raw_values)
-        if v is None:
-            continue
-        num += w * v
-        den += w
+def compute_final_score_from_weights(raw_values):
+    """
+    Compute a 0–10 score (rounded to 1 dp) using the compiled 'scoringWeights' scorer.
+    raw_values are the request fields (typed).
+    """
+    return get_scorer().score(raw_values)
 
-    if den <= 0:
-        return None
+def compute_final_scores_batch(columns, n=None):
+    """
+    Vectorized counterpart of compute_final_score_from_weights for columnar inputs
+    (see core.batch_scoring.score_batch). One cached weights lookup for the whole batch.
+    """
+    from core.batch_scoring import score_batch  # numpy is only needed on this path
+    return score_batch(columns, get_scorer(), n=n)
 
-    score_0_1 = num / den
-    score_0_10 = round(score_0_1 * 10.0, 1)
-    return score_0_10
 def sg_week_bounds_from_ts(ts_iso: str, tz_name: str = "Asia/Singapore"):
     """
     Given an ISO timestamp (any tz), return the UTC ISO bounds for the local SGT week
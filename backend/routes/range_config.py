@@ -1,8 +1,15 @@
 from flask import Blueprint, request, jsonify
-from core.db import supabase, exec_data, RANGE_CONFIG_TABLE
+from core.db import RANGE_CONFIG_TABLE
+from core.http_cache import cached_table, conditional_json
 
 bp = Blueprint("range_config", __name__)
 
+RANGE_CONFIG_COLS = "id,min_value,max_value,step_value,field_name"
+
+def load_range_configs():
+    """All rangeConfig rows (by id) and their cache version."""
+    return cached_table(RANGE_CONFIG_TABLE, RANGE_CONFIG_COLS, order="id")
+
 @bp.route("/rangeConfig", methods=["GET"])
 def get_range_config():
     """
@@ -18,23 +25,26 @@ def get_range_config():
         description: Return rows that match this field_name
         example: workhours
     responses:
-      200: {description: List of matching rows}
+      200: {description: List of matching rows (strong ETag, Cache-Control)}
+      304: {description: Not modified (If-None-Match matched)}
       400: {description: Missing field_name}
       404: {description: No rows found}
       500: {description: Server error}
     """
     try:
-        cols = ["id", "min_value", "max_value", "step_value", "field_name"]
         field_name = request.args.get("field_name")
         if not field_name:
             return jsonify({"error": "Missing field_name"}), 400
 
-        resp = supabase.table(RANGE_CONFIG_TABLE).select(",".join(cols)).eq("field_name", field_name).execute()
-        rows = exec_data(resp) or []
-        if not rows:
-            return jsonify({"error": "No rows found"}), 404
+        all_rows, version = load_range_configs()
+
+        def build():
+            rows = [r for r in all_rows if r.get("field_name") == field_name]
+            if not rows:
+                return {"error": "No rows found"}, 404
+            return {"rows": rows, "count": len(rows)}, 200
 
-        return jsonify({"rows": rows, "count": len(rows)}), 200
+        return conditional_json(f"rangeConfig:{field_name}", version, build)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
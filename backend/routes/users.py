@@ -1,6 +1,12 @@
 from flask import Blueprint, request, jsonify
-from core.db import supabase, exec_data, USERS_TABLE
-from core.users_repo import get_user_by_id, update_user_fields_by_id, row_to_public_user
+from core.db import supabase, exec_data, is_unique_violation, USERS_TABLE
+from core.users_repo import (
+    get_user_by_id, update_user_fields_by_id, row_to_public_user, list_public_users,
+    search_usernames_by_prefix, refresh_username_index,
+)
+from core.username_index import username_index
+from core.pagination import clamp_limit, decode_cursor
+from config import Settings
 
 bp = Blueprint("users", __name__)
 
@@ -64,45 +70,145 @@ def update_user_profile():
       200: {description: Updated user}
       400: {description: Missing userId or no fields to update}
       404: {description: User not found}
+      409: {description: Email already exists}
     """
     data = request.get_json(silent=True) or {}
     user_id = data.get("userId")
     if not user_id:
         return jsonify({"error": "Missing userId"}), 400
 
-    user = get_user_by_id(user_id)
-    if not user:
-        return jsonify({"error": "User not found"}), 404
-
     fields = {
         "email": data.get("email"),
         "password": data.get("password"),  # TODO: hash in production
         "username": data.get("username"),
         "mobile": data.get("mobile"),
     }
-    updated = update_user_fields_by_id(user_id, fields)
-    if not updated:
+    if all(v is None for v in fields.values()):
         return jsonify({"error": "No fields to update"}), 400
 
+    # One round trip: the UPDATE returns the row, or nothing if the user does not exist
+    try:
+        updated = update_user_fields_by_id(user_id, fields)
+    except Exception as e:
+        if is_unique_violation(e):
+            return jsonify({"error": "Email already exists"}), 409
+        raise
+    if not updated:
+        return jsonify({"error": "User not found"}), 404
+
     return jsonify(row_to_public_user(updated)), 200
 
 
 @bp.route("/users", methods=["GET"])
 def get_all_users():
     """
-    Get all users (public info only)
+    List users (public info only), newest first, one page at a time
+    ---
+    tags:
+      - users
+    parameters:
+      - in: query
+        name: q
+        type: string
+        required: false
+        description: Case-insensitive prefix of username or email
+        example: jo
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size (default 50, max 200)
+        example: 20
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: next_cursor from the previous page
+    responses:
+      200: {description: "Page of users (userId, email, username, mobile) with next_cursor (null on the last page)"}
+      400: {description: Invalid cursor}
+      500: {description: Server error}
+    """
+    try:
+        try:
+            cursor = decode_cursor(request.args.get("cursor"))
+            after_user_id = None
+            if cursor is not None:
+                if len(cursor) != 1 or not isinstance(cursor[0], int):
+                    raise ValueError("Invalid cursor")
+                after_user_id = cursor[0]
+        except ValueError as ve:
+            return jsonify({"error": str(ve)}), 400
+
+        limit = clamp_limit(
+            request.args.get("limit", type=int),
+            Settings.USERS_PAGE_DEFAULT_LIMIT,
+            Settings.USERS_PAGE_MAX_LIMIT,
+        )
+        q = (request.args.get("q") or "").strip()[:Settings.USERS_SEARCH_MAX_LEN] or None
+        rows, next_cursor = list_public_users(limit, after_user_id=after_user_id, q=q)
+        return jsonify({"rows": rows, "count": len(rows), "next_cursor": next_cursor}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route("/users/search", methods=["GET"])
+def search_usernames():
+    """
+    Username typeahead (prefix matches first, then fuzzy trigram matches)
     ---
     tags:
       - users
+    parameters:
+      - in: query
+        name: q
+        type: string
+        required: true
+        description: Partial username (case-insensitive)
+        example: jo
+      - in: query
+        name: mode
+        type: string
+        enum: [auto, prefix, fuzzy]
+        required: false
+        description: auto (default) fills up prefix matches with fuzzy ones
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Max results (default 10, max 50)
+        example: 10
     responses:
-      200: {description: List of all users}
+      200: {description: "rows of {userId, username, match, similarity}; source is index, or db while the index warms up"}
+      400: {description: Missing q or bad mode}
       500: {description: Server error}
     """
+    q = (request.args.get("q") or "").strip()[:Settings.USERS_SEARCH_MAX_LEN]
+    mode = request.args.get("mode", "auto")
+    if not q:
+        return jsonify({"error": "Missing q"}), 400
+    if mode not in ("auto", "prefix", "fuzzy"):
+        return jsonify({"error": "mode must be auto, prefix or fuzzy"}), 400
+    limit = clamp_limit(request.args.get("limit", type=int), 10, 50)
+
     try:
-        resp = supabase.table(USERS_TABLE).select("*").order("userId", desc=True).execute()
-        rows = exec_data(resp) or []
-        public_rows = [row_to_public_user(r) for r in rows if r]
-        return jsonify({"rows": public_rows, "count": len(public_rows)}), 200
+        if Settings.USERNAME_INDEX_ENABLED:
+            refresh_username_index()
+        if not username_index.ready:
+            # Cold index: answer prefix queries from the database until the build finishes
+            matches = search_usernames_by_prefix(q, limit) if mode != "fuzzy" else []
+            rows = [{"userId": uid, "username": name, "match": "prefix"} for uid, name in matches]
+            return jsonify({"rows": rows, "count": len(rows), "source": "db"}), 200
+
+        rows = []
+        if mode != "fuzzy":
+            rows = [{"userId": uid, "username": name, "match": "prefix"} for uid, name in username_index.prefix(q, limit)]
+        if mode != "prefix" and len(rows) < limit:
+            seen = {r["userId"] for r in rows}
+            rows += [
+                {"userId": uid, "username": name, "match": "fuzzy", "similarity": sim}
+                for uid, name, sim in username_index.fuzzy(q, limit - len(rows), exclude=seen)
+            ]
+        return jsonify({"rows": rows, "count": len(rows), "source": "index"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -0,0 +1,15 @@
+-- POST /moodMetric/batch moves users.daily_quiz_at for every user in the batch with one
+-- statement (supabase.rpc("advance_daily_quiz_at", {"updates": [{userId, daily_quiz_at}, ...]}))
+-- instead of one UPDATE per user. Never moves a user's daily_quiz_at backwards.
+-- Returns the userIds that changed.
+create or replace function public.advance_daily_quiz_at(updates jsonb)
+returns setof bigint
+language sql
+as $$
+    update public.users u
+       set daily_quiz_at = v.daily_quiz_at
+      from jsonb_to_recordset(updates) as v("userId" bigint, daily_quiz_at timestamptz)
+     where u."userId" = v."userId"
+       and (u.daily_quiz_at is null or u.daily_quiz_at < v.daily_quiz_at)
+    returning u."userId";
+$$;
@@ -0,0 +1,14 @@
+-- Lets GET /userDailyQuizResult embed a user's newest moodMetric row in the users query
+-- (PostgREST resource embedding needs the foreign key) and serves that lookup from an index.
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'moodMetric_userId_fkey') then
+        alter table public."moodMetric"
+            add constraint "moodMetric_userId_fkey"
+            foreign key ("userId") references public.users ("userId");
+    end if;
+end
+$$;
+
+create index if not exists "moodMetric_userId_created_id_idx"
+    on public."moodMetric" ("userId", created_timestamp desc, id desc);
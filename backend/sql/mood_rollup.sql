@@ -0,0 +1,67 @@
+-- Per-user mood rollups maintained by core/rollups.py.
+-- granularity = 'day'  -> bucket 'YYYY-MM-DD' (Asia/Singapore local date)
+-- granularity = 'week' -> bucket 'YYYY-Www'   (Asia/Singapore ISO week)
+create table if not exists public."moodRollup" (
+    "userId"        bigint      not null,
+    granularity     text        not null check (granularity in ('day', 'week')),
+    bucket          text        not null,
+    row_count       integer     not null default 0,
+    scored_count    integer     not null default 0,
+    score_sum       double precision not null default 0,
+    score_min       double precision,
+    score_max       double precision,
+    last_score      double precision,
+    last_timestamp  timestamptz,
+    last_mood_id    bigint,
+    updated_at      timestamptz not null default now(),
+    primary key ("userId", granularity, bucket)
+);
+
+-- Atomic fold of newly inserted moodMetric rows, called by core/rollups.py as
+-- supabase.rpc("mood_rollup_apply", {"deltas": [...]}). Each delta is one bucket's
+-- contribution (same columns as the table); one statement merges them all, so
+-- concurrent inserts into the same bucket add up instead of overwriting each other.
+-- Deltas must be unique per ("userId", granularity, bucket). Returns the rows written.
+create or replace function public.mood_rollup_apply(deltas jsonb)
+returns integer
+language sql
+as $$
+    with written as (
+        insert into public."moodRollup" as r (
+            "userId", granularity, bucket, row_count, scored_count, score_sum,
+            score_min, score_max, last_score, last_timestamp, last_mood_id, updated_at
+        )
+        select d."userId", d.granularity, d.bucket, d.row_count, d.scored_count, d.score_sum,
+               d.score_min, d.score_max, d.last_score, d.last_timestamp, d.last_mood_id, now()
+          from jsonb_to_recordset(deltas) as d(
+                   "userId" bigint, granularity text, bucket text, row_count integer,
+                   scored_count integer, score_sum double precision, score_min double precision,
+                   score_max double precision, last_score double precision,
+                   last_timestamp timestamptz, last_mood_id bigint)
+        on conflict ("userId", granularity, bucket) do update set
+            row_count    = r.row_count + excluded.row_count,
+            scored_count = r.scored_count + excluded.scored_count,
+            score_sum    = r.score_sum + excluded.score_sum,
+            score_min    = least(r.score_min, excluded.score_min),       -- least/greatest skip nulls
+            score_max    = greatest(r.score_max, excluded.score_max),
+            -- "last" = newest last_timestamp, ties broken by id (as core/rollups.py _fold)
+            last_score     = case when excluded.last_timestamp is not null
+                                   and (r.last_timestamp is null
+                                        or (excluded.last_timestamp, coalesce(excluded.last_mood_id, 0))
+                                           > (r.last_timestamp, coalesce(r.last_mood_id, 0)))
+                                  then excluded.last_score else r.last_score end,
+            last_mood_id   = case when excluded.last_timestamp is not null
+                                   and (r.last_timestamp is null
+                                        or (excluded.last_timestamp, coalesce(excluded.last_mood_id, 0))
+                                           > (r.last_timestamp, coalesce(r.last_mood_id, 0)))
+                                  then excluded.last_mood_id else r.last_mood_id end,
+            last_timestamp = case when excluded.last_timestamp is not null
+                                   and (r.last_timestamp is null
+                                        or (excluded.last_timestamp, coalesce(excluded.last_mood_id, 0))
+                                           > (r.last_timestamp, coalesce(r.last_mood_id, 0)))
+                                  then excluded.last_timestamp else r.last_timestamp end,
+            updated_at   = now()
+        returning 1
+    )
+    select count(*)::integer from written;
+$$;
@@ -0,0 +1,5 @@
+-- POST /signup inserts directly and maps a unique violation (23505) to 409, so the
+-- database, not a select-then-insert, is what keeps emails unique.
+-- Fails if duplicate emails already exist; resolve those first.
+create unique index if not exists users_email_key
+    on public.users (email);
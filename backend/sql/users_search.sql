@@ -0,0 +1,9 @@
+-- Serves GET /users?q= (case-insensitive prefix on username/email via ILIKE 'q%').
+-- pg_trgm GIN indexes let ILIKE use an index; the userId primary key already covers the keyset order.
+create extension if not exists pg_trgm;
+
+create index if not exists users_username_trgm_idx
+    on public.users using gin (username gin_trgm_ops);
+
+create index if not exists users_email_trgm_idx
+    on public.users using gin (email gin_trgm_ops);